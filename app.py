@@ -1,10 +1,17 @@
-import pandas as pd
+import traceback
 
 from config.logger_config import logger
 from crawler import start_polling_thread, poll_table
 from file_processor.file_processor_registry import FileProcessorRegistry
-from models.files import insert_data, fetch_files_to_process, update_file_status
-from utils.db_util import get_session
+from config.project_config import PROJECT_CONFIG
+from models.file_claims import claim_heartbeat, claim_next_file, fail_claimed_file, fetch_claimed_file, recover_expired_claims, recovery_due
+from models.files import insert_data, update_file_status, update_file_checksum, fetch_files_with_pending_exports
+from models.result_reuse import reuse_identical_results
+from utils.checksum_util import calculate_checksum, read_csv_with_checksum, DEFERRED_CHECKSUM
+from utils.db_util import get_read_session
+from utils.db_writer import db_writer, unit_of_work
+from utils.file_profiler import file_profiler
+from utils.pipeline_metrics import pipeline_metrics, start_metrics_server
 
 
 def insert_fields_data_in_db(filepath):
@@ -13,65 +20,169 @@ def insert_fields_data_in_db(filepath):
 
     :param filepath: Path to the file to insert data from.
     """
-    with get_session() as session:  # Establishing a database session
-        try:
-            logger.info(f"Inserting data from file: {filepath}")  # Logging start of insertion
-            insert_data(session, str(filepath), 'FIELD', '')  # Inserting file data into database
-            logger.info("Data insertion completed successfully.")  # Logging success
-        except Exception as e:
-            logger.error(f"Error inserting data from file {filepath}: {e}")  # Logging errors if any
+    try:
+        logger.info(f"Inserting data from file: {filepath}")  # Logging start of insertion
+        if PROJECT_CONFIG.get("CHECKSUM_ON_READ", False):
+            checksum = DEFERRED_CHECKSUM  # Hashed while the CSV is parsed, so the file is read only once
+        else:
+            checksum = calculate_checksum(str(filepath))  # Hash on this thread so the writer is not blocked on file I/O
+        db_writer.run(insert_data, str(filepath), 'FIELD', '', checksum)  # Inserting file data through the database writer
+        logger.info("Data insertion completed successfully.")  # Logging success
+    except Exception as e:
+        logger.error(f"Error inserting data from file {filepath}: {e}")  # Logging errors if any
 
 
 def read_fields_data_in_db():
     """
     Read data from the database, validate it, and update file statuses.
     """
-    with get_session() as session:  # Establishing a database session
-        # Fetch files that need processing
-        results = fetch_files_to_process(session)
-
-        if not results:  # Check if results is None or an empty list
-            logger.info("No files available for processing at this time.")
-            return
+    if recovery_due():  # Re-queue files whose worker died, also when it restarted within the lease
+        recover_interrupted_files()
+
+    # Claim the next file with a lease, so an interrupted step can be recovered
+    file_id = db_writer.run(claim_next_file)
+    if file_id is None:
+        logger.info("No files available for processing at this time.")
+        return
+
+    with get_read_session() as session:  # Establishing this thread's read session; writes go through db_writer
+        results = fetch_claimed_file(session, file_id)
+        zone = 'SILVER' if results.file_status == 'BRONZE_PROCESSED' else 'BRONZE'
+        with pipeline_metrics.track_file(results.id, zone):  # Stage timings of this step are saved on exit
+            with file_profiler.profile_file(results.id, results.filename, zone):  # No-op unless profiling is switched on
+                try:
+                    with claim_heartbeat(results.id):  # Renews the lease while the step runs
+                        process_claimed_file(session, results)
+                except Exception as e:
+                    # Release the claim with a failed status instead of retrying the file when the lease expires
+                    logger.error(f"Error processing file '{results.filename}': {traceback.format_exc()}")
+                    db_writer.run(fail_claimed_file, results.id, f"Error: {e}")
+
+
+def process_claimed_file(session, results):
+    """
+    Run the next processing step of a claimed file.
 
-        logger.separator()
-        logger.info(f"Processing file: {results.filepath} with file_status {results.file_status}")
+    :param session: Read session of the calling thread.
+    :param results: Row of the `files` table of the claimed file.
+    """
+    logger.separator()
+    logger.info(f"Processing file: {results.filepath} with file_status {results.file_status}")
 
-        # Read the file into a Pandas DataFrame
-        df = pd.read_csv(results.filepath)
+    # Get the appropriate file processor based on file metadata
+    file_processor = FileProcessorRegistry.get_processor(results.id, results.filename, results.datatype)
 
-        # Get the appropriate file processor based on file metadata
-        file_processor = FileProcessorRegistry.get_processor(results.id, results.filename, results.datatype)
+    # Large files may be validated inside the database without being read into pandas
+    in_database = results.file_status == 'PICKED' and file_processor.validates_in_database(results.filepath)
 
-        # If file status is 'BRONZE_PROCESSED', move to silver validation
-        if results.file_status == 'BRONZE_PROCESSED':
-            logger.info(f"Updating file '{results.filename}' status to 'SILVER_PROCESSING'.")
-            update_file_status(session, 'SILVER_PROCESSING', results.id)  # Updating status
-            file_processor.process()  # Processing file
-            logger.info(f"Field silver processing completed successfully. Updating file '{results.filename}' status to 'SILVER_PROCESSED'.")
-            update_file_status(session, 'SILVER_PROCESSED', results.id)  # Updating to final processed status
+    # Parse and hash the file in a single pass when its checksum was deferred
+    df = None
+    checksum = results.checksum
+    if results.file_status == 'PICKED' and checksum == DEFERRED_CHECKSUM:
+        if in_database:
+            checksum = calculate_checksum(results.filepath)
+        else:
+            with pipeline_metrics.stage("read_csv") as timing:
+                df, checksum = read_csv_with_checksum(results.filepath, **file_processor.csv_read_options())
+                df = file_processor.compact_dataframe(df)
+                timing.rows = len(df)
+        db_writer.run(update_file_checksum, checksum, results.id)
+
+    # A new file with the same content as an already processed one reuses its results
+    if results.file_status == 'PICKED' and reuse_identical_results(session, results, checksum) is not None:
+        logger.info(f"Results reused. File '{results.filename}' status updated to 'SILVER_PROCESSED'.")
+        file_processor.export('BRONZE')
+        file_processor.export('SILVER')
+        return
+
+    # If file status is 'BRONZE_PROCESSED', move to silver validation
+    if results.file_status == 'BRONZE_PROCESSED':
+        logger.info(f"Updating file '{results.filename}' status to 'SILVER_PROCESSING'.")
+        db_writer.run(update_file_status, 'SILVER_PROCESSING', results.id)  # Updating status
+        try:
+            # Silver rows, errors and the final status are committed in one transaction
+            with unit_of_work() as uow:
+                file_processor.process(uow)  # Processing file
+                logger.info(f"Field silver processing completed successfully. Updating file '{results.filename}' status to 'SILVER_PROCESSED'.")
+                uow.add(update_file_status, 'SILVER_PROCESSED', results.id)  # Updating to final processed status
+        except Exception as e:
+            logger.error(f"Error saving silver results of file '{results.filename}': {e}")
+            db_writer.run(update_file_status, 'ERROR', results.id, f"Error: {e}")
             return
+        file_processor.export('SILVER')  # Queue the report once the status has advanced
+        return
+
+    # Read the file into a Pandas DataFrame
+    if df is None and not in_database:
+        import pandas as pd  # Loaded on first use to keep application startup light
+        with pipeline_metrics.stage("read_csv") as timing:
+            df = file_processor.compact_dataframe(pd.read_csv(results.filepath, **file_processor.csv_read_options()))
+            timing.rows = len(df)
+
+    # Validate columns before further processing
+    missing_columns = file_processor.validate_header(results.filepath) if in_database else file_processor.validate_columns(df)
+    if missing_columns:
+        logger.error(f"Column validation failed. Updating file '{results.filename}' status to error.")
+        db_writer.run(update_file_status, 'ERROR', results.id, "Error: Columns do not match")  # Log error
+        return
+    else:
+        logger.info(f"Column validation passed. Updating file '{results.filename}' status to 'BRONZE_PROCESSING'.")
+        db_writer.run(update_file_status, 'BRONZE_PROCESSING', results.id)  # Proceed with further processing
 
-        # Validate columns before further processing
-        if file_processor.validate_columns(df):
-            logger.error(f"Column validation failed. Updating file '{results.filename}' status to error.")
-            update_file_status(session, 'ERROR', results.id, "Error: Columns do not match")  # Log error
+        try:
+            # Bronze rows, errors and the final status are committed in one transaction
+            with unit_of_work() as uow:
+                if in_database:
+                    file_processor.validate_in_database(results, uow)
+                else:
+                    file_processor.validate(df, results, uow)  # Perform field-level validation
+                logger.info(f"Field validation completed successfully. Updating file '{results.filename}' status to 'BRONZE_PROCESSED'.")
+                uow.add(update_file_status, 'BRONZE_PROCESSED', results.id)  # Mark processing as completed
+        except Exception as e:
+            logger.error(f"Error saving bronze results of file '{results.filename}': {e}")
+            db_writer.run(update_file_status, 'ERROR', results.id, f"Error: {e}")
             return
-        else:
-            logger.info(f"Column validation passed. Updating file '{results.filename}' status to 'BRONZE_PROCESSING'.")
-            update_file_status(session, 'BRONZE_PROCESSING', results.id)  # Proceed with further processing
+        file_processor.export('BRONZE')  # Queue the report once the status has advanced
+        return
 
-            # Perform field-level validation
-            file_processor.validate(df, results)
-            logger.info(f"Field validation completed successfully. Updating file '{results.filename}' status to 'BRONZE_PROCESSED'.")
-            update_file_status(session, 'BRONZE_PROCESSED', results.id)  # Mark processing as completed
-            return
+
+def requeue_pending_exports():
+    """
+    Re-queue result exports that were pending or running when the application last stopped.
+    """
+    with get_read_session() as session:
+        pending_exports = fetch_files_with_pending_exports(session)
+
+    for file_id, filename, datatype, zone in pending_exports:
+        try:
+            logger.info(f"Re-queuing {zone} results export for file '{filename}'.")
+            FileProcessorRegistry.get_processor(file_id, filename, datatype).export(zone)
+        except Exception as e:
+            logger.error(f"Error re-queuing {zone} results export for file '{filename}': {e}")
+
+
+def recover_interrupted_files():
+    """
+    Re-queue files whose bronze or silver step was interrupted and whose lease has expired.
+    """
+    try:
+        recovered = db_writer.run(recover_expired_claims)
+    except Exception as e:
+        logger.error(f"Error recovering interrupted files: {e}")
+        return
+    if recovered:
+        logger.info(f"Re-queued {recovered} interrupted files.")
 
 
 def start_app():
     """
     Main entry point for executing the database initialization script.
     """
+    requeue_pending_exports()
+
+    if PROJECT_CONFIG.get("METRICS_ENABLED", True):
+        start_metrics_server(PROJECT_CONFIG.get("METRICS_PORT", 5000))
+
     logger.info("Starting polling thread for data insertion.")
     start_polling_thread(insert_fields_data_in_db)  # Start polling thread for inserting data
     logger.info("Polling thread started successfully.")
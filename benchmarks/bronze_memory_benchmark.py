@@ -0,0 +1,106 @@
+"""
+Memory benchmark for the bronze DataFrame representation.
+
+Reads a synthetic field file (benchmarks.field_dataset_generator) and runs bronze validation,
+including the bronze and error writes, against a scratch database for each representation:
+
+- object:          text columns as Python object strings (the pandas < 3 default)
+- default:         text columns as read by the installed pandas version
+- compact:         COMPACT_DTYPES, low-cardinality text columns as categoricals
+- compact+float32: COMPACT_DTYPES with FLOAT32_COORDINATES
+
+For each it reports the size of the frame after reading (memory_usage(deep=True)) and the peak
+memory traced by tracemalloc from reading through the bronze write. Allocations made inside
+DuckDB and the Arrow memory pool are not traced.
+
+Usage (from the repository root):
+    python -m benchmarks.bronze_memory_benchmark --fields 5000 --vertices 50
+"""
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+MODES = {
+    "object": {"COMPACT_DTYPES": False, "FLOAT32_COORDINATES": False, "OBJECT_STRINGS": True},
+    "default": {"COMPACT_DTYPES": False, "FLOAT32_COORDINATES": False, "OBJECT_STRINGS": False},
+    "compact": {"COMPACT_DTYPES": True, "FLOAT32_COORDINATES": False, "OBJECT_STRINGS": False},
+    "compact+float32": {"COMPACT_DTYPES": True, "FLOAT32_COORDINATES": True, "OBJECT_STRINGS": False},
+}
+
+
+def measure_mode(csv_path, mode):
+    """
+    Read and validate the file in one representation.
+
+    :return: Tuple of (frame bytes after reading, peak traced bytes).
+    """
+    import pandas as pd
+    from bronze.field_data_validator import validate_field
+    from config.project_config import PROJECT_CONFIG
+    from file_processor.file_processor_registry import FileProcessorRegistry
+    from models.files import insert_data
+    from utils.db_writer import db_writer
+
+    settings = MODES[mode]
+    PROJECT_CONFIG["COMPACT_DTYPES"] = settings["COMPACT_DTYPES"]
+    PROJECT_CONFIG["FLOAT32_COORDINATES"] = settings["FLOAT32_COORDINATES"]
+
+    file_id = db_writer.run(insert_data, csv_path, "FIELD", "benchmark", f"benchmark-{mode}")
+    processor = FileProcessorRegistry.get_processor(file_id, os.path.basename(csv_path), "FIELD")
+    options = processor.csv_read_options()
+    if settings["OBJECT_STRINGS"]:
+        options = {"dtype": {column: object for column in processor.CATEGORICAL_COLUMNS}}
+
+    tracemalloc.start()
+    try:
+        df = processor.compact_dataframe(pd.read_csv(csv_path, **options))
+        frame_bytes = int(df.memory_usage(deep=True).sum())
+        validate_field(df, file_id, os.path.basename(csv_path))
+        del df
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return frame_bytes, peak_bytes
+
+
+def run_benchmark(fields, vertices, error_rate, modes, log_level):
+    """
+    Measure every representation on the same file and print the results.
+    """
+    from benchmarks.field_dataset_generator import write_field_csv
+    from benchmarks.pipeline_benchmark import prepare_environment
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        previous_dir = os.getcwd()
+        try:
+            prepare_environment(work_dir, log_level)
+            csv_path = os.path.join(work_dir, f"synthetic_{fields}x{vertices}.csv")
+            rows = write_field_csv(csv_path, fields=fields, vertices=vertices, error_rate=error_rate)
+            print(f"{rows:,} rows, {os.path.getsize(csv_path) / 2 ** 20:.1f} MiB CSV\n")
+
+            print(f"{'mode':<16} | {'frame MiB':>10} | {'peak MiB':>10} | {'frame vs first':>15}")
+            print("-" * 60)
+            baseline = None
+            for mode in modes:
+                frame_bytes, peak_bytes = measure_mode(csv_path, mode)
+                baseline = baseline or frame_bytes
+                print(f"{mode:<16} | {frame_bytes / 2 ** 20:>10.1f} | {peak_bytes / 2 ** 20:>10.1f} | "
+                      f"{frame_bytes / baseline:>14.0%}")
+        finally:
+            from utils.db_writer import db_writer
+
+            db_writer.drain()
+            os.chdir(previous_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the memory of bronze DataFrame representations.")
+    parser.add_argument("--fields", type=int, default=5000, help="Number of fields (polygons).")
+    parser.add_argument("--vertices", type=int, default=50, help="Distinct vertices per polygon.")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Fraction of fields with an injected error.")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated representations to measure.")
+    parser.add_argument("--log-level", default="WARNING", help="Application log level during the run.")
+    args = parser.parse_args()
+
+    run_benchmark(args.fields, args.vertices, args.error_rate, args.modes.split(","), args.log_level.upper())
@@ -0,0 +1,134 @@
+"""
+Mixed read/write stress benchmark for the single-writer DuckDB connection manager.
+
+Runs the same workload against a scratch database in three modes:
+- direct:  every writer thread opens its own session and commits each write (the previous pattern).
+- writer:  writes go through DatabaseWriter.run(), blocking until committed.
+- batched: writes go through DatabaseWriter.submit() and are committed in batches.
+
+Writes use the application's "max(id) + 1" id allocation, so concurrent direct writers
+produce transaction conflicts / duplicate keys, while the writer thread serializes them.
+Reader threads run per-file style aggregate queries on thread-local sessions throughout.
+
+Usage (from the repository root):
+    python -m benchmarks.db_writer_stress_benchmark --writers 4 --readers 4 --seconds 10
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker, scoped_session
+
+from utils.db_writer import DatabaseWriter
+
+CREATE_SQL = "CREATE TABLE bench_rows (id INTEGER PRIMARY KEY, file_id INTEGER, value DOUBLE)"
+READ_SQL = "SELECT count(*), max(value) FROM bench_rows WHERE file_id = :file_id"
+
+
+def insert_row(session, file_id):
+    """
+    Write job inserting one row with the application's max(id) + 1 id allocation.
+    """
+    max_id = session.execute(text("SELECT coalesce(max(id), 0) FROM bench_rows")).scalar()
+    session.execute(
+        text("INSERT INTO bench_rows VALUES (:id, :file_id, random())"),
+        {"id": max_id + 1, "file_id": file_id}
+    )
+
+
+def run_mode(mode, session_factory, writers, readers, seconds):
+    """
+    Run one benchmark mode and return (writes, failed_writes, reads) counts.
+    """
+    stop = threading.Event()
+    counters = {"writes": 0, "failed": 0, "reads": 0}
+    lock = threading.Lock()
+    writer = DatabaseWriter(session_factory=session_factory)
+    read_sessions = scoped_session(session_factory)
+
+    def count(key):
+        with lock:
+            counters[key] += 1
+
+    def write_loop(file_id):
+        pending = []
+        while not stop.is_set():
+            try:
+                if mode == "direct":
+                    session = session_factory()
+                    try:
+                        insert_row(session, file_id)
+                        session.commit()
+                    except Exception:
+                        session.rollback()
+                        raise
+                    finally:
+                        session.close()
+                    count("writes")
+                elif mode == "writer":
+                    writer.run(insert_row, file_id)
+                    count("writes")
+                else:
+                    pending.append(writer.submit(insert_row, file_id))
+                    if len(pending) >= 256:
+                        for future in pending:
+                            future.result()
+                            count("writes")
+                        pending = []
+            except Exception:
+                count("failed")
+        for future in pending:
+            try:
+                future.result()
+                count("writes")
+            except Exception:
+                count("failed")
+
+    def read_loop(file_id):
+        session = read_sessions()
+        while not stop.is_set():
+            session.execute(text(READ_SQL), {"file_id": file_id}).fetchall()
+            session.rollback()
+            count("reads")
+
+    threads = [threading.Thread(target=write_loop, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=read_loop, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return counters["writes"], counters["failed"], counters["reads"]
+
+
+def run_benchmark(writers, readers, seconds):
+    """
+    Run every mode on a fresh scratch database and print throughput.
+    """
+    print(f"{writers} writer threads, {readers} reader threads, {seconds}s per mode")
+    print(f"{'mode':>8} | {'writes/s':>10} | {'failed':>8} | {'reads/s':>10}")
+    print("-" * 46)
+    for mode in ("direct", "writer", "batched"):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            engine = create_engine(f"duckdb:///{os.path.join(tmp_dir, 'stress.db')}")
+            with engine.begin() as connection:
+                connection.execute(text(CREATE_SQL))
+            session_factory = sessionmaker(autobegin=True, autoflush=False, bind=engine)
+
+            writes, failed, reads = run_mode(mode, session_factory, writers, readers, seconds)
+            print(f"{mode:>8} | {writes / seconds:>10.1f} | {failed:>8} | {reads / seconds:>10.1f}")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stress DuckDB with concurrent readers and writers.")
+    parser.add_argument("--writers", type=int, default=4, help="Number of writer threads.")
+    parser.add_argument("--readers", type=int, default=4, help="Number of reader threads.")
+    parser.add_argument("--seconds", type=float, default=10, help="Duration of each mode in seconds.")
+    args = parser.parse_args()
+
+    run_benchmark(args.writers, args.readers, args.seconds)
@@ -0,0 +1,199 @@
+"""
+Per-file fetch latency benchmark for the bronze, silver and validation_errors tables.
+
+Builds a scratch DuckDB database from config/schema.json, grows it file by file in the same
+clustered order the application writes (one contiguous block per file_id, rows in row_index
+order) and times the per-file result fetches after each growth step.
+
+Tested range: 1M to 300M bronze rows (60,000 files of 5,000 rows) on 1 CPU and 6 GB of memory,
+where the median bronze fetch went from about 22 ms to 29 ms, and silver and error fetches stayed
+under 6 ms. Without the indexes (--no-indexes) the fetches were as fast up to 100M rows: the
+latency stays flat because every file is one contiguous block, whose row groups DuckDB selects
+by their min/max file_id, so the insert order matters more than the indexes. The results assume
+that order, synthetic files of equal size, a single connection and a warm cache; tables written
+in arbitrary order, much larger files or a cold cache were not measured.
+
+Usage (from the repository root; growing to 300M rows takes about half an hour):
+    python -m benchmarks.fetch_latency_benchmark --sizes 1000000,10000000,100000000,300000000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import duckdb
+
+JSON_FILE_PATH = "config/schema.json"
+
+# Bronze rows appended per INSERT while growing the tables
+MAX_BATCH_ROWS = 10_000_000
+
+BRONZE_FETCH_SQL = """
+    SELECT b.*, s.error_message, coalesce(s.error_severity, '') AS error_severity
+    FROM field_bronze_data b
+    LEFT JOIN validation_error_summary s
+        ON s.zone = 'BRONZE' AND s.file_id = b.file_id AND s.row_index = b.row_index
+    WHERE b.file_id = ?
+    ORDER BY b.id
+"""
+
+SILVER_FETCH_SQL = """
+    SELECT f.*, s.error_message, coalesce(s.error_severity, '') AS error_severity
+    FROM field_silver_data f
+    LEFT JOIN validation_error_summary s
+        ON s.zone = 'SILVER' AND s.file_id = f.file_id AND s.row_index = f.row_index
+    WHERE f.file_id = ?
+    ORDER BY f.id
+"""
+
+ERRORS_FETCH_SQL = "SELECT * FROM validation_errors WHERE file_id = ? ORDER BY row_index"
+
+
+def create_schema(connection, with_indexes=True):
+    """
+    Execute the CREATE statements of config/schema.json against the benchmark database.
+
+    :param connection: DuckDB connection.
+    :param with_indexes: Whether to create the file_id / row_index indexes.
+    """
+    with open(JSON_FILE_PATH, "r") as file:
+        schema_data = json.load(file)
+
+    for entry in schema_data:
+        if entry["query_type"] != "CREATE":
+            continue
+        if not with_indexes and "CREATE INDEX" in entry["query"].upper():
+            continue
+        connection.execute(entry["query"])
+
+
+def append_files(connection, first_file_id, file_count, rows_per_file, error_rate):
+    """
+    Append synthetic files, each written as one contiguous block ordered by row_index.
+
+    :return: Number of bronze rows appended.
+    """
+    first_id = connection.execute("SELECT coalesce(max(id), 0) + 1 FROM field_bronze_data").fetchone()[0]
+    first_error_id = connection.execute("SELECT coalesce(max(error_id), 0) + 1 FROM validation_errors").fetchone()[0]
+    total_rows = file_count * rows_per_file
+
+    connection.execute(f"""
+        INSERT INTO field_bronze_data (id, row_index, file_id, "FieldName", "FieldType", "DiscoveryDate", "X", "Y",
+                                       "CRS", "Source", "ParentFieldName", validation_timestamp)
+        SELECT
+            {first_id} + i AS id,
+            i % {rows_per_file} AS row_index,
+            {first_file_id} + i // {rows_per_file} AS file_id,
+            'Field_' || ((i % {rows_per_file}) // 50) AS FieldName,
+            'OilField' AS FieldType,
+            TIMESTAMP '2020-01-01' AS DiscoveryDate,
+            random() * 1000000 AS X,
+            random() * 1000000 AS Y,
+            'EPSG:4326' AS CRS,
+            'Generated' AS Source,
+            NULL AS ParentFieldName,
+            current_timestamp AS validation_timestamp
+        FROM range({total_rows}) t(i)
+    """)
+
+    connection.execute(f"""
+        INSERT INTO field_silver_data (id, row_index, file_id, "FieldName", "FieldType", "Source", "DiscoveryDate",
+                                       "ParentFieldName", "ParentFieldOSDUId", "AsIngestedCoordinates",
+                                       "Wgs84Coordinates", "CRS", validation_timestamp)
+        SELECT
+            {first_id} + i AS id,
+            i % {rows_per_file // 50} AS row_index,
+            {first_file_id} + i // {rows_per_file // 50} AS file_id,
+            'Field_' || (i % {rows_per_file // 50}) AS FieldName,
+            'OilField', 'Generated', DATE '2020-01-01', NULL, NULL,
+            '{{"type": "geometrycollection"}}', '{{"type": "geometrycollection"}}', NULL,
+            current_timestamp
+        FROM range({file_count * (rows_per_file // 50)}) t(i)
+    """)
+
+    connection.execute(f"""
+        INSERT INTO validation_errors (error_id, file_id, row_index, zone, field_name, error_type, error_code, created_at)
+        SELECT
+            {first_error_id} + row_number() OVER (ORDER BY file_id, row_index) - 1,
+            file_id, row_index, 'BRONZE', 'X', 'group_validation', 'polygon_not_closed', current_timestamp
+        FROM field_bronze_data
+        WHERE id >= {first_id} AND hash(id) % 1000 < {int(error_rate * 1000)}
+        ORDER BY file_id, row_index
+    """)
+
+    connection.execute(f"""
+        INSERT INTO validation_error_summary (file_id, zone, row_index, error_message, error_severity, error_count)
+        SELECT file_id, zone, row_index, 'Polygon not closed', 'ERROR', count(*)
+        FROM validation_errors
+        WHERE file_id >= {first_file_id}
+        GROUP BY file_id, zone, row_index
+        ORDER BY file_id, row_index
+    """)
+    return total_rows
+
+
+def time_fetches(connection, max_file_id, fetches):
+    """
+    Time the per-file fetch queries against randomly chosen files.
+
+    :return: Dictionary of median latencies in milliseconds per query.
+    """
+    timings = {"bronze": [], "silver": [], "errors": []}
+    queries = {"bronze": BRONZE_FETCH_SQL, "silver": SILVER_FETCH_SQL, "errors": ERRORS_FETCH_SQL}
+    for _ in range(fetches):
+        file_id = random.randint(1, max_file_id)
+        for name, query in queries.items():
+            start = time.perf_counter()
+            connection.execute(query, [file_id]).fetchall()
+            timings[name].append((time.perf_counter() - start) * 1000)
+    return {name: statistics.median(values) for name, values in timings.items()}
+
+
+def run_benchmark(sizes, rows_per_file, error_rate, fetches, with_indexes=True):
+    """
+    Grow the tables through the requested sizes and print per-file fetch latency at each step.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        connection = duckdb.connect(os.path.join(tmp_dir, "fetch_benchmark.db"))
+        create_schema(connection, with_indexes)
+
+        print(f"{'bronze rows':>14} | {'files':>8} | {'bronze ms':>10} | {'silver ms':>10} | {'errors ms':>10}")
+        print("-" * 64)
+
+        bronze_rows = 0
+        next_file_id = 1
+        for size in sizes:
+            file_count = max((size - bronze_rows) // rows_per_file, 0)
+            # Grow in bounded batches, so steps of hundreds of millions of rows fit in memory
+            while file_count:
+                batch_files = min(file_count, max(MAX_BATCH_ROWS // rows_per_file, 1))
+                bronze_rows += append_files(connection, next_file_id, batch_files, rows_per_file, error_rate)
+                next_file_id += batch_files
+                file_count -= batch_files
+            latency = time_fetches(connection, next_file_id - 1, fetches)
+            print(f"{bronze_rows:>14,} | {next_file_id - 1:>8,} | {latency['bronze']:>10.2f} | "
+                  f"{latency['silver']:>10.2f} | {latency['errors']:>10.2f}")
+
+        connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-file fetch latency as tables grow.")
+    parser.add_argument("--sizes", default="100000,1000000,10000000",
+                        help="Comma-separated bronze table sizes to measure at, e.g. 1000000,100000000.")
+    parser.add_argument("--rows-per-file", type=int, default=5000, help="Bronze rows per synthetic file.")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Fraction of bronze rows with an error.")
+    parser.add_argument("--fetches", type=int, default=20, help="Number of random files fetched per step.")
+    parser.add_argument("--no-indexes", action="store_true", help="Skip the file_id / row_index indexes.")
+    args = parser.parse_args()
+
+    run_benchmark(
+        [int(size) for size in args.sizes.split(",")],
+        args.rows_per_file,
+        args.error_rate,
+        args.fetches,
+        with_indexes=not args.no_indexes,
+    )
@@ -0,0 +1,155 @@
+"""
+Synthetic field dataset generator.
+
+Generates field CSV files in the layout of sample-data/: one row per polygon vertex, polygons
+closed by repeating their first vertex, a mix of CRS and optional parent fields (named
+ParentField_<n>, standing for fields that already exist in OSDU). A fraction of
+the fields gets one injected error, picked from the bronze and silver checks:
+
+- future_discovery_date:   DiscoveryDate in the future (WARNING)
+- Inconsistent_field_data: one vertex with another FieldType
+- polygon_incomplete:      one vertex without X
+- polygon_not_closed:      last vertex different from the first
+- crs_not_found:           a CRS unknown to the OSDU reference data
+
+Usage (from the repository root):
+    python -m benchmarks.field_dataset_generator --fields 1000 --vertices 20 --error-rate 0.05 --output uploads/synthetic.csv
+"""
+import argparse
+import math
+import random
+from datetime import date, timedelta
+
+FIELD_TYPES = ["OilField", "GasField", "MixedField"]
+
+# CRS identifier -> (weight, projected); projected CRS use metre coordinates, the others degrees
+DEFAULT_CRS_MIX = {
+    "BoundProjected:EPSG::2193_EPSG::1565": (0.5, True),
+    "EPSG:4326": (0.5, False),
+}
+
+UNKNOWN_CRS = "EPSG::0000_UNKNOWN"
+
+ERROR_TYPES = [
+    "future_discovery_date", "Inconsistent_field_data", "polygon_incomplete", "polygon_not_closed", "crs_not_found",
+]
+
+COLUMNS = ["FieldName", "FieldType", "DiscoveryDate", "X", "Y", "CRS", "Source", "ParentFieldName"]
+
+
+def parse_crs_mix(value):
+    """
+    Parse a CRS mix given as "CRS=weight[:projected],...", e.g. "EPSG:4326=0.7,EPSG::2193=0.3:projected".
+    """
+    mix = {}
+    for item in value.split(","):
+        crs, _, spec = item.rpartition("=")
+        weight, _, kind = spec.partition(":")
+        mix[crs] = (float(weight), kind == "projected")
+    return mix
+
+
+def _polygon(rng, vertices, projected):
+    # Irregular polygon around a random centre, in metres for projected CRS and degrees otherwise
+    if projected:
+        centre_x, centre_y, radius = rng.uniform(1.0e6, 2.0e6), rng.uniform(5.0e6, 6.0e6), rng.uniform(1e3, 5e4)
+    else:
+        centre_x, centre_y, radius = rng.uniform(-170, 170), rng.uniform(-80, 80), rng.uniform(0.01, 0.5)
+    points = []
+    for i in range(vertices):
+        angle = 2 * math.pi * i / vertices
+        scale = radius * rng.uniform(0.7, 1.0)
+        points.append((round(centre_x + scale * math.cos(angle), 6), round(centre_y + scale * math.sin(angle), 6)))
+    return points + [points[0]]
+
+
+def generate_field_rows(fields=100, vertices=10, error_rate=0.05, crs_mix=None, parent_rate=0.3, seed=42):
+    """
+    Generate the rows of a synthetic field file.
+
+    :param fields: Number of fields (polygons).
+    :param vertices: Distinct vertices per polygon; each polygon has vertices + 1 rows.
+    :param error_rate: Fraction of fields with one injected error, see ERROR_TYPES.
+    :param crs_mix: CRS identifier -> (weight, projected), defaults to DEFAULT_CRS_MIX.
+    :param parent_rate: Fraction of fields with a ParentFieldName, drawn from fields // 10 parent names.
+    :param seed: Random seed.
+    :return: Tuple of (list of row dicts with the COLUMNS keys, {field name: injected error}).
+    """
+    rng = random.Random(seed)
+    crs_mix = crs_mix or DEFAULT_CRS_MIX
+    crs_names = list(crs_mix)
+    crs_weights = [crs_mix[name][0] for name in crs_names]
+
+    names = [f"Field_{i:06d}" for i in range(fields)]
+    parent_names = [f"ParentField_{i:05d}" for i in range(max(fields // 10, 1))]
+    rows, injected = [], {}
+    for name in names:
+        crs = rng.choices(crs_names, weights=crs_weights)[0]
+        field_type = rng.choice(FIELD_TYPES)
+        discovery_date = date(1950, 1, 1) + timedelta(days=rng.randrange(365 * 70))
+        parent = rng.choice(parent_names) if rng.random() < parent_rate else ""
+        points = _polygon(rng, vertices, crs_mix[crs][1])
+
+        error = rng.choice(ERROR_TYPES) if rng.random() < error_rate else None
+        if error == "future_discovery_date":
+            discovery_date = date.today() + timedelta(days=rng.randrange(1, 3650))
+        elif error == "crs_not_found":
+            crs = UNKNOWN_CRS
+        elif error == "polygon_not_closed":
+            points[-1] = (points[-1][0] + 1, points[-1][1] + 1)
+        if error:
+            injected[name] = error
+
+        field_rows = [
+            {
+                "FieldName": name, "FieldType": field_type, "DiscoveryDate": discovery_date.isoformat(),
+                "X": x, "Y": y, "CRS": crs, "Source": "Generated", "ParentFieldName": parent,
+            }
+            for x, y in points
+        ]
+        if error == "Inconsistent_field_data":
+            field_rows[rng.randrange(len(field_rows))]["FieldType"] = rng.choice([t for t in FIELD_TYPES if t != field_type])
+        elif error == "polygon_incomplete":
+            field_rows[rng.randrange(1, len(field_rows) - 1)]["X"] = None
+        rows.extend(field_rows)
+    return rows, injected
+
+
+def generate_field_dataframe(**kwargs):
+    """
+    Generate a synthetic field file as a DataFrame; see generate_field_rows for the arguments.
+    """
+    import pandas as pd
+
+    rows, _ = generate_field_rows(**kwargs)
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def write_field_csv(path, **kwargs):
+    """
+    Write a synthetic field file to `path`; see generate_field_rows for the arguments.
+
+    :return: Number of rows written.
+    """
+    df = generate_field_dataframe(**kwargs)
+    df.to_csv(path, index=False)
+    return len(df)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic field CSV file.")
+    parser.add_argument("--fields", type=int, default=100, help="Number of fields (polygons).")
+    parser.add_argument("--vertices", type=int, default=10, help="Distinct vertices per polygon.")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Fraction of fields with an injected error.")
+    parser.add_argument("--crs-mix", type=parse_crs_mix, default=None,
+                        help='CRS mix as "CRS=weight[:projected],...", defaults to a projected/geographic split.')
+    parser.add_argument("--parent-rate", type=float, default=0.3, help="Fraction of fields with a parent field.")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed.")
+    parser.add_argument("--output", required=True, help="Path of the CSV file to write.")
+    args = parser.parse_args()
+
+    row_count = write_field_csv(
+        args.output, fields=args.fields, vertices=args.vertices, error_rate=args.error_rate,
+        crs_mix=args.crs_mix, parent_rate=args.parent_rate, seed=args.seed
+    )
+    print(f"Wrote {row_count} rows for {args.fields} fields to {args.output}")
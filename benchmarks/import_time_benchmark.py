@@ -0,0 +1,110 @@
+"""
+Import-time benchmark and startup budget check for the application entry module.
+
+Runs `python -X importtime -c "import app"` in fresh interpreters, reports the median cumulative
+import time with the slowest modules, and verifies that heavy libraries are not loaded at startup.
+Exits with status 1 when the median exceeds the budget or a deferred library was imported. The
+same checks run as tests in tests/test_import_time.py.
+
+Usage:
+    python -m benchmarks.import_time_benchmark --runs 5 --budget-ms 1000
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Libraries that must only be loaded on demand, not by `import app`
+DEFERRED_MODULES = ["pandas", "pandera", "pyarrow", "geopandas", "shapely", "requests"]
+
+DEFAULT_BUDGET_MS = 1000
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(args):
+    """
+    Run a fresh interpreter with the repository on its path, in a scratch directory so the files
+    created on import (e.g. logs) do not land in the caller's working directory.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+    with tempfile.TemporaryDirectory() as scratch:
+        return subprocess.run(
+            [sys.executable] + args, capture_output=True, text=True, check=True, cwd=scratch, env=env
+        )
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output into {module: (self_us, cumulative_us)}.
+    """
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        timings[module.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure(module, runs):
+    """
+    Import the module in fresh interpreters and return the cumulative times (ms) and the last timings.
+    """
+    totals, timings = [], {}
+    for _ in range(runs):
+        result = run_python(["-X", "importtime", "-c", f"import {module}"])
+        timings = parse_importtime(result.stderr)
+        totals.append(timings[module][1] / 1000)
+    return totals, timings
+
+
+def loaded_deferred_modules(module):
+    """
+    Return the deferred libraries present in sys.modules after importing the module.
+    """
+    code = (
+        f"import json, sys; import {module}; "
+        f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))"
+    )
+    result = run_python(["-c", code])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(module, runs, budget_ms, top):
+    totals, timings = measure(module, runs)
+    median_ms = statistics.median(totals)
+
+    print(f"import {module}: median {median_ms:.1f} ms over {runs} runs (min {min(totals):.1f}, max {max(totals):.1f})")
+    print("\nSlowest modules by cumulative import time:")
+    slowest = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"{cumulative_us / 1000:>10.1f} ms  {self_us / 1000:>8.1f} ms self  {name}")
+
+    failures = []
+    if median_ms > budget_ms:
+        failures.append(f"median import time {median_ms:.1f} ms exceeds the budget of {budget_ms} ms")
+    loaded = loaded_deferred_modules(module)
+    if loaded:
+        failures.append(f"libraries loaded at import time: {', '.join(loaded)}")
+
+    print()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print(f"OK: within the {budget_ms} ms budget and no deferred libraries loaded.")
+    return not failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure application import time against a startup budget.")
+    parser.add_argument("--module", default="app", help="Module to import.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreter runs.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Maximum median import time in ms.")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to list.")
+    args = parser.parse_args()
+
+    sys.exit(0 if run_benchmark(args.module, args.runs, args.budget_ms, args.top) else 1)
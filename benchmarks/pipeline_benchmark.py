@@ -0,0 +1,346 @@
+"""
+Pipeline benchmark suite for the bronze and silver processing functions.
+
+Times the hot paths of a field file on synthetic datasets (benchmarks.field_dataset_generator)
+of several sizes, against a scratch database in a temporary directory:
+
+- validate_field:                      bronze validation including the bronze and error writes
+- log_field_bronze_table:              bronze row insertion only
+- fetch_bronze_results_by_file_id:     per-file bronze results fetch
+- process_field_data_for_silver_zone:  silver processing against an OSDU stand-in
+
+With --osdu stub (default) silver calls an in-process stub client (osdu.osdu_stub); with
+--osdu server it goes through OSDUClient and HTTP to a local mock OSDU server
+(osdu.mock_osdu_server), configured through a scratch config/osdu_config.json.
+
+Each target runs `--repeat` times per size after `--warmup` runs; the median and minimum are
+reported. With --save the results are written to benchmarks/results/<commit>.json, and with
+--baseline the run is compared against an earlier result file: any target whose median is
+more than --threshold slower fails the run with exit code 1.
+
+Usage (from the repository root):
+    python -m benchmarks.pipeline_benchmark --sizes 100,1000 --repeat 5 --save
+    python -m benchmarks.pipeline_benchmark --sizes 100,1000 --baseline benchmarks/results/<commit>.json
+    python -m benchmarks.pipeline_benchmark --targets process_field_data_for_silver_zone --osdu server --osdu-latency-ms 20
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_PATH = os.path.join(REPO_ROOT, "config", "schema.json")
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+TARGETS = [
+    "validate_field",
+    "log_field_bronze_table",
+    "fetch_bronze_results_by_file_id",
+    "process_field_data_for_silver_zone",
+]
+
+
+def git_commit():
+    """
+    Returns the abbreviated commit of the repository, suffixed with -dirty for uncommitted changes.
+    """
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def prepare_environment(work_dir, log_level):
+    """
+    Switch to the scratch directory and configure the application before its modules are imported.
+
+    The database (db_files/), logs and exports use paths relative to the working directory, so
+    the benchmark never touches the repository's own database.
+    """
+    os.chdir(work_dir)
+    os.environ.setdefault("DISABLE_PANDERA_IMPORT_WARNING", "True")
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+    from config.project_config import PROJECT_CONFIG
+
+    PROJECT_CONFIG["LOGGING"]["LEVEL"] = log_level
+    PROJECT_CONFIG["LOGGING"]["QUEUE"] = True
+    # Every run must do the full work, not reuse the results of the previous repeat
+    PROJECT_CONFIG["RESULT_REUSE_MODE"] = "OFF"
+
+    from startup import initialize_database_from_json
+
+    initialize_database_from_json(SCHEMA_PATH)
+
+
+def create_osdu_client(store, mode, latency, error_rate, work_dir):
+    """
+    Returns the OSDU client used by the silver target.
+
+    :param mode: "stub" for the in-process stub client, "server" for OSDUClient calling a mock OSDU server.
+    :param latency: Delay of each OSDU request in seconds.
+    :param error_rate: Fraction of mock server requests answered with an error (server mode only).
+    """
+    if mode == "stub":
+        from osdu.osdu_stub import OSDUStubClient
+
+        return OSDUStubClient(store, latency_seconds=latency)
+
+    from osdu.mock_osdu_server import MockOSDUService, start_mock_osdu_server
+    from osdu.osdu_client import OSDUClient
+
+    server = start_mock_osdu_server(MockOSDUService(store, latency_ms=latency * 1000, error_rate=error_rate, seed=0), port=0)
+    os.makedirs(os.path.join(work_dir, "config"), exist_ok=True)
+    with open(os.path.join(work_dir, "config", "osdu_config.json"), "w") as file:
+        json.dump({
+            "base_url": f"http://127.0.0.1:{server.server_port}",
+            "headers": {"accept": "application/json", "data-partition-id": "osdu", "Content-Type": "application/json"},
+        }, file, indent=4)
+    return OSDUClient()
+
+
+class PipelineBenchmark:
+    """
+    Runs the benchmark targets on one synthetic dataset.
+    """
+
+    def __init__(self, work_dir, fields, vertices, error_rate, seed, osdu_mode, osdu_latency, osdu_error_rate):
+        import pandas as pd
+        from benchmarks.field_dataset_generator import DEFAULT_CRS_MIX, generate_field_dataframe
+        from config.project_config import PROJECT_CONFIG
+        from osdu.osdu_record_store import OSDURecordStore
+        from utils.db_util import get_columns_from_store
+        import silver.field_data_silver_processing as silver
+
+        self.df = generate_field_dataframe(fields=fields, vertices=vertices, error_rate=error_rate, seed=seed)
+        self.file_name = f"synthetic_{fields}x{vertices}.csv"
+        self.file_path = os.path.join(work_dir, self.file_name)
+        self.df.to_csv(self.file_path, index=False)
+        self.rows = len(self.df)
+
+        # Bronze rows as they are written after validation, with parsed discovery dates
+        self.bronze_df = self.df.copy()
+        self.bronze_df["DiscoveryDate"] = pd.to_datetime(self.bronze_df["DiscoveryDate"], errors="coerce", dayfirst=True)
+
+        # Known CRS and the parent fields resolve; the generator's unknown CRS does not
+        store = OSDURecordStore(
+            crs_kind=PROJECT_CONFIG["MASTER_DATA_KINDS"]["CRS"],
+            field_kind=PROJECT_CONFIG["MASTER_DATA_KINDS"]["FIELD"].replace("*", "0"),
+        )
+        for crs_id, (_, projected) in DEFAULT_CRS_MIX.items():
+            store.add_crs(crs_id, projected)
+        for parent in self.df["ParentFieldName"].dropna().unique():
+            if parent:
+                store.add_field(parent)
+        silver.client = create_osdu_client(store, osdu_mode, osdu_latency, osdu_error_rate, work_dir)
+
+        self.column_list = get_columns_from_store(PROJECT_CONFIG["SQL_TABLES"]["FIELD"]["BRONZE_TABLE"])
+        self._validated_file_id = None
+
+    def register_file(self):
+        """
+        Register the dataset as a new file and return its ID.
+        """
+        from models.files import insert_data
+        from utils.db_writer import db_writer
+
+        return db_writer.run(insert_data, self.file_path, "FIELD", "benchmark", f"benchmark-{time.time_ns()}")
+
+    def validated_file(self):
+        """
+        Returns the ID of a file whose bronze validation has been stored, validating one if needed.
+        """
+        from bronze.field_data_validator import validate_field
+
+        if self._validated_file_id is None:
+            self._validated_file_id = self.register_file()
+            validate_field(self.df.copy(), self._validated_file_id, self.file_name)
+        return self._validated_file_id
+
+    def run_once(self, target):
+        """
+        Run the untimed setup of a target, then the target itself.
+
+        :return: Duration of the target in seconds.
+        """
+        from bronze.field_data_validator import validate_field
+        from models.field_bronze_data import fetch_bronze_results_by_file_id, log_field_bronze_table
+        from silver.field_data_silver_processing import process_field_data_for_silver_zone
+
+        if target == "validate_field":
+            file_id, df = self.register_file(), self.df.copy()
+            start = time.perf_counter()
+            validate_field(df, file_id, self.file_name)
+        elif target == "log_field_bronze_table":
+            file_id, df = self.register_file(), self.bronze_df.copy()
+            start = time.perf_counter()
+            log_field_bronze_table(df, file_id)
+        elif target == "fetch_bronze_results_by_file_id":
+            file_id = self.validated_file()
+            start = time.perf_counter()
+            fetch_bronze_results_by_file_id(file_id)
+        elif target == "process_field_data_for_silver_zone":
+            file_id = self.register_file()
+            validate_field(self.df.copy(), file_id, self.file_name)
+            start = time.perf_counter()
+            process_field_data_for_silver_zone(file_id, self.file_name, self.column_list)
+        else:
+            raise ValueError(f"Unknown benchmark target: {target}")
+        return time.perf_counter() - start
+
+
+def run_benchmark(sizes, vertices, targets, repeat, warmup, error_rate, seed, osdu_mode, osdu_latency, osdu_error_rate,
+                  log_level, validation_workers=0):
+    """
+    Run the targets on every dataset size and print a summary table.
+
+    :param validation_workers: Validate in a process pool of this many workers (PARALLEL_VALIDATION)
+                               regardless of the file size; 0 validates in-process.
+
+    :return: Dictionary of results keyed by "<target>@<fields>x<vertices>".
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        previous_dir = os.getcwd()
+        try:
+            prepare_environment(work_dir, log_level)
+            if validation_workers:
+                from config.project_config import PROJECT_CONFIG
+
+                PROJECT_CONFIG["PARALLEL_VALIDATION"] = {"ENABLED": True, "WORKERS": validation_workers, "MIN_ROWS": 0}
+
+            print(f"{'target':<36} | {'fields':>7} | {'rows':>8} | {'median ms':>10} | {'min ms':>10} | {'rows/s':>10}")
+            print("-" * 96)
+            for fields in sizes:
+                benchmark = PipelineBenchmark(
+                    work_dir, fields, vertices, error_rate, seed, osdu_mode, osdu_latency, osdu_error_rate
+                )
+                for target in targets:
+                    for _ in range(warmup):
+                        benchmark.run_once(target)
+                    timings = [benchmark.run_once(target) for _ in range(repeat)]
+                    median = statistics.median(timings)
+                    results[f"{target}@{fields}x{vertices}"] = {
+                        "target": target,
+                        "fields": fields,
+                        "rows": benchmark.rows,
+                        "median_ms": median * 1000,
+                        "min_ms": min(timings) * 1000,
+                        "repeat": repeat,
+                    }
+                    print(f"{target:<36} | {fields:>7,} | {benchmark.rows:>8,} | {median * 1000:>10.1f} | "
+                          f"{min(timings) * 1000:>10.1f} | {benchmark.rows / median:>10,.0f}")
+        finally:
+            from utils.db_writer import db_writer
+
+            db_writer.drain()
+            os.chdir(previous_dir)
+    return results
+
+
+def save_results(results, parameters, path=None):
+    """
+    Write the results with the commit and parameters they were measured at.
+
+    :return: Path of the written file.
+    """
+    commit = git_commit()
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{commit}.json")
+    report = {
+        "commit": commit,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "parameters": parameters,
+        "results": results,
+    }
+    with open(path, "w") as file:
+        file.write(json.dumps(report, indent=4) + "\n")
+    return path
+
+
+def compare_results(results, baseline_path, threshold):
+    """
+    Print the change of every median against a baseline result file.
+
+    :return: List of the result keys that regressed by more than `threshold` (a fraction).
+    """
+    with open(baseline_path, "r") as file:
+        baseline = json.load(file)
+
+    print(f"\nCompared with {baseline.get('commit', baseline_path)} (threshold {threshold:.0%}):")
+    regressions = []
+    for key, result in results.items():
+        previous = baseline["results"].get(key)
+        if previous is None:
+            print(f"  {key:<48} no baseline")
+            continue
+        change = result["median_ms"] / previous["median_ms"] - 1
+        regressed = change > threshold
+        if regressed:
+            regressions.append(key)
+        print(f"  {key:<48} {previous['median_ms']:>10.1f} -> {result['median_ms']:>10.1f} ms "
+              f"({change:+.1%}){'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the bronze and silver processing functions.")
+    parser.add_argument("--sizes", default="100,1000", help="Comma-separated numbers of fields per dataset.")
+    parser.add_argument("--vertices", type=int, default=10, help="Distinct vertices per field polygon.")
+    parser.add_argument("--targets", default=",".join(TARGETS), help="Comma-separated targets to run.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per target and size.")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per target and size.")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Fraction of fields with an injected error.")
+    parser.add_argument("--seed", type=int, default=42, help="Dataset random seed.")
+    parser.add_argument("--osdu", choices=["stub", "server"], default="stub",
+                        help="OSDU stand-in for the silver target: in-process stub or local mock server.")
+    parser.add_argument("--osdu-latency-ms", type=float, default=0.0, help="Latency of each OSDU request.")
+    parser.add_argument("--osdu-error-rate", type=float, default=0.0,
+                        help="Fraction of OSDU requests failing (--osdu server only).")
+    parser.add_argument("--validation-workers", type=int, default=0,
+                        help="Validate in a process pool of this many workers; 0 validates in-process.")
+    parser.add_argument("--log-level", default="WARNING", help="Application log level during the run.")
+    parser.add_argument("--save", action="store_true", help="Save the results to benchmarks/results/<commit>.json.")
+    parser.add_argument("--output", help="Save the results to this path instead.")
+    parser.add_argument("--baseline", help="Result file to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Slowdown of the median, as a fraction, that counts as a regression.")
+    args = parser.parse_args()
+
+    parameters = {
+        "sizes": [int(size) for size in args.sizes.split(",")],
+        "vertices": args.vertices,
+        "repeat": args.repeat,
+        "warmup": args.warmup,
+        "error_rate": args.error_rate,
+        "seed": args.seed,
+        "osdu": args.osdu,
+        "osdu_latency_ms": args.osdu_latency_ms,
+        "osdu_error_rate": args.osdu_error_rate,
+        "validation_workers": args.validation_workers,
+    }
+    results = run_benchmark(
+        parameters["sizes"], args.vertices, args.targets.split(","), args.repeat, args.warmup,
+        args.error_rate, args.seed, args.osdu, args.osdu_latency_ms / 1000, args.osdu_error_rate, args.log_level.upper(),
+        args.validation_workers,
+    )
+
+    if args.save or args.output:
+        print(f"\nResults saved to {save_results(results, parameters, args.output)}")
+    if args.baseline:
+        regressions = compare_results(results, args.baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}.")
+            sys.exit(1)
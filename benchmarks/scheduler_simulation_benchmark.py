@@ -0,0 +1,215 @@
+"""
+Queueing latency simulation for the files scheduler.
+
+Replays a synthetic workload (Poisson arrivals, mostly small files with a heavy tail of large
+ones, a few urgent files) against an in-memory DuckDB database built from config/schema.json.
+Workers claim files with models.file_scheduler.select_next_file on a virtual clock, and every
+file goes through a bronze and a silver step whose duration grows with its size. The waiting
+time of each file (time spent claimable but not claimed) is reported per scheduling policy.
+
+Usage (from the repository root):
+    python -m benchmarks.scheduler_simulation_benchmark --files 500 --workers 1 --load 0.9
+"""
+import argparse
+import heapq
+import json
+import random
+import statistics
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from models.file_scheduler import select_next_file
+from utils.schema_migrations import apply_schema_migrations
+
+JSON_FILE_PATH = "config/schema.json"
+
+START_TIME = datetime(2024, 1, 1)
+
+DATATYPES = ["FIELD", "WELL_BORE", "BORE_HOLE"]
+
+# legacy: the previous behaviour, silver before bronze and then by ID, priorities ignored
+POLICIES = {
+    "legacy": {"SHORTEST_JOB_FIRST": False, "AGING_SECONDS": 0},
+    "priority+sjf": {"SHORTEST_JOB_FIRST": True, "AGING_SECONDS": 0},
+    "priority+sjf+aging": {"SHORTEST_JOB_FIRST": True},
+}
+
+
+def generate_workload(file_count, workers, load, large_fraction, urgent_fraction, seed):
+    """
+    Generate files as dicts with arrival time, size, datatype, priority and step durations (seconds).
+    """
+    rng = random.Random(seed)
+    files = []
+    for _ in range(file_count):
+        if rng.random() < large_fraction:
+            size = int(rng.uniform(20, 200) * 1024 * 1024)
+        else:
+            size = int(rng.lognormvariate(12, 1))  # ~160 KiB median
+        files.append({
+            "size": size,
+            "datatype": rng.choices(DATATYPES, weights=[8, 1, 1])[0],
+            "priority": 1 if rng.random() < urgent_fraction else 0,
+            # Fixed overhead plus parsing/validation, then OSDU lookups and conversion per byte
+            "bronze_seconds": 0.5 + size / (8 * 1024 * 1024),
+            "silver_seconds": 1.0 + size / (2 * 1024 * 1024),
+        })
+
+    mean_service = statistics.mean(f["bronze_seconds"] + f["silver_seconds"] for f in files)
+    arrival_rate = load * workers / mean_service
+    arrival = 0.0
+    for file in files:
+        arrival += rng.expovariate(arrival_rate)
+        file["arrival"] = arrival
+    return files
+
+
+def create_database():
+    engine = create_engine("duckdb:///:memory:")
+    session = sessionmaker(bind=engine)()
+    with open(JSON_FILE_PATH, "r") as file:
+        apply_schema_migrations(session, json.load(file))
+    return session
+
+
+def simulate(files, workers, policy_config, use_priorities):
+    """
+    Run the workload through the scheduler and return per-file waiting and turnaround times.
+    """
+    session = create_database()
+    at = lambda seconds: START_TIME + timedelta(seconds=seconds)
+    step = {}  # file id -> {"ready": time the file became claimable, "wait": total waiting time}
+
+    arrivals = sorted(range(len(files)), key=lambda i: files[i]["arrival"])
+    next_arrival = 0
+    completions = []  # heap of (time, file id)
+    idle_workers = workers
+    now = 0.0
+    finished = 0
+
+    while finished < len(files):
+        # Complete the steps ending now
+        while completions and completions[0][0] <= now:
+            _, file_id = heapq.heappop(completions)
+            status = session.execute(text("SELECT file_status FROM files WHERE id = :id"), {"id": file_id}).scalar()
+            next_status = "BRONZE_PROCESSED" if status == "BRONZE_PROCESSING" else "SILVER_PROCESSED"
+            session.execute(
+                text("UPDATE files SET file_status = :status, claimed_by = NULL, lease_expires_at = NULL WHERE id = :id"),
+                {"status": next_status, "id": file_id}
+            )
+            idle_workers += 1
+            if next_status == "SILVER_PROCESSED":
+                step[file_id]["done"] = now
+                finished += 1
+            else:
+                step[file_id]["ready"] = now
+
+        # Register the files arriving now
+        while next_arrival < len(arrivals) and files[arrivals[next_arrival]]["arrival"] <= now:
+            index = arrivals[next_arrival]
+            file = files[index]
+            file_id = index + 1
+            session.execute(
+                text(
+                    "INSERT INTO files (id, filename, filepath, datatype, checksum, remarks, file_status, priority, file_size, created_at) "
+                    "VALUES (:id, :name, :name, :datatype, '', '', 'PICKED', :priority, :size, :created_at)"
+                ),
+                {
+                    "id": file_id, "name": f"file_{file_id}.csv", "datatype": file["datatype"],
+                    "priority": file["priority"] if use_priorities else 0, "size": file["size"],
+                    "created_at": at(file["arrival"]),
+                }
+            )
+            step[file_id] = {"ready": file["arrival"], "wait": 0.0}
+            next_arrival += 1
+
+        # Hand the next files to the idle workers
+        while idle_workers:
+            file_id = select_next_file(session, at(now), policy_config)
+            if file_id is None:
+                break
+            status = session.execute(text("SELECT file_status FROM files WHERE id = :id"), {"id": file_id}).scalar()
+            bronze = status == "PICKED"
+            session.execute(
+                text(
+                    "UPDATE files SET file_status = :status, claimed_by = 'simulation', lease_expires_at = :lease "
+                    "WHERE id = :id"
+                ),
+                {"status": "BRONZE_PROCESSING" if bronze else "SILVER_PROCESSING", "lease": at(now + 86400), "id": file_id}
+            )
+            step[file_id]["wait"] += now - step[file_id]["ready"]
+            duration = files[file_id - 1]["bronze_seconds" if bronze else "silver_seconds"]
+            heapq.heappush(completions, (now + duration, file_id))
+            idle_workers -= 1
+
+        # Advance the clock to the next event
+        upcoming = [completions[0][0]] if completions else []
+        if next_arrival < len(arrivals):
+            upcoming.append(files[arrivals[next_arrival]]["arrival"])
+        if not upcoming:
+            break
+        now = min(upcoming)
+
+    session.close()
+    return {
+        file_id: (timing["wait"], timing["done"] - files[file_id - 1]["arrival"])
+        for file_id, timing in step.items()
+    }
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def report(name, files, results, large_size):
+    waits = [wait for wait, _ in results.values()]
+    small = [results[i + 1][0] for i, f in enumerate(files) if f["size"] < large_size]
+    large = [results[i + 1][0] for i, f in enumerate(files) if f["size"] >= large_size]
+    urgent = [results[i + 1][0] for i, f in enumerate(files) if f["priority"]]
+    turnaround = [total for _, total in results.values()]
+    mean = lambda values: statistics.mean(values) if values else 0.0
+    print(
+        f"{name:<20} {mean(waits):>9.1f} {percentile(waits, 0.5):>9.1f} {percentile(waits, 0.95):>9.1f} "
+        f"{mean(small):>10.1f} {percentile(small, 0.95):>10.1f} {mean(large):>10.1f} {max(large, default=0):>10.1f} "
+        f"{mean(urgent):>10.1f} {mean(turnaround):>11.1f}"
+    )
+
+
+def run_benchmark(args):
+    files = generate_workload(args.files, args.workers, args.load, args.large_fraction, args.urgent_fraction, args.seed)
+    large_size = 20 * 1024 * 1024
+    quotas = dict(item.split("=") for item in args.quotas.split(",")) if args.quotas else {}
+    quotas = {datatype: int(limit) for datatype, limit in quotas.items()}
+
+    print(
+        f"{len(files)} files ({sum(f['size'] >= large_size for f in files)} large, "
+        f"{sum(f['priority'] for f in files)} urgent), {args.workers} workers, load {args.load}, "
+        f"aging every {args.aging_seconds} s; times in simulated seconds"
+    )
+    print(
+        f"{'policy':<20} {'wait avg':>9} {'wait p50':>9} {'wait p95':>9} {'small avg':>10} {'small p95':>10} "
+        f"{'large avg':>10} {'large max':>10} {'urgent avg':>10} {'turnaround':>11}"
+    )
+    for name, policy in POLICIES.items():
+        config = dict(policy)
+        config.setdefault("AGING_SECONDS", args.aging_seconds)
+        if name != "legacy":
+            config["DATATYPE_QUOTAS"] = quotas
+        results = simulate(files, args.workers, config, use_priorities=name != "legacy")
+        report(name, files, results, large_size)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate queueing latency under the files scheduler policies.")
+    parser.add_argument("--files", type=int, default=500, help="Number of files in the workload.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of concurrent workers.")
+    parser.add_argument("--load", type=float, default=0.9, help="Offered load relative to worker capacity.")
+    parser.add_argument("--large-fraction", type=float, default=0.05, help="Fraction of 20-200 MiB files.")
+    parser.add_argument("--urgent-fraction", type=float, default=0.05, help="Fraction of files with priority 1.")
+    parser.add_argument("--aging-seconds", type=int, default=300, help="AGING_SECONDS for the aging policy.")
+    parser.add_argument("--quotas", default="", help="DATATYPE_QUOTAS as DATATYPE=N,... (multi-worker runs).")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed of the workload.")
+    run_benchmark(parser.parse_args())
@@ -1,146 +1,212 @@
+import atexit
+import multiprocessing
 import os
+import threading
 import traceback
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 import pandas as pd
 import pandera as pa
-from pandera.typing import Series
+import pyarrow
 
+from bronze.field_schema import build_field_schema, schema_errors_to_validation_errors, validate_field_shard
+from bronze.rule_catalog import compile_rules
 from config.logger_config import logger
 from config.project_config import PROJECT_CONFIG
-from models.field_bronze_data import log_field_bronze_table, fetch_bronze_results_by_file_id
+from models.field_bronze_data import log_field_bronze_table, build_bronze_results_query
 from models.validation_errors import log_errors_to_db
+from models.validation_rules import fetch_validation_rules
+from utils.export_queue import ExportJob, submit_export
 from utils.generate_pandera_schema import generate_pandera_class_from_table_info
+from utils.pipeline_metrics import pipeline_metrics
 
 # List to store validation errors
 validation_errors = []
 error_index = []
 
+# PARALLEL_VALIDATION settings, overridden by PROJECT_CONFIG["PARALLEL_VALIDATION"]:
+# - ENABLED:      validate large files in a process pool, sharded by FieldName.
+# - WORKERS:      number of worker processes; 0 uses the CPU count.
+# - MIN_ROWS:     files with fewer rows are validated in-process, where the pool overhead is not worth it.
+# - START_METHOD: multiprocessing start method of the workers. "spawn" works on every platform and
+#                 does not fork the database and writer threads.
+DEFAULT_PARALLEL_VALIDATION_CONFIG = {
+    "ENABLED": False,
+    "WORKERS": 0,
+    "MIN_ROWS": 100000,
+    "START_METHOD": "spawn",
+}
+
+_pool_lock = threading.Lock()
+_validation_pool = None
+_validation_pool_key = None
+
+def get_parallel_validation_config():
+    """
+    Returns the parallel validation settings: the defaults updated with PROJECT_CONFIG["PARALLEL_VALIDATION"].
+    """
+    config = dict(DEFAULT_PARALLEL_VALIDATION_CONFIG)
+    config.update(PROJECT_CONFIG.get("PARALLEL_VALIDATION", {}))
+    return config
+
+def fetch_catalog_rules(table_name):
+    """
+    Fetch the validation rules of the table from the rule catalog, warning about rules that cannot be compiled.
+    """
+    rules = fetch_validation_rules(table_name, "BRONZE")
+    skipped = compile_rules(rules).skipped
+    if skipped:
+        logger.warning(f"Validation rules of unknown kind or without group_by are skipped: {skipped}")
+    return rules
+
 def integrate_custom_checks(table_name, class_name="DynamicFieldSchema"):
     """
     Generate Pandera schema with custom validation checks.
     """
     # Generate schema code dynamically
     schema_code = generate_pandera_class_from_table_info(table_name, class_name)
-    exec_globals = {"pa": pa, "Series": Series, "pd": pd, "datetime": datetime}
-    exec(schema_code, exec_globals)
-    base_schema_class = exec_globals[class_name]
-
-    # Define custom checks as methods in a subclass
-    class CustomDynamicFieldSchema(base_schema_class):
-        # Validate DiscoveryDate is <= today
-        @pa.dataframe_check
-        def validate_discovery_date(cls, df: pd.DataFrame) -> bool:
-            """Check if DiscoveryDate is not in the future."""
-            today = pd.Timestamp(datetime.now().date())
-            invalid_rows = df[df["DiscoveryDate"] > today]
-            if not invalid_rows.empty:
-                for idx in invalid_rows.index:
-                    error_index.append(idx)
-                    validation_errors.append({
-                        "row_index": str(idx),
-                        "field_name": "DiscoveryDate",
-                        "error_type": "row_validation",
-                        "error_code": "future_discovery_date"
-                    })
-            return True
-
-        # Ensure FieldType and DiscoveryDate are consistent for each FieldName
-        @pa.dataframe_check
-        def validate_consistency(cls, df: pd.DataFrame) -> bool:
-            """Check consistency of FieldType and DiscoveryDate within FieldName."""
-            for fieldname, group in df.groupby("FieldName"):
-                if group["FieldType"].nunique() > 1 or group["DiscoveryDate"].nunique() > 1:
-                    error_index.extend(group.index.tolist())
-                    for idx in group.index.tolist():
-                        validation_errors.append({
-                            "row_index": str(idx),
-                            "field_name": fieldname,
-                            "error_type": "group_validation",
-                            "error_code": "Inconsistent_field_data"
-                        })
-            return True
-
-        # Validate Polygon Completeness (X, Y, CRS must all be present or null)
-        @pa.dataframe_check
-        def validate_polygon_completeness(cls, df: pd.DataFrame) -> bool:
-            """Ensure X, Y, CRS are either all present or all null."""
-            for fieldname, group in df.groupby("FieldName"):
-                condition = (
-                        (group["X"].isnull() == group["Y"].isnull()) &
-                        (group["Y"].isnull() == group["CRS"].isnull())
-                )
-                if not condition.all():
-                    error_index.extend(group.index.tolist())
-                    for idx in group.index.tolist():
-                        validation_errors.append({
-                            "row_index": str(idx),
-                            "field_name": fieldname,
-                            "error_type": "group_validation",
-                            "error_code": "polygon_incomplete"
-                        })
-            return True
-
-        # Validate Polygon Closure (First and last X, Y must match)
-        @pa.dataframe_check
-        def validate_polygon_closure(cls, df: pd.DataFrame) -> bool:
-            """Ensure the first and last coordinates of a polygon match."""
-            for fieldname, group in df.groupby("FieldName"):
-                group = group.dropna(subset=["X", "Y"])
-                if len(group) >= 2 and not (
-                        (group.iloc[0]["X"] == group.iloc[-1]["X"]) and
-                        (group.iloc[0]["Y"] == group.iloc[-1]["Y"])
-                ):
-                    error_index.extend(group.index.tolist())
-                    for idx in group.index.tolist():
-                        validation_errors.append({
-                            "row_index": str(idx),
-                            "field_name": fieldname,
-                            "error_type": "group_validation",
-                            "error_code": "polygon_not_closed"
-                        })
-            return True
-
-    return CustomDynamicFieldSchema
-
-
-def log_and_save_results(df, file_id, file_name, validation_errors):
-    """Log validation results and save to CSV."""
+    return build_field_schema(
+        schema_code, class_name, fetch_catalog_rules(table_name), validation_errors, error_index,
+        pipeline_metrics.timed("custom_checks")
+    )
+
+def _get_validation_pool(workers, start_method):
+    """Returns the worker pool, started on first use and kept for the following files."""
+    global _validation_pool, _validation_pool_key
+    with _pool_lock:
+        if _validation_pool is None or _validation_pool_key != (workers, start_method):
+            if _validation_pool is not None:
+                _validation_pool.shutdown()
+            logger.info(f"Starting {workers} validation worker processes ({start_method}).")
+            _validation_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context(start_method)
+            )
+            _validation_pool_key = (workers, start_method)
+        return _validation_pool
+
+def shutdown_validation_pool(wait=True, pool=None):
+    """
+    Stop the validation worker processes, if they were started; the next file starts new ones.
+    With `pool`, only that pool is stopped, if it is still the current one.
+    """
+    global _validation_pool, _validation_pool_key
+    with _pool_lock:
+        if _validation_pool is not None and pool in (None, _validation_pool):
+            _validation_pool.shutdown(wait=wait, cancel_futures=not wait)
+            _validation_pool, _validation_pool_key = None, None
+
+atexit.register(shutdown_validation_pool)
+
+def shard_by_field_name(df, shards):
+    """
+    Hash-partition the rows by FieldName, so that every group check sees all rows of a field.
+    Rows keep their index (the row indices of the file) and their order within each shard.
+    """
+    shard_ids = pd.util.hash_pandas_object(df["FieldName"], index=False).to_numpy() % shards
+    return [df[shard_ids == shard] for shard in range(shards)]
+
+def _to_arrow_payload(df):
+    """Serialize a shard as an Arrow IPC stream, keeping its index as a column."""
+    table = pyarrow.Table.from_pandas(df, preserve_index=True)
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+def validate_field_parallel(df, table_name, workers, start_method, class_name="DynamicFieldSchema"):
+    """
+    Validate the field data in a process pool, one FieldName shard per worker.
+
+    :return: Tuple of (validation error records with the row indices of the whole file, whether
+             Pandera reported schema errors), or None if the data cannot be converted to Arrow
+             (e.g. a column mixing numbers and text) or a shard could not be validated, in which
+             case the file is validated in-process.
+    """
+    schema_code = generate_pandera_class_from_table_info(table_name, class_name)
+    rules = fetch_catalog_rules(table_name)
+    try:
+        with pipeline_metrics.stage("shard_transfer", rows=len(df)):
+            payloads = [_to_arrow_payload(shard) for shard in shard_by_field_name(df, workers) if not shard.empty]
+    except pyarrow.ArrowException as e:
+        logger.warning(f"Cannot shard the data for parallel validation, validating in-process: {e}")
+        return None
+
+    shard_errors, schema_errors_detected = [], False
+    try:
+        pool = _get_validation_pool(workers, start_method)
+        futures = [pool.submit(validate_field_shard, schema_code, class_name, rules, payload) for payload in payloads]
+        for future in futures:
+            errors, schema_errors = future.result()
+            shard_errors.extend(errors)
+            schema_errors_detected = schema_errors_detected or schema_errors
+    except BrokenProcessPool as e:
+        # A worker died (e.g. out of memory): the pool cannot be used again, so start a new one next time
+        logger.error(f"Validation worker process failed, validating in-process: {e}")
+        shutdown_validation_pool(wait=False, pool=pool)
+        return None
+    except Exception:
+        # Without the errors of every shard the file would be stored as valid
+        logger.error(f"Parallel validation failed, validating in-process: {traceback.format_exc()}")
+        return None
+
+    # A row belongs to a single shard, so the errors of each row keep their serial order. Errors
+    # without a row (whole-column failures) are reported by every shard and kept once.
+    merged, seen_column_errors = [], set()
+    for error in shard_errors:
+        if error["row_index"] is None:
+            key = (error["field_name"], error["error_code"])
+            if key in seen_column_errors:
+                continue
+            seen_column_errors.add(key)
+        merged.append(error)
+    return merged, schema_errors_detected
+
+def log_and_save_results(df, file_id, file_name, validation_errors, unit_of_work=None):
+    """Log validation results to the database, within the unit of work when one is given."""
     try:
         # Log validation results
-        log_field_bronze_table(df, file_id)
-        log_errors_to_db(validation_errors, file_id, "BRONZE")
-        result_df = fetch_bronze_results_by_file_id(file_id)
-
-        output_dir = "output"
-        os.makedirs(output_dir, exist_ok=True)
-        result_df.to_csv(f"{output_dir}/{file_name}_validation_results.csv", index=False)
-        logger.info(f"Results saved to '{output_dir}/{file_name}_validation_results.csv'.")
+        log_field_bronze_table(df, file_id, unit_of_work)
+        log_errors_to_db(list(validation_errors), file_id, "BRONZE", unit_of_work)
     except Exception as e:
         logger.error(f"Error logging and saving results: {e}")
 
-def validate_field(df, file_id, file_name):
+def export_bronze_results(file_id, file_name):
+    """Queue the export of the bronze validation results of a file."""
+    submit_export(ExportJob(file_id, file_name, "BRONZE", build_bronze_results_query, "validation_results"))
+
+def validate_field(df, file_id, file_name, unit_of_work=None):
     """Main function to validate data."""
+    table_name = PROJECT_CONFIG["SQL_TABLES"]["FIELD"]["BRONZE_TABLE"]
+    parallel_config = get_parallel_validation_config()
     try:
-        DynamicFieldSchema = integrate_custom_checks(PROJECT_CONFIG["SQL_TABLES"]["FIELD"]["BRONZE_TABLE"])
         # Convert DiscoveryDate to datetime with dayfirst=True
         df['DiscoveryDate'] = pd.to_datetime(df['DiscoveryDate'], errors='coerce', dayfirst=True)
 
-        DynamicFieldSchema.validate(df, lazy=True)
+        if parallel_config["ENABLED"] and len(df) >= parallel_config["MIN_ROWS"]:
+            workers = parallel_config["WORKERS"] or os.cpu_count() or 1
+            # The custom checks run in the workers and are not timed on their own
+            with pipeline_metrics.stage("pandera_validate", rows=len(df)):
+                result = validate_field_parallel(df, table_name, workers, parallel_config["START_METHOD"])
+            if result is not None:
+                shard_errors, schema_errors_detected = result
+                validation_errors.extend(shard_errors)
+                if schema_errors_detected:
+                    logger.warning("Validation schema errors detected.")
+                return
+
+        with pipeline_metrics.stage("schema_build"):
+            DynamicFieldSchema = integrate_custom_checks(table_name)
+
+        # Includes the custom checks, which are also timed on their own
+        with pipeline_metrics.stage("pandera_validate", rows=len(df)):
+            DynamicFieldSchema.validate(df, lazy=True)
     except pa.errors.SchemaErrors as e:
-        validation_errors.extend(
-            {
-                "row_index": error.get("index"),
-                "field_name": error.get("column"),
-                "error_type": "row_validation",
-                "error_code": error.get("check"),
-            }
-            for _, error in e.failure_cases.iterrows()
-        )
+        validation_errors.extend(schema_errors_to_validation_errors(e))
         logger.warning("Validation schema errors detected.")
     except Exception as ex:
         logger.error(f"Unexpected error during validation: {traceback.format_exc()}")
     finally:
-        log_and_save_results(df, file_id, file_name, validation_errors)
+        log_and_save_results(df, file_id, file_name, validation_errors, unit_of_work)
         validation_errors.clear()
         error_index.clear()
@@ -0,0 +1,108 @@
+"""
+Pandera schema of the bronze field data with the rules of the validation rule catalog.
+
+Nothing here touches the database or the application logger, so the schema can also be built
+and run in the worker processes of parallel validation (see bronze.field_data_validator). The
+schema code itself is generated from the table info by the caller and passed in as a string.
+"""
+from datetime import datetime
+
+import pandas as pd
+import pandera as pa
+import pyarrow
+from pandera.typing import Series
+
+from bronze.rule_catalog import compile_rules
+
+
+def build_field_schema(schema_code, class_name, rules, validation_errors, error_index, timed=None):
+    """
+    Build the Pandera schema from the generated schema code and add the rules of the catalog.
+
+    Parameters:
+        schema_code (str): Schema class code from generate_pandera_class_from_table_info.
+        class_name (str): Name of the class defined by the schema code.
+        rules (list): Catalog rules from models.validation_rules.fetch_validation_rules.
+        validation_errors (list): List the rule check appends its errors to.
+        error_index (list): List the rule check appends the failing row indices to.
+        timed (callable): Optional decorator applied to the rule check.
+
+    Returns:
+        The schema class.
+    """
+    timed = timed or (lambda func: func)
+    exec_globals = {"pa": pa, "Series": Series, "pd": pd, "datetime": datetime}
+    exec(schema_code, exec_globals)
+    base_schema_class = exec_globals[class_name]
+    compiled_rules = compile_rules(rules)
+
+    # The catalog rules run as one dataframe check, all of them in one pass over the frame
+    class CustomDynamicFieldSchema(base_schema_class):
+        @pa.dataframe_check
+        @timed
+        def validate_catalog_rules(cls, df: pd.DataFrame) -> bool:
+            """Evaluate the compiled rules of the validation rule catalog."""
+            for rule, index, field_names in compiled_rules.failures(df):
+                error_index.extend(index)
+                validation_errors.extend(
+                    {
+                        "row_index": str(idx),
+                        "field_name": field_name,
+                        "error_type": rule["error_type"],
+                        "error_code": rule["rule_code"],
+                    }
+                    for idx, field_name in zip(index, field_names)
+                )
+            return True
+
+    return CustomDynamicFieldSchema
+
+
+def schema_errors_to_validation_errors(schema_errors):
+    """
+    Convert the failure cases of a Pandera SchemaErrors into validation error records.
+
+    The columns are converted as a whole rather than row by row; failures of a whole column
+    (no row) have a row_index of None.
+    """
+    failure_cases = schema_errors.failure_cases
+    row_indices = failure_cases["index"].astype(object)
+    return [
+        {
+            "row_index": row_index,
+            "field_name": field_name,
+            "error_type": "row_validation",
+            "error_code": error_code,
+        }
+        for row_index, field_name, error_code in zip(
+            row_indices.where(row_indices.notna(), None).tolist(),
+            failure_cases["column"].tolist(),
+            failure_cases["check"].tolist(),
+        )
+    ]
+
+
+def validate_field_shard(schema_code, class_name, rules, arrow_payload):
+    """
+    Validate one shard of the field data in a worker process.
+
+    Parameters:
+        schema_code (str): Schema class code from generate_pandera_class_from_table_info.
+        class_name (str): Name of the class defined by the schema code.
+        rules (list): Catalog rules from models.validation_rules.fetch_validation_rules.
+        arrow_payload (pyarrow.Buffer): The shard as an Arrow IPC stream, with its index (the row
+            indices of the whole file) stored as a column.
+
+    Returns:
+        tuple: (validation error records of the shard in the order of a serial validation,
+            whether Pandera reported schema errors).
+    """
+    df = pyarrow.ipc.open_stream(arrow_payload).read_all().to_pandas()
+    validation_errors = []
+    schema = build_field_schema(schema_code, class_name, rules, validation_errors, [])
+    try:
+        schema.validate(df, lazy=True)
+    except pa.errors.SchemaErrors as e:
+        validation_errors.extend(schema_errors_to_validation_errors(e))
+        return validation_errors, True
+    return validation_errors, False
@@ -0,0 +1,323 @@
+"""
+SQL-pushdown validation of field files: the CSV is staged into DuckDB and validated there.
+
+Instead of reading the file into pandas, the bronze step runs one write job that
+- reads the CSV into a temporary table with DuckDB's parallel reader (all values as text),
+- casts the data columns to the types of the bronze table into a second temporary table,
+- runs one INSERT ... SELECT per rule of the validation rule catalog (bronze.rule_catalog) and
+  per schema check (NOT NULL columns and values that cannot be cast) into a temporary error table,
+- and writes the bronze rows and their errors with INSERT ... SELECT, in the job's transaction,
+  bounded per rule and group like models.validation_errors.
+
+The error codes are those of bronze.field_data_validator, including Pandera's codes for schema
+failures. Unlike the pandas path, values that cannot be cast are stored as NULL and reported, and
+rows with a null in a NOT NULL column are reported and left out, instead of failing the bronze
+write of the whole file.
+"""
+import warnings
+from datetime import datetime
+
+from bronze.rule_catalog import compile_rules_sql
+from config.logger_config import logger
+from config.project_config import PROJECT_CONFIG
+from models.validation_error_groups import bounds_errors, get_error_output_config
+from models.validation_error_summary import refresh_error_summary
+from models.validation_rules import fetch_validation_rules
+from utils.db_writer import db_writer
+from utils.generate_pandera_schema import fetch_data_columns, fetch_table_info
+from utils.pipeline_metrics import pipeline_metrics
+
+# SQL_VALIDATION settings, overridden by PROJECT_CONFIG["SQL_VALIDATION"]:
+# - ENABLED:        validate files of at least MIN_FILE_BYTES inside DuckDB instead of pandas.
+# - MIN_FILE_BYTES: smaller files are read into pandas and validated there.
+# - DATE_FORMATS:   strptime formats tried, in order, for date values whose format cannot be
+#                   inferred from the first date of the column (as pandas.to_datetime does).
+DEFAULT_SQL_VALIDATION_CONFIG = {
+    "ENABLED": False,
+    "MIN_FILE_BYTES": 50 * 1024 * 1024,
+    "DATE_FORMATS": ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y %H:%M:%S"],
+}
+
+# Values read as missing, the defaults of pandas.read_csv
+CSV_NULL_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+# SQL type of a bronze column -> (DuckDB type it is cast to, pandas dtype named in Pandera's error codes)
+CAST_TYPES = {
+    "REAL": ("DOUBLE", "float64"),
+    "DOUBLE": ("DOUBLE", "float64"),
+    "FLOAT": ("DOUBLE", "float64"),
+    "NUMERIC": ("DOUBLE", "float64"),
+    "DECIMAL": ("DOUBLE", "float64"),
+    "INTEGER": ("BIGINT", "int64"),
+    "BIGINT": ("BIGINT", "int64"),
+    "SMALLINT": ("BIGINT", "int64"),
+    "BOOLEAN": ("BOOLEAN", "bool"),
+}
+DATE_TYPES = ("TIMESTAMP", "DATE")
+
+
+def get_sql_validation_config():
+    """
+    Returns the SQL validation settings: the defaults updated with PROJECT_CONFIG["SQL_VALIDATION"].
+    """
+    config = dict(DEFAULT_SQL_VALIDATION_CONFIG)
+    config.update(PROJECT_CONFIG.get("SQL_VALIDATION", {}))
+    return config
+
+
+def _quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sql_literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def fetch_bronze_columns(table_name):
+    """
+    Fetch the data columns of the bronze table with their SQL types and NOT NULL constraints.
+
+    :param table_name: Name of the bronze table.
+    :return: List of (column name, SQL type, not null) tuples in table order.
+    """
+    data_columns = fetch_data_columns(table_name) or []
+    return [
+        (column[1], column[2].upper(), bool(column[3]))
+        for column in fetch_table_info(table_name) or []
+        if column[1] in data_columns
+    ]
+
+
+def _guess_date_format(value):
+    """The strptime format pandas.to_datetime(dayfirst=True) infers from a date value, or None."""
+    try:
+        from pandas.tseries.api import guess_datetime_format
+    except ImportError:  # pandas < 2.2
+        from pandas._libs.tslibs.parsing import guess_datetime_format
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return guess_datetime_format(value, dayfirst=True)
+
+
+def _typed_column_sql(connection, raw_table, column, sql_type, date_formats):
+    """The expression casting a staged text column to the type of its bronze column."""
+    source = _quote_identifier(column)
+    if sql_type in CAST_TYPES:
+        return f"TRY_CAST({source} AS {CAST_TYPES[sql_type][0]})"
+    if sql_type in DATE_TYPES:
+        # Like pandas.to_datetime, the format of the first date applies to the whole column
+        first_value = connection.execute(
+            f"SELECT {source} FROM {raw_table} WHERE {source} IS NOT NULL ORDER BY rowid LIMIT 1"
+        ).fetchone()
+        first_format = _guess_date_format(first_value[0]) if first_value else None
+        formats = [first_format] if first_format else date_formats
+        attempts = ", ".join(f"try_strptime({source}, {_sql_literal(date_format)})" for date_format in formats)
+        return f"coalesce({attempts}, NULL::TIMESTAMP)"
+    return source
+
+
+def _schema_checks_sql(columns, raw_table, row_index, base_order):
+    """
+    SELECTs of the schema failures reported by Pandera in the pandas path: values that cannot be
+    cast (`coerce_dtype(...)`, then `dtype(...)`) and nulls in NOT NULL columns (`not_nullable`).
+
+    :param row_index: Expression of the row index in the staged text table.
+    :return: List of (error code, SELECT of the failing row_index and field_name, order) tuples.
+    """
+    checks = []
+    for position, (column, sql_type, not_null) in enumerate(columns):
+        source = _quote_identifier(column)
+        if sql_type in CAST_TYPES:
+            cast_type, dtype = CAST_TYPES[sql_type]
+            if dtype == "int64" and not not_null:
+                dtype = "Int64"  # Pandera's nullable integer type
+            failing = (
+                f"SELECT {row_index} AS row_index, {_sql_literal(column)} AS field_name FROM {raw_table} "
+                f"WHERE {source} IS NOT NULL AND TRY_CAST({source} AS {cast_type}) IS NULL"
+            )
+            checks.append((f"coerce_dtype('{dtype}')", failing, base_order + position))
+            checks.append((f"dtype('{dtype}')", failing, base_order + 2 * len(columns) + position))
+        if not_null:
+            failing = (
+                f"SELECT {row_index} AS row_index, {_sql_literal(column)} AS field_name FROM {raw_table} "
+                f"WHERE {source} IS NULL"
+            )
+            checks.append(("not_nullable", failing, base_order + len(columns) + position))
+    return checks
+
+
+def _bounded_errors_sql(errors_table, config):
+    """
+    SELECT of the staged errors with a `logged` flag, false for the errors beyond the ERROR_OUTPUT
+    limits, bounded like models.validation_error_groups.bound_errors.
+    """
+    if not bounds_errors("BRONZE", config):
+        return f"SELECT *, true AS logged FROM {errors_table}"
+
+    def within(rank, limit):
+        return f"{rank} <= {int(limit)}" if limit else "true"
+
+    order = "ORDER BY row_index, error_order"
+    group_rank = f"row_number() OVER (PARTITION BY error_type, error_code, field_name {order})"
+    rule_rank = f"row_number() OVER (PARTITION BY error_type, error_code, within_group {order})"
+    return (
+        f"SELECT * EXCLUDE (within_group, rule_rank), "
+        f"within_group AND {within('rule_rank', config['MAX_ERRORS_PER_RULE'])} AS logged FROM ("
+        f"SELECT *, {rule_rank} AS rule_rank FROM ("
+        f"SELECT *, {within(group_rank, config['MAX_ERRORS_PER_GROUP'])} AS within_group FROM {errors_table}))"
+    )
+
+
+def stage_and_validate_field(session, file_path, file_id, table_name, columns, rules, date_formats):
+    """
+    Stage a field CSV into DuckDB, validate it with the rule catalog and write its bronze rows
+    and validation errors, without committing.
+
+    :param session: SQLAlchemy session owned by the caller.
+    :param file_path: Path of the CSV file.
+    :param file_id: ID of the file being processed.
+    :param table_name: Bronze table the rows are written to.
+    :param columns: Data columns from fetch_bronze_columns.
+    :param rules: Catalog rules from models.validation_rules.fetch_validation_rules.
+    :param date_formats: Fallback strptime formats of date columns.
+    """
+    connection = session.connection().connection.driver_connection
+    raw_table, staged_table, errors_table, bounded_table = (
+        f"bronze_{name}_{file_id}" for name in ("raw", "staged", "errors", "bounded_errors")
+    )
+    now = datetime.now()
+    with pipeline_metrics.stage("csv_stage", file_id=file_id, zone="BRONZE") as staging:
+        null_values = ", ".join(_sql_literal(value) for value in CSV_NULL_VALUES)
+        connection.execute(
+            f"CREATE OR REPLACE TEMP TABLE {raw_table} AS SELECT * FROM read_csv({_sql_literal(file_path)}, "
+            f"header = true, all_varchar = true, delim = ',', quote = '\"', escape = '\"', "
+            f"nullstr = [{null_values}])"
+        )
+        # Row ids of a new table follow the insertion (file) order but need not start at 0
+        first_rowid = connection.execute(f"SELECT coalesce(min(rowid), 0) FROM {raw_table}").fetchone()[0]
+        row_index = f"(rowid - {first_rowid})"
+        typed_expressions = {
+            column: _typed_column_sql(connection, raw_table, column, sql_type, date_formats)
+            for column, sql_type, _ in columns
+        }
+        typed_columns = ", ".join(
+            f"{expression} AS {_quote_identifier(column)}" for column, expression in typed_expressions.items()
+        )
+        connection.execute(
+            f"CREATE OR REPLACE TEMP TABLE {staged_table} AS "
+            f"SELECT {row_index} AS row_index, {typed_columns} FROM {raw_table} ORDER BY rowid"
+        )
+        staging.rows = connection.execute(f"SELECT count(*) FROM {staged_table}").fetchone()[0]
+
+        # Pandera leaves a column that cannot be coerced as read, so the rules see its text values
+        uncast_columns = [
+            column for column, sql_type, _ in columns
+            if sql_type in CAST_TYPES and connection.execute(
+                f"SELECT count(*) FROM {raw_table} WHERE {_quote_identifier(column)} IS NOT NULL "
+                f"AND TRY_CAST({_quote_identifier(column)} AS {CAST_TYPES[sql_type][0]}) IS NULL"
+            ).fetchone()[0]
+        ]
+        rules_table = staged_table
+        if uncast_columns:
+            rules_table = f"bronze_rules_{file_id}"
+            rule_columns = ", ".join(
+                f"{_quote_identifier(column) if column in uncast_columns else expression} AS {_quote_identifier(column)}"
+                for column, expression in typed_expressions.items()
+            )
+            connection.execute(
+                f"CREATE OR REPLACE TEMP TABLE {rules_table} AS "
+                f"SELECT {row_index} AS row_index, {rule_columns} FROM {raw_table} ORDER BY rowid"
+            )
+
+    with pipeline_metrics.stage("sql_validate", file_id=file_id, zone="BRONZE", rows=staging.rows) as validation:
+        connection.execute(
+            f"CREATE OR REPLACE TEMP TABLE {errors_table} "
+            f"(row_index BIGINT, field_name TEXT, error_type TEXT, error_code TEXT, error_order INTEGER)"
+        )
+        compiled_rules, skipped = compile_rules_sql(rules, rules_table)
+        if skipped:
+            logger.warning(f"Validation rules of unknown kind or without group_by are skipped: {skipped}")
+        for order, (rule, select) in enumerate(compiled_rules):
+            parameters = {"error_type": rule["error_type"], "error_code": rule["rule_code"], "error_order": order}
+            if "$today" in select:
+                parameters["today"] = datetime(now.year, now.month, now.day)
+            connection.execute(
+                f"INSERT INTO {errors_table} SELECT row_index, field_name, $error_type, $error_code, $error_order "
+                f"FROM ({select})",
+                parameters
+            )
+        for error_code, select, order in _schema_checks_sql(columns, raw_table, row_index, len(compiled_rules)):
+            connection.execute(
+                f"INSERT INTO {errors_table} SELECT row_index, field_name, 'row_validation', $error_code, $error_order "
+                f"FROM ({select})",
+                {"error_code": error_code, "error_order": order}
+            )
+        validation.errors = connection.execute(f"SELECT count(*) FROM {errors_table}").fetchone()[0]
+
+    with pipeline_metrics.stage("bronze_write", file_id=file_id, zone="BRONZE", rows=staging.rows):
+        column_list = ", ".join(_quote_identifier(column) for column, _, _ in columns)
+        # Rows with a null in a NOT NULL column are reported as not_nullable and not written
+        complete = " AND ".join(
+            [f"{_quote_identifier(column)} IS NOT NULL" for column, _, not_null in columns if not_null] or ["true"]
+        )
+        connection.execute(
+            f"INSERT INTO {table_name} (id, row_index, file_id, {column_list}, validation_timestamp) "
+            f"SELECT (SELECT coalesce(max(id), 0) FROM {table_name}) + 1 + row_index, row_index, $file_id, "
+            f"{column_list}, $now FROM {staged_table} WHERE {complete} ORDER BY row_index",
+            {"file_id": file_id, "now": now}
+        )
+
+    # Errors are numbered and stored clustered by row, as by models.validation_errors; the errors
+    # beyond the ERROR_OUTPUT limits are stored as error groups
+    with pipeline_metrics.stage("error_write", file_id=file_id, zone="BRONZE", errors=validation.errors):
+        error_config = get_error_output_config()
+        connection.execute(
+            f"CREATE OR REPLACE TEMP TABLE {bounded_table} AS {_bounded_errors_sql(errors_table, error_config)}"
+        )
+        connection.execute(
+            f"INSERT INTO validation_errors (error_id, file_id, row_index, zone, field_name, error_type, error_code, created_at) "
+            f"SELECT (SELECT coalesce(max(error_id), 0) FROM validation_errors) "
+            f"+ row_number() OVER (ORDER BY row_index, error_order), $file_id, row_index, 'BRONZE', field_name, "
+            f"error_type, error_code, $now FROM {bounded_table} WHERE logged ORDER BY row_index, error_order",
+            {"file_id": file_id, "now": now}
+        )
+        omitted = "list(row_index ORDER BY row_index, error_order) FILTER (WHERE NOT logged)"
+        connection.execute(
+            f"INSERT INTO validation_error_groups (group_id, file_id, zone, error_type, error_code, field_name, "
+            f"error_count, logged_count, sample_row_indices, omitted_row_indices, created_at) "
+            f"SELECT (SELECT coalesce(max(group_id), 0) FROM validation_error_groups) "
+            f"+ row_number() OVER (ORDER BY min(row_index), arg_min(error_order, row_index)), $file_id, 'BRONZE', "
+            f"error_type, error_code, field_name, count(*), count(*) FILTER (WHERE logged), "
+            f"array_to_string(list_slice({omitted}, 1, $sample_size), ', '), {omitted}, $now "
+            f"FROM {bounded_table} GROUP BY error_type, error_code, field_name HAVING bool_or(NOT logged)",
+            {"file_id": file_id, "sample_size": int(error_config["SAMPLE_SIZE"]), "now": now}
+        )
+        refresh_error_summary(session, file_id, "BRONZE")
+
+    # On failure the transaction is rolled back, which also discards the staging tables
+    for table in (raw_table, staged_table, f"bronze_rules_{file_id}", errors_table, bounded_table):
+        connection.execute(f"DROP TABLE IF EXISTS {table}")
+    logger.info(f"Validated {file_path} in the database: {validation.errors} validation errors.")
+
+
+def validate_field_sql(file_path, file_id, file_name, unit_of_work=None):
+    """
+    Validate a field file inside DuckDB and store its bronze rows and validation errors.
+
+    :param file_path: Path of the CSV file.
+    :param file_id: ID of the file being processed.
+    :param file_name: Name of the file, for logging.
+    :param unit_of_work: Optional UnitOfWork; when given, the job is deferred to its transaction.
+    """
+    table_name = PROJECT_CONFIG["SQL_TABLES"]["FIELD"]["BRONZE_TABLE"]
+    columns = fetch_bronze_columns(table_name)
+    rules = fetch_validation_rules(table_name, "BRONZE")
+    date_formats = get_sql_validation_config()["DATE_FORMATS"]
+    logger.info(f"Validating file '{file_name}' in the database with {len(rules)} rules.")
+    if unit_of_work is not None:
+        unit_of_work.add(stage_and_validate_field, file_path, file_id, table_name, columns, rules, date_formats)
+        return
+    db_writer.run(stage_and_validate_field, file_path, file_id, table_name, columns, rules, date_formats)
@@ -0,0 +1,244 @@
+"""
+Compiler of the validation rule catalog (the validation_rules table) into vectorized checks.
+
+A rule declares a kind, the columns it applies to and, for group rules, the column grouping the
+rows. Each kind compiles into NumPy/pandas predicates over whole columns, and all group rules on
+the same key share one factorization of that key, so a file is validated in one pass without a
+Python loop per group. The same rules also compile into DuckDB SELECT statements over a staged
+table (compile_rules_sql), used by bronze.field_sql_validator. The error code of a rule is its
+rule_code, described in error_messages.
+
+Rule kinds:
+- not_in_future:           row rule; the date columns are not after today.
+- consistent_within_group: group rule; every column has at most one distinct value per group.
+- all_or_none_null:        group rule; in every row the columns are either all null or all set.
+- first_equals_last:       group rule; the first and last rows with all columns set are equal
+                           (a closed polygon). Only those rows are reported.
+
+Nothing here touches the database, so rules can be compiled in validation worker processes.
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+class _GroupIndex:
+    """
+    Group codes of a key column, computed once and shared by the rules grouping on it.
+    Rows without a key belong to no group and are never reported by group rules.
+    """
+
+    def __init__(self, keys):
+        self.codes, uniques = pd.factorize(keys)
+        self.count = len(uniques)
+        self.has_key = self.codes >= 0
+
+    def broadcast(self, group_flags):
+        """Per-row flags of per-group flags."""
+        return self.has_key & group_flags[np.where(self.has_key, self.codes, 0)]
+
+    def any(self, row_flags):
+        """Per-group flags: whether any row of the group is flagged."""
+        return np.bincount(self.codes[self.has_key & row_flags], minlength=self.count) > 0
+
+    def nunique(self, values):
+        """Per-group number of distinct non-null values."""
+        value_codes, uniques = pd.factorize(values)
+        keep = self.has_key & (value_codes >= 0)
+        pairs = np.unique(self.codes[keep].astype(np.int64) * max(len(uniques), 1) + value_codes[keep])
+        return np.bincount(pairs // max(len(uniques), 1), minlength=self.count)
+
+    def first_last(self, row_flags):
+        """
+        Positions of the first and last flagged row of every group, and the number of flagged rows.
+        Groups without flagged rows have position -1 and count 0.
+        """
+        positions = np.flatnonzero(self.has_key & row_flags)
+        codes = self.codes[positions]
+        first, last = np.full(self.count, -1), np.full(self.count, -1)
+        counts = np.zeros(self.count, dtype=np.int64)
+        groups, first_index, group_counts = np.unique(codes, return_index=True, return_counts=True)
+        _, reversed_index = np.unique(codes[::-1], return_index=True)
+        first[groups] = positions[first_index]
+        last[groups] = positions[len(positions) - 1 - reversed_index]
+        counts[groups] = group_counts
+        return first, last, counts
+
+
+def _not_in_future(df, rule, groups):
+    today = pd.Timestamp(datetime.now().date())
+    failing = np.zeros(len(df), dtype=bool)
+    for column in rule["rule_columns"]:
+        failing |= (df[column] > today).to_numpy(dtype=bool)
+    return failing
+
+
+def _consistent_within_group(df, rule, groups):
+    inconsistent = np.zeros(groups.count, dtype=bool)
+    for column in rule["rule_columns"]:
+        inconsistent |= groups.nunique(df[column]) > 1
+    return groups.broadcast(inconsistent)
+
+
+def _all_or_none_null(df, rule, groups):
+    nulls = df[list(rule["rule_columns"])].isnull().to_numpy()
+    mixed = nulls.any(axis=1) & ~nulls.all(axis=1)
+    return groups.broadcast(groups.any(mixed))
+
+
+def _first_equals_last(df, rule, groups):
+    present = df[list(rule["rule_columns"])].notna().to_numpy().all(axis=1)
+    first, last, counts = groups.first_last(present)
+    closed_or_short = counts < 2
+    different = np.zeros(groups.count, dtype=bool)
+    for column in rule["rule_columns"]:
+        values = df[column].to_numpy()
+        different |= np.where(closed_or_short, False, values[first] != values[last])
+    return groups.broadcast(different & ~closed_or_short) & present
+
+
+# Rule kind -> (compiled predicate returning the failing rows, whether it groups rows)
+RULE_KINDS = {
+    "not_in_future": (_not_in_future, False),
+    "consistent_within_group": (_consistent_within_group, True),
+    "all_or_none_null": (_all_or_none_null, True),
+    "first_equals_last": (_first_equals_last, True),
+}
+
+
+class CompiledRules:
+    """
+    Rules of the catalog compiled into vectorized predicates, evaluated together over a frame.
+    """
+
+    def __init__(self, rules):
+        self.rules = []
+        self.skipped = []
+        for rule in rules:
+            if rule["rule_kind"] not in RULE_KINDS:
+                self.skipped.append(rule["rule_code"])
+                continue
+            predicate, grouped = RULE_KINDS[rule["rule_kind"]]
+            if grouped and not rule.get("group_by"):
+                self.skipped.append(rule["rule_code"])
+                continue
+            self.rules.append((rule, predicate, grouped))
+
+    def failures(self, df):
+        """
+        Evaluate every rule over the frame.
+
+        :return: Generator of (rule, index of the failing rows, field names to report) in rule order,
+                 the field name being the rule's error_field or, for group rules, the group key.
+        """
+        groups = {}
+        for rule, predicate, grouped in self.rules:
+            group_index = None
+            if grouped:
+                if rule["group_by"] not in groups:
+                    groups[rule["group_by"]] = _GroupIndex(df[rule["group_by"]])
+                group_index = groups[rule["group_by"]]
+            positions = np.flatnonzero(predicate(df, rule, group_index))
+            if not len(positions):
+                continue
+            index = df.index[positions].tolist()
+            if rule.get("error_field") or not grouped:
+                field_names = [rule.get("error_field")] * len(index)
+            else:
+                field_names = df[rule["group_by"]].iloc[positions].tolist()
+            yield rule, index, field_names
+
+
+def compile_rules(rules):
+    """
+    Compile catalog rules, as returned by models.validation_rules.fetch_validation_rules.
+
+    :param rules: List of rule dictionaries ordered by rule_order.
+    :return: CompiledRules; rules of unknown kinds are listed in its `skipped` attribute.
+    """
+    return CompiledRules(rules)
+
+
+def _quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sql_literal(value):
+    return "NULL" if value is None else "'" + str(value).replace("'", "''") + "'"
+
+
+def _not_in_future_sql(rule, table, field_name):
+    failing = " OR ".join(f"{_quote_identifier(column)} > $today" for column in rule["rule_columns"])
+    return f"SELECT row_index, {field_name} AS field_name FROM {table} WHERE {failing}"
+
+
+def _failing_groups_sql(rule, table, having, where=None):
+    key = _quote_identifier(rule["group_by"])
+    conditions = f"{key} IS NOT NULL" + (f" AND {where}" if where else "")
+    return f"SELECT {key} FROM {table} WHERE {conditions} GROUP BY {key} HAVING {having}"
+
+
+def _consistent_within_group_sql(rule, table, field_name):
+    having = " OR ".join(f"count(DISTINCT {_quote_identifier(column)}) > 1" for column in rule["rule_columns"])
+    key = _quote_identifier(rule["group_by"])
+    return (
+        f"SELECT row_index, {field_name} AS field_name FROM {table} "
+        f"WHERE {key} IN ({_failing_groups_sql(rule, table, having)})"
+    )
+
+
+def _all_or_none_null_sql(rule, table, field_name):
+    nulls = [f"({_quote_identifier(column)} IS NULL)" for column in rule["rule_columns"]]
+    mixed = " OR ".join(f"{left} <> {right}" for left, right in zip(nulls, nulls[1:])) or "false"
+    key = _quote_identifier(rule["group_by"])
+    return (
+        f"SELECT row_index, {field_name} AS field_name FROM {table} "
+        f"WHERE {key} IN ({_failing_groups_sql(rule, table, f'bool_or({mixed})')})"
+    )
+
+
+def _first_equals_last_sql(rule, table, field_name):
+    present = " AND ".join(f"{_quote_identifier(column)} IS NOT NULL" for column in rule["rule_columns"])
+    different = " OR ".join(
+        f"arg_min({_quote_identifier(column)}, row_index) <> arg_max({_quote_identifier(column)}, row_index)"
+        for column in rule["rule_columns"]
+    )
+    key = _quote_identifier(rule["group_by"])
+    failing_groups = _failing_groups_sql(rule, table, f"count(*) >= 2 AND ({different})", where=present)
+    return (
+        f"SELECT row_index, {field_name} AS field_name FROM {table} "
+        f"WHERE {present} AND {key} IN ({failing_groups})"
+    )
+
+
+# Rule kind -> SELECT of the failing rows' row_index and field_name over a staged table
+RULE_KINDS_SQL = {
+    "not_in_future": _not_in_future_sql,
+    "consistent_within_group": _consistent_within_group_sql,
+    "all_or_none_null": _all_or_none_null_sql,
+    "first_equals_last": _first_equals_last_sql,
+}
+
+
+def compile_rules_sql(rules, table):
+    """
+    Compile catalog rules into DuckDB SELECT statements over a staged table with a `row_index`
+    column and the typed data columns. Statements of not_in_future rules take a `$today` parameter.
+
+    :param rules: List of rule dictionaries ordered by rule_order.
+    :param table: Name of the staged table.
+    :return: Tuple of (list of (rule, SELECT statement) in rule order, list of skipped rule codes).
+    """
+    compiled, skipped = [], []
+    for rule in rules:
+        grouped = rule["rule_kind"] in RULE_KINDS and RULE_KINDS[rule["rule_kind"]][1]
+        if rule["rule_kind"] not in RULE_KINDS_SQL or (grouped and not rule.get("group_by")):
+            skipped.append(rule["rule_code"])
+            continue
+        if rule.get("error_field") or not grouped:
+            field_name = _sql_literal(rule.get("error_field"))
+        else:
+            field_name = _quote_identifier(rule["group_by"])
+        compiled.append((rule, RULE_KINDS_SQL[rule["rule_kind"]](rule, table, field_name)))
+    return compiled, skipped
@@ -1,13 +1,217 @@
+import atexit
+import copy
+import json
 import logging
 import os
+import queue
+import threading
+import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from colorama import Fore, Style, init
 
+from config.project_config import PROJECT_CONFIG
+
 # Initialize colorama for Windows compatibility
 init(autoreset=True)
 
 create_file: bool = True
 
+# LOGGING settings, overridden by PROJECT_CONFIG["LOGGING"]:
+# - QUEUE:                 hand records to a background listener thread, so log I/O never blocks the caller.
+# - FORMAT:                "TEXT" (colored console, plain file) or "JSON" (one JSON object per line).
+# - LEVEL:                 default level.
+# - MODULE_LEVELS:         level per module file name without extension, e.g. {"osdu_client": "WARNING"}.
+# - SAMPLING_WINDOW_SECONDS / SAMPLED_MESSAGES_PER_WINDOW: messages logged with a `sample_key`
+#   are limited to this many per key and window; the number suppressed is logged when the window closes.
+DEFAULT_LOGGING_CONFIG = {
+    "QUEUE": True,
+    "FORMAT": "TEXT",
+    "LEVEL": "INFO",
+    "MODULE_LEVELS": {},
+    "SAMPLING_WINDOW_SECONDS": 60,
+    "SAMPLED_MESSAGES_PER_WINDOW": 5,
+}
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s"
+
+# LogRecord attributes that are not passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class ColoredFormatter(logging.Formatter):
+    """
+    Console formatter coloring the level and message; the record itself is left untouched.
+    """
+    LEVEL_COLORS = {
+        "DEBUG": Fore.BLUE,
+        "INFO": Fore.GREEN,
+        "WARNING": Fore.YELLOW,
+        "ERROR": Fore.RED,
+        "CRITICAL": Fore.MAGENTA,
+    }
+
+    def format(self, record):
+        level_color = self.LEVEL_COLORS.get(record.levelname, "")
+        record = logging.makeLogRecord(vars(record))
+        record.levelname = f"{level_color}{record.levelname}{Style.RESET_ALL}"
+        record.msg = f"{level_color}{record.getMessage()}{Style.RESET_ALL}"
+        record.args = None
+        return super().format(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line, including any `extra` fields.
+    """
+
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "module": record.module,
+            "file": record.filename,
+            "line": record.lineno,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class ModuleLevelFilter(logging.Filter):
+    """
+    Applies the level configured for the module a record comes from, or the default level.
+    """
+
+    def __init__(self, default_level, module_levels):
+        super().__init__()
+        self.default_level = default_level
+        self.module_levels = module_levels
+
+    def filter(self, record):
+        return record.levelno >= self.module_levels.get(record.module, self.default_level)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Limits records logged with a `sample_key` extra to `limit` per key and window.
+
+    When a window in which records were suppressed closes, one record reports how many records
+    of that key were suppressed, at the level and location of the last of them. It is passed to
+    `emit` from a timer thread; `flush` reports the windows still open, e.g. at shutdown.
+    """
+
+    def __init__(self, window_seconds, limit, emit=None):
+        super().__init__()
+        self.window_seconds = window_seconds
+        self.limit = limit
+        self.emit = emit
+        self._windows = {}  # sample_key -> [window start, records passed, records suppressed, last suppressed record]
+        self._timers = {}  # sample_key -> timer reporting the suppressed records when the window closes
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, "sample_key", None)
+        if key is None:
+            return True
+
+        now = time.monotonic()
+        closed = None
+        with self._lock:
+            window = self._windows.setdefault(key, [now, 0, 0, None])
+            if now - window[0] >= self.window_seconds:
+                closed = self._close_window(key)
+                window[:] = [now, 0, 0, None]
+            if window[1] < self.limit:
+                window[1] += 1
+                passed = True
+            else:
+                window[2] += 1
+                window[3] = record
+                passed = False
+                if key not in self._timers:
+                    timer = threading.Timer(window[0] + self.window_seconds - now, self._report, (key,))
+                    timer.name = f"log-sampling-{key}"
+                    timer.daemon = True
+                    self._timers[key] = timer
+                    timer.start()
+        if closed:
+            self._emit_summary(key, *closed)  # Reported before the record opening the next window
+        return passed
+
+    def flush(self):
+        """
+        Reports the records suppressed in the windows that are still open.
+        """
+        with self._lock:
+            closed = {key: self._close_window(key) for key in list(self._windows)}
+        for key, counts in closed.items():
+            if counts:
+                self._emit_summary(key, *counts)
+
+    def _report(self, key):
+        with self._lock:
+            window = self._windows.get(key)
+            closed = self._close_window(key) if window else None
+        if closed:
+            self._emit_summary(key, *closed)
+
+    def _close_window(self, key):
+        """
+        Takes the suppressed count and last suppressed record of a key's window; requires the lock.
+        """
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+        window = self._windows[key]
+        if not window[2]:
+            return None
+        counts = (window[2], window[3])
+        window[2], window[3] = 0, None
+        return counts
+
+    def _emit_summary(self, key, suppressed, last_record):
+        if self.emit is None:
+            return
+        record = logging.LogRecord(
+            last_record.name, last_record.levelno, last_record.pathname, last_record.lineno,
+            f"{suppressed} similar '{key}' messages suppressed (at most {self.limit} per {self.window_seconds} seconds).",
+            None, None, last_record.funcName
+        )
+        record.suppressed = suppressed
+        record.suppressed_key = key
+        self.emit(record)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Enqueues records without formatting them, so the listener thread formats and writes them.
+
+    QueueHandler.prepare formats every record on the calling thread and drops its exc_info. Here
+    only the message is merged with its arguments, which the caller may change after the call;
+    the exception stays on the record and is rendered by the listener's formatters.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def get_logging_config():
+    """
+    Returns the logging settings: the defaults updated with PROJECT_CONFIG["LOGGING"].
+    """
+    config = dict(DEFAULT_LOGGING_CONFIG)
+    config.update(PROJECT_CONFIG.get("LOGGING", {}))
+    return config
+
 
 def configure_logger(base_log_file_name: str):
     """
@@ -19,8 +223,14 @@ def configure_logger(base_log_file_name: str):
     Returns:
     - logging.Logger: Configured logger instance.
     """
+    config = get_logging_config()
+    default_level = logging.getLevelName(config["LEVEL"].upper())
+    module_levels = {module: logging.getLevelName(level.upper()) for module, level in config["MODULE_LEVELS"].items()}
+    json_format = config["FORMAT"].upper() == "JSON"
+
     logger = logging.getLogger(__name__)
-    logger.setLevel(logging.INFO)
+    # The logger passes the most verbose configured level; ModuleLevelFilter applies the rest
+    logger.setLevel(min([default_level] + list(module_levels.values())))
 
     # Generate a timestamped log file name
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -28,6 +238,7 @@ def configure_logger(base_log_file_name: str):
 
     # Prevent adding multiple handlers if the logger is reused
     if not logger.handlers:
+        handlers = []
         log_dir = os.path.dirname(log_file_name)
 
         if create_file and log_dir:  # Check if log_dir is not empty
@@ -36,44 +247,44 @@ def configure_logger(base_log_file_name: str):
         # File handler (only if create_file is True)
         if create_file:
             file_handler = logging.FileHandler(log_file_name)
-            file_handler.setLevel(logging.INFO)
-
-            # Updated formatter with line number
-            file_formatter = logging.Formatter(
-                "%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s"
-            )
-            file_handler.setFormatter(file_formatter)
-            logger.addHandler(file_handler)
+            file_handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(LOG_FORMAT))
+            handlers.append(file_handler)
 
         # Stream handler with color-coded log levels and messages
-        class ColoredFormatter(logging.Formatter):
-            LEVEL_COLORS = {
-                "DEBUG": Fore.BLUE,
-                "INFO": Fore.GREEN,
-                "WARNING": Fore.YELLOW,
-                "ERROR": Fore.RED,
-                "CRITICAL": Fore.MAGENTA,
-            }
-
-            def format(self, record):
-                level_color = self.LEVEL_COLORS.get(record.levelname, "")
-                record.levelname = f"{level_color}{record.levelname}{Style.RESET_ALL}"
-                record.msg = f"{level_color}{record.msg}{Style.RESET_ALL}"
-                return super().format(record)
-
         stream_handler = logging.StreamHandler()
-        stream_handler.setLevel(logging.INFO)
+        stream_handler.setFormatter(JsonFormatter() if json_format else ColoredFormatter(LOG_FORMAT))
+        handlers.append(stream_handler)
 
-        # Updated formatter with line number for console logs
-        stream_formatter = ColoredFormatter(
-            "%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s"
+        logger.addFilter(ModuleLevelFilter(default_level, module_levels))
+        sampling_filter = SamplingFilter(
+            config["SAMPLING_WINDOW_SECONDS"], config["SAMPLED_MESSAGES_PER_WINDOW"], emit=logger.handle
         )
-        stream_handler.setFormatter(stream_formatter)
-        logger.addHandler(stream_handler)
+        logger.addFilter(sampling_filter)
+
+        if config["QUEUE"]:
+            # Callers only enqueue records; a listener thread formats and writes them
+            log_queue = queue.SimpleQueue()
+            logger.addHandler(DeferredQueueHandler(log_queue))
+            listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            listener.start()
+            logger.listener = listener
+        else:
+            for handler in handlers:
+                logger.addHandler(handler)
+
+        def stop_logging():
+            """Reports the suppressed records still pending, then writes the queued records."""
+            sampling_filter.flush()
+            if config["QUEUE"]:
+                listener.stop()
+
+        atexit.register(stop_logging)
 
     # Add a new function to the logger object to create a separator
     def separator():
         """Logs a white separator line for readability."""
+        if json_format:
+            return  # Structured logs have no use for visual separators
         logger.info(
             f"{Fore.WHITE}--------------------------------------------------------------------------------{Style.RESET_ALL}")
 
@@ -2,6 +2,68 @@
 
 PROJECT_CONFIG = {
   "IGNORE_BRONZE_WARNING": True,
+  "OUTPUT_DIRECTORY": "output",
+  "EXPORT_FORMAT": "CSV",
+  "EXPORT_ASYNC": True,
+  "EXPORT_QUEUE_SIZE": 16,
+  "EXPORT_MAX_RETRIES": 3,
+  "EXPORT_RETRY_DELAY_SECONDS": 5,
+  "DB_WRITER_MAX_BATCH_SIZE": 64,
+  "COMPACT_DTYPES": True,
+  "FLOAT32_COORDINATES": False,
+  "PARALLEL_VALIDATION": {
+    "ENABLED": False,
+    "WORKERS": 0,
+    "MIN_ROWS": 100000,
+    "START_METHOD": "spawn"
+  },
+  "SQL_VALIDATION": {
+    "ENABLED": False,
+    "MIN_FILE_BYTES": 52428800,
+    "DATE_FORMATS": ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y %H:%M:%S"]
+  },
+  "ERROR_OUTPUT": {
+    "ENABLED": True,
+    "ZONES": ["BRONZE"],
+    "MAX_ERRORS_PER_GROUP": 1000,
+    "MAX_ERRORS_PER_RULE": 100000,
+    "SAMPLE_SIZE": 10
+  },
+  "LOGGING": {
+    "QUEUE": True,
+    "FORMAT": "TEXT",
+    "LEVEL": "INFO",
+    "MODULE_LEVELS": {},
+    "SAMPLING_WINDOW_SECONDS": 60,
+    "SAMPLED_MESSAGES_PER_WINDOW": 5
+  },
+  "METRICS_ENABLED": True,
+  "METRICS_PORT": 5000,
+  "PROFILING": {
+    "ENABLED": False,
+    "FILE_PATTERN": "*",
+    "CONTROL_FILE": "output/profiles/profiling_control.json",
+    "PROFILER": "cprofile",
+    "MEMORY": True,
+    "TOP_FUNCTIONS": 25,
+    "TOP_ALLOCATIONS": 10,
+    "OUTPUT_DIRECTORY": "output/profiles"
+  },
+  "FILE_LEASE_SECONDS": 900,
+  "SCHEDULER": {
+    "FINISH_STARTED_FIRST": True,
+    "SHORTEST_JOB_FIRST": True,
+    "AGING_SECONDS": 300,
+    "DATATYPE_PRIORITIES": {},
+    "DATATYPE_QUOTAS": {}
+  },
+  "RESULT_REUSE_MODE": "OFF",
+  "CHECKSUM_ALGORITHM": "sha256",
+  "CHECKSUM_CHUNK_SIZE": 1048576,
+  "CHECKSUM_ON_READ": False,
+  "FILE_PROCESSORS": {
+    "FIELD": "file_processor.field_file_processor:FieldFileProcessor"
+  },
   "SQL_TABLES": {
     "FIELD": {
       "BRONZE_TABLE": "field_bronze_data",
@@ -1,19 +1,47 @@
-from bronze.field_data_validator import validate_field
+import os
+
+from bronze.field_data_validator import validate_field, export_bronze_results
+from bronze.field_sql_validator import get_sql_validation_config, validate_field_sql
+from config.project_config import PROJECT_CONFIG
 from file_processor.file_processor import FileProcessor
-from silver.field_data_silver_processing import process_field_data_for_silver_zone
+from silver.field_data_silver_processing import process_field_data_for_silver_zone, export_silver_results
 
 
 class FieldFileProcessor(FileProcessor):
+    BRONZE_TABLE = PROJECT_CONFIG["SQL_TABLES"]["FIELD"]["BRONZE_TABLE"]
+    SILVER_TABLE = PROJECT_CONFIG["SQL_TABLES"]["FIELD"]["SILVER_TABLE"]
+    # Repeated on every vertex of a field; DiscoveryDate is parsed to datetimes during validation
+    CATEGORICAL_COLUMNS = ("FieldName", "FieldType", "DiscoveryDate", "CRS", "Source", "ParentFieldName")
+    # Stored as REAL in the bronze table, so float32 keeps the stored precision
+    COORDINATE_COLUMNS = ("X", "Y")
 
-    def validate(self, dataframe, result):
+    def validate(self, dataframe, result, unit_of_work=None):
         print("Validating field file...")
         # Add field-specific validation logic
         # Perform field validation
-        validate_field(dataframe, result.id, result.filename)
+        validate_field(dataframe, result.id, result.filename, unit_of_work)
+
+    def validates_in_database(self, filepath):
+        # Large files are staged into DuckDB and validated there when SQL_VALIDATION is enabled
+        config = get_sql_validation_config()
+        try:
+            return config["ENABLED"] and os.path.getsize(filepath) >= config["MIN_FILE_BYTES"]
+        except OSError:
+            return False
 
-    def process(self):
+    def validate_in_database(self, result, unit_of_work=None):
+        validate_field_sql(result.filepath, result.id, result.filename, unit_of_work)
+
+    def process(self, unit_of_work=None):
         print("Processing field file...")
         # Add field-specific processing logic
-        process_field_data_for_silver_zone(self.fileId, self.fileName, self.column_list)
-
+        process_field_data_for_silver_zone(self.fileId, self.fileName, self.column_list, unit_of_work)
 
+    def export(self, zone):
+        # Result reports are written by the background export queue
+        if zone == "BRONZE":
+            export_bronze_results(self.fileId, self.fileName)
+        elif zone == "SILVER":
+            export_silver_results(self.fileId, self.fileName)
+        else:
+            super().export(zone)
@@ -1,3 +1,4 @@
+import csv
 from abc import ABC, abstractmethod
 from config.logger_config import logger
 from config.project_config import PROJECT_CONFIG
@@ -7,18 +8,70 @@ from utils.db_util import get_columns_from_store
 class FileProcessor(ABC):
     """
     Abstract base class for file processors.
+
+    Derived classes declare the tables they write with BRONZE_TABLE and SILVER_TABLE; when these
+    are not set, the tables configured in PROJECT_CONFIG["SQL_TABLES"] for the file type are used.
+
+    CATEGORICAL_COLUMNS are read as pandas categoricals and COORDINATE_COLUMNS are downcast to
+    float32 (with FLOAT32_COORDINATES) to keep the bronze frame small, see COMPACT_DTYPES.
     """
+    BRONZE_TABLE = None
+    SILVER_TABLE = None
+    CATEGORICAL_COLUMNS = ()
+    COORDINATE_COLUMNS = ()
+
     def __init__(self, fileId, fileName, file_type):
         self.fileId = fileId
         self.fileName = fileName
 
         self.logger = logger  # Fixed typo
-        self.bronze_table_name = PROJECT_CONFIG["SQL_TABLES"][file_type]["BRONZE_TABLE"]
+        tables = self.get_tables(file_type)
+        self.bronze_table_name = tables["BRONZE_TABLE"]
+        self.silver_table_name = tables["SILVER_TABLE"]
 
         # Fetch column list for the specified bronze table
         self.column_list = get_columns_from_store(self.bronze_table_name)
         self.logger.info(f"Fetched column list for '{self.bronze_table_name}': {self.column_list}")
 
+    @classmethod
+    def get_tables(cls, file_type):
+        """
+        Returns the bronze and silver tables of the processor.
+
+        :param file_type: File type the processor is registered for.
+        :return: Dictionary with the "BRONZE_TABLE" and "SILVER_TABLE" names.
+        """
+        configured_tables = PROJECT_CONFIG.get("SQL_TABLES", {}).get(file_type, {})
+        return {
+            "BRONZE_TABLE": cls.BRONZE_TABLE or configured_tables.get("BRONZE_TABLE"),
+            "SILVER_TABLE": cls.SILVER_TABLE or configured_tables.get("SILVER_TABLE"),
+        }
+
+    def csv_read_options(self):
+        """
+        Keyword arguments for pd.read_csv: low-cardinality text columns are read as categoricals,
+        storing each distinct value once instead of one Python string per row.
+
+        :return: Dictionary of read_csv keyword arguments.
+        """
+        if not PROJECT_CONFIG.get("COMPACT_DTYPES", True) or not self.CATEGORICAL_COLUMNS:
+            return {}
+        return {"dtype": {column: "category" for column in self.CATEGORICAL_COLUMNS}}
+
+    def compact_dataframe(self, dataframe):
+        """
+        Downcast the numeric coordinate columns to float32 when FLOAT32_COORDINATES is enabled.
+        Columns that were not parsed as numbers are left for validation to report.
+
+        :param dataframe: DataFrame read from the file.
+        :return: The DataFrame, converted in place.
+        """
+        if PROJECT_CONFIG.get("COMPACT_DTYPES", True) and PROJECT_CONFIG.get("FLOAT32_COORDINATES", False):
+            for column in self.COORDINATE_COLUMNS:
+                if column in dataframe.columns and dataframe[column].dtype == "float64":
+                    dataframe[column] = dataframe[column].astype("float32")
+        return dataframe
+
     def validate_columns(self, dataframe):
         """
         Validate that the required columns exist in the DataFrame.
@@ -33,11 +86,45 @@ class FileProcessor(ABC):
             self.logger.info("All required columns are present in the DataFrame.")
         return missing_columns
 
+    def validate_header(self, filepath):
+        """
+        Validate that the required columns exist in the header of a CSV file, for files that are
+        not read into a DataFrame.
+
+        :param filepath: Path of the CSV file.
+        :return: List of missing columns.
+        """
+        with open(filepath, "r", newline="", encoding="utf-8") as file:
+            header = next(csv.reader(file), [])
+        missing_columns = [col for col in self.column_list if col not in header]
+        if missing_columns:
+            self.logger.warning(f"Missing columns in file header: {missing_columns}")
+        else:
+            self.logger.info("All required columns are present in the file header.")
+        return missing_columns
+
+    def validates_in_database(self, filepath):
+        """
+        Whether the bronze step of the file runs inside the database (validate_in_database)
+        instead of on a DataFrame (validate). Derived classes supporting it override this.
+
+        :param filepath: Path of the file.
+        """
+        return False
+
+    def validate_in_database(self, result, unit_of_work=None):
+        """
+        Validate the file inside the database without reading it into pandas; used when
+        validates_in_database returns True.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not validate files in the database.")
+
     @abstractmethod
     def validate(self):
         """
         Abstract method to perform file-specific validation logic.
-        Must be implemented in derived classes.
+        Must be implemented in derived classes. Writes should be added to the unit of work
+        passed by the caller so they commit together with the step's status update.
         """
         pass
 
@@ -45,6 +132,14 @@ class FileProcessor(ABC):
     def process(self):
         """
         Abstract method to process the file data.
-        Must be implemented in derived classes.
+        Must be implemented in derived classes. Writes should be added to the unit of work
+        passed by the caller so they commit together with the step's status update.
         """
         pass
+
+    def export(self, zone):
+        """
+        Queue the export of the file's results for the given zone ('BRONZE' or 'SILVER').
+        Derived classes override this to produce their result reports.
+        """
+        self.logger.info(f"No result export defined for zone '{zone}' of file '{self.fileName}'.")
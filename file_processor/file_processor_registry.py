@@ -1,20 +1,100 @@
-from file_processor.field_file_processor import FieldFileProcessor
+import importlib
+from importlib import metadata
+
+from config.logger_config import logger
+from config.project_config import PROJECT_CONFIG
 
 
 class FileProcessorRegistry:
+    """
+    Maps file datatypes to FileProcessor classes.
+
+    Processors are registered either as classes or as "module:ClassName" import paths, which are
+    only imported the first time a file of that datatype is processed. Built-in processors come
+    from PROJECT_CONFIG["FILE_PROCESSORS"]; other packages can add datatypes through the
+    "mivaa.file_processors" entry point group, where the entry point name is the datatype.
+    """
+    ENTRY_POINT_GROUP = "mivaa.file_processors"
+
     _registry = {}
+    _entry_points_loaded = False
 
     @classmethod
     def register(cls, file_type, processor_class):
+        """
+        Register a processor class, or its "module:ClassName" import path, for a datatype.
+        """
         cls._registry[file_type] = processor_class
 
     @classmethod
-    def get_processor(cls, fileId, fileName, file_type):
+    def registered_types(cls):
+        """
+        Returns the datatypes that have a processor, without importing any of them.
+        """
+        cls._load_entry_points()
+        return sorted(cls._registry)
+
+    @classmethod
+    def get_processor_class(cls, file_type):
+        """
+        Resolve the processor class of a datatype, importing it on first use.
+        """
         processor_class = cls._registry.get(file_type)
-        if not processor_class:
+        if processor_class is None and not cls._entry_points_loaded:
+            cls._load_entry_points()
+            processor_class = cls._registry.get(file_type)
+        if processor_class is None:
             raise ValueError(f"Unknown file type: {file_type}")
+
+        if isinstance(processor_class, str):
+            processor_class = _import_object(processor_class)
+            cls._registry[file_type] = processor_class
+            logger.info(f"Loaded file processor '{processor_class.__name__}' for file type '{file_type}'.")
+        return processor_class
+
+    @classmethod
+    def get_processor(cls, fileId, fileName, file_type):
+        processor_class = cls.get_processor_class(file_type)
         return processor_class(fileId, fileName, file_type)
 
+    @classmethod
+    def get_tables(cls, file_type):
+        """
+        Returns the bronze and silver tables declared by the processor of a datatype.
+
+        :return: Dictionary with the "BRONZE_TABLE" and "SILVER_TABLE" names.
+        """
+        return cls.get_processor_class(file_type).get_tables(file_type)
+
+    @classmethod
+    def _load_entry_points(cls):
+        if cls._entry_points_loaded:
+            return
+        cls._entry_points_loaded = True
+
+        try:
+            entry_points = metadata.entry_points()
+            if hasattr(entry_points, "select"):
+                entry_points = entry_points.select(group=cls.ENTRY_POINT_GROUP)
+            else:  # Python < 3.10
+                entry_points = entry_points.get(cls.ENTRY_POINT_GROUP, [])
+        except Exception as e:
+            logger.error(f"Error reading '{cls.ENTRY_POINT_GROUP}' entry points: {e}")
+            return
+
+        for entry_point in entry_points:
+            # Configured processors take precedence over installed plugins
+            if entry_point.name not in cls._registry:
+                cls._registry[entry_point.name] = entry_point.value
+                logger.info(f"Registered file processor plugin '{entry_point.value}' for file type '{entry_point.name}'.")
+
+
+def _import_object(path):
+    module_name, _, attribute = path.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attribute) if attribute else module
+
 
-# Register processors
-FileProcessorRegistry.register("FIELD", FieldFileProcessor)
+# Register processors; they are imported when a file of their type is first processed
+for _file_type, _processor_path in PROJECT_CONFIG.get("FILE_PROCESSORS", {}).items():
+    FileProcessorRegistry.register(_file_type, _processor_path)
@@ -1,12 +1,7 @@
-from config.logger_config import logger
-from utils.generate_sqlalchemy_model import generate_model_for_table
+from utils.generate_sqlalchemy_model import get_model
 
-ErrorMessagesModel = None
-# Generate the SQLAlchemy model class dynamically for the 'validation_errors' table
-try:
-    if ErrorMessagesModel is None:
-        ErrorMessagesModel = generate_model_for_table('error_messages')
-        logger.info(f"Generated model class for table: {ErrorMessagesModel.__tablename__}")
-except Exception as e:
-    logger.error(f"Error generating model class for table 'error_messages': {e}")
-    # Ensure ValidationErrorsModel is defined as None if generation fails
\ No newline at end of file
+def __getattr__(name):
+    # ErrorMessagesModel is generated from the cached schema catalog on first access
+    if name == "ErrorMessagesModel":
+        return get_model('error_messages')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
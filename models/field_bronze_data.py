@@ -1,141 +1,208 @@
 import logging
 
-from sqlalchemy import func, case
-from sqlalchemy.orm import aliased
+from sqlalchemy import func
 
 from config.logger_config import logger
 from config.project_config import PROJECT_CONFIG
-from models.error_messages import ErrorMessagesModel
-from models.validation_errors import ValidationErrorsModel
-from utils.db_util import get_session
+from utils.db_util import get_read_session, fetch_arrow_dataframe
+from utils.db_writer import db_writer
 from datetime import datetime
 import pandas as pd
-from utils.generate_sqlalchemy_model import generate_model_for_table
+from utils.generate_sqlalchemy_model import get_model
+from utils.pipeline_metrics import pipeline_metrics
 
-FieldBronzeTableModel = None
-# Generate the SQLAlchemy model class dynamically for the 'field_bronze_table' table
-try:
-    if FieldBronzeTableModel is None:
-        FieldBronzeTableModel = generate_model_for_table(PROJECT_CONFIG["SQL_TABLES"]["FIELD"]["BRONZE_TABLE"])
-        logger.info(f"Generated model class for table: {FieldBronzeTableModel.__tablename__}")
-except Exception as e:
-    logger.error(f"Error generating model class for table 'field_bronze_table': {e}")
-    # Ensure FieldBronzeTableModel is defined as None if generation fails
+FIELD_BRONZE_TABLE = PROJECT_CONFIG["SQL_TABLES"]["FIELD"]["BRONZE_TABLE"]
+
+def __getattr__(name):
+    # FieldBronzeTableModel is generated from the cached schema catalog on first access
+    if name == "FieldBronzeTableModel":
+        return get_model(FIELD_BRONZE_TABLE)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def log_field_bronze_table(df: pd.DataFrame, file_id: int):
+def log_field_bronze_table(df: pd.DataFrame, file_id: int, unit_of_work=None):
     """
     Logs validation status for each row in the database into the 'field_bronze_table'.
+    The rows are written by the database writer thread.
 
     Parameters:
     - df (pd.DataFrame): DataFrame containing the data to log.
     - file_id (int): ID of the file being processed.
-    - error_index_set (set): Set of indices that failed validation.
+    - unit_of_work (UnitOfWork, optional): When given, the write is deferred to the unit of work's transaction.
     """
+    FieldBronzeTableModel = get_model(FIELD_BRONZE_TABLE)
     if FieldBronzeTableModel is None:
         logger.error("FieldBronzeTableModel is not defined. Cannot log data.")
         return
 
-    with get_session() as session:
+    try:
+        if unit_of_work is not None:
+            unit_of_work.add(insert_field_bronze_rows, df, file_id)
+            logger.info("Validation results queued in the unit of work.")
+            return
+        db_writer.run(insert_field_bronze_rows, df, file_id)
+        logger.info("Validation results logged successfully.")
+    except Exception as e:
+        logger.error(f"Error logging validation results: {e}")
+
+def insert_field_bronze_rows(session, df: pd.DataFrame, file_id: int):
+    """
+    Inserts the rows of a file into the 'field_bronze_table' without committing.
+
+    Parameters:
+    - session: SQLAlchemy session owned by the caller.
+    - df (pd.DataFrame): DataFrame containing the data to log.
+    - file_id (int): ID of the file being processed.
+    """
+    FieldBronzeTableModel = get_model(FIELD_BRONZE_TABLE)
+    # Determine the starting ID for the new rows
+    max_id = session.query(FieldBronzeTableModel.id).order_by(FieldBronzeTableModel.id.desc()).first()
+    max_id = max_id[0] if max_id else 0
+
+    # Keep rows in file order so ids and row_index of one file are stored contiguously
+    df = df.sort_index()
+
+    # Add required columns to the DataFrame
+    df["id"] = range(max_id + 1, max_id + 1 + len(df))
+    df["row_index"] = df.index
+    df["file_id"] = file_id
+    df["validation_timestamp"] = datetime.now()
+
+    # DuckDB scans the frame in its own dtypes (categoricals, float32, NaN/NaT as NULL) in the
+    # writer's transaction, so no per-row Python objects are created
+    columns = [column.name for column in FieldBronzeTableModel.__table__.columns if column.name in df.columns]
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    duckdb_connection = session.connection().connection.driver_connection
+    with pipeline_metrics.stage("bronze_write", file_id=file_id, zone="BRONZE", rows=len(df)):
+        duckdb_connection.register("bronze_rows", df[columns])
         try:
-            # Determine the starting ID for the new rows
-            max_id = session.query(FieldBronzeTableModel.id).order_by(FieldBronzeTableModel.id.desc()).first()
-            max_id = max_id[0] if max_id else 0
-
-            # Add required columns to the DataFrame
-            df["id"] = range(max_id + 1, max_id + 1 + len(df))
-            df["row_index"] = df.index
-            df["file_id"] = file_id
-            df["validation_timestamp"] = datetime.now()
-
-            # Convert NaN values to None explicitly
-            df = df.astype(object).where(pd.notna(df), None)
-
-            # Convert the DataFrame to a list of dictionaries
-            data_to_insert = df.to_dict(orient="records")
-
-            # Use bulk_insert_mappings for efficient insertion
-            session.bulk_insert_mappings(FieldBronzeTableModel, data_to_insert)
-            session.commit()
-            logger.info("Validation results logged successfully.")
-        except Exception as e:
-            logger.error(f"Error logging validation results: {e}")
-            session.rollback()
+            duckdb_connection.execute(
+                f"INSERT INTO {FIELD_BRONZE_TABLE} ({column_list}) SELECT {column_list} FROM bronze_rows"
+            )
+        finally:
+            duckdb_connection.unregister("bronze_rows")
 
-def fetch_bronze_results_by_file_id(file_id):
+def build_bronze_results_query(session, file_id, excluded_severities=None):
+    """
+    Builds the SQLAlchemy query returning the bronze results of a file with their error summary.
+
+    Parameters:
+    - session: SQLAlchemy session to bind the query to.
+    - file_id (int): ID of the file to fetch data for.
+    - excluded_severities (list, optional): Error severities ('ERROR', 'WARNING') whose rows are filtered out in the query.
+
+    Returns:
+    - sqlalchemy.orm.Query: The un-executed results query.
+    """
+    FieldBronzeTableModel = get_model(FIELD_BRONZE_TABLE)
+    Summary = get_model('validation_error_summary')
+    query = (
+        session.query(
+            FieldBronzeTableModel.id,
+            FieldBronzeTableModel.row_index,
+            FieldBronzeTableModel.file_id,
+            FieldBronzeTableModel.FieldName,
+            FieldBronzeTableModel.FieldType,
+            FieldBronzeTableModel.DiscoveryDate,
+            FieldBronzeTableModel.X,
+            FieldBronzeTableModel.Y,
+            FieldBronzeTableModel.CRS,
+            FieldBronzeTableModel.Source,
+            FieldBronzeTableModel.ParentFieldName,
+            FieldBronzeTableModel.validation_timestamp,
+            Summary.error_message,
+            func.coalesce(Summary.error_severity, '').label("error_severity")
+        )
+        .outerjoin(
+            Summary,
+            (Summary.zone == "BRONZE") &
+            (Summary.file_id == FieldBronzeTableModel.file_id) &
+            (Summary.row_index == FieldBronzeTableModel.row_index)
+        )
+        .filter(FieldBronzeTableModel.file_id == file_id)
+        .order_by(FieldBronzeTableModel.id)
+    )
+
+    if excluded_severities:
+        query = query.filter(func.coalesce(Summary.error_severity, '').notin_(excluded_severities))
+    return query
+
+
+def fetch_bronze_results_by_file_id(file_id, excluded_severities=None):
     """
     Fetches records from the 'field_bronze_table' table for a specific file ID and groups them by 'FieldName'.
 
     Parameters:
     - file_id (int): ID of the file to fetch data for.
+    - excluded_severities (list, optional): Error severities ('ERROR', 'WARNING') whose rows are filtered out in the query.
 
     Returns:
     - pd.DataFrame: A DataFrame containing the grouped records, or an empty DataFrame if no records are found.
     """
+    FieldBronzeTableModel = get_model(FIELD_BRONZE_TABLE)
     if FieldBronzeTableModel is None:
         logger.error("FieldBronzeTableModel is not defined. Cannot fetch data.")
         return pd.DataFrame()
 
-    with get_session() as session:
+    with get_read_session() as session:
         try:
             # Query the table for the specified file_id
-            # Build SQLAlchemy query to fetch results
-            ValidationErrorsAlias = aliased(ValidationErrorsModel)
-            ErrorMessagesAlias = aliased(ErrorMessagesModel)
-            query = (
-                session.query(
-                    FieldBronzeTableModel.id,
-                    FieldBronzeTableModel.row_index,
-                    FieldBronzeTableModel.file_id,
-                    FieldBronzeTableModel.FieldName,
-                    FieldBronzeTableModel.FieldType,
-                    FieldBronzeTableModel.DiscoveryDate,
-                    FieldBronzeTableModel.X,
-                    FieldBronzeTableModel.Y,
-                    FieldBronzeTableModel.CRS,
-                    FieldBronzeTableModel.Source,
-                    FieldBronzeTableModel.ParentFieldName,
-                    FieldBronzeTableModel.validation_timestamp,
-                    func.group_concat(ErrorMessagesAlias.error_message, ', ').label("error_message"),
-                    # Determine error_severity: show "ERROR" if any error exists, otherwise "WARNING"
-                    case(
-                        (func.sum(case((ErrorMessagesAlias.error_severity == 'ERROR', 1), else_=0)) > 0, 'ERROR'),
-                        (func.sum(case((ErrorMessagesAlias.error_severity == 'WARNING', 1), else_=0)) > 0, 'WARNING'),
-                        else_=''  # Return empty string when there are no warnings or errors
-                    ).label("error_severity")
-                )
-                .outerjoin(
-                    ValidationErrorsAlias,
-                    (ValidationErrorsAlias.zone == "BRONZE") &
-                    (FieldBronzeTableModel.row_index == ValidationErrorsAlias.row_index) &
-                    (FieldBronzeTableModel.file_id == ValidationErrorsAlias.file_id)
-
-                )
-                .outerjoin(
-                    ErrorMessagesAlias,
-                    ValidationErrorsAlias.error_code == ErrorMessagesAlias.error_code
-                )
-                .filter(FieldBronzeTableModel.file_id == file_id)
-                .group_by(
-                    FieldBronzeTableModel.id,
-                    FieldBronzeTableModel.row_index,
-                    FieldBronzeTableModel.file_id,
-                    FieldBronzeTableModel.FieldName,
-                    FieldBronzeTableModel.FieldType,
-                    FieldBronzeTableModel.DiscoveryDate,
-                    FieldBronzeTableModel.X,
-                    FieldBronzeTableModel.Y,
-                    FieldBronzeTableModel.CRS,
-                    FieldBronzeTableModel.Source,
-                    FieldBronzeTableModel.ParentFieldName,
-                    FieldBronzeTableModel.validation_timestamp,
-                )
-                .order_by(FieldBronzeTableModel.id)
-
-            )
-
-            query = query.filter(FieldBronzeTableModel.file_id == file_id)
+            query = build_bronze_results_query(session, file_id, excluded_severities)
             return pd.DataFrame(query.all(), columns=[col["name"] for col in query.column_descriptions])
 
         except Exception as e:
             logger.error(f"Error fetching records for file_id {file_id}: {e}")
             return pd.DataFrame()
+
+
+def fetch_bronze_data_for_silver(file_id, columns, excluded_severities=None):
+    """
+    Fetches the bronze rows of a file that are eligible for silver processing.
+
+    Only the requested data columns are projected and rows whose error severity is excluded are
+    dropped inside DuckDB, so neither rejected rows nor error text are loaded into pandas.
+
+    Parameters:
+    - file_id (int): ID of the file to fetch data for.
+    - columns (list): Bronze data columns needed by the silver stage.
+    - excluded_severities (list, optional): Error severities ('ERROR', 'WARNING') whose rows are filtered out.
+
+    Returns:
+    - pd.DataFrame: An Arrow-backed DataFrame ordered by insertion id, or an empty DataFrame on failure.
+    """
+    FieldBronzeTableModel = get_model(FIELD_BRONZE_TABLE)
+    if FieldBronzeTableModel is None:
+        logger.error("FieldBronzeTableModel is not defined. Cannot fetch data.")
+        return pd.DataFrame()
+
+    # Only project columns known to the bronze table
+    table_columns = FieldBronzeTableModel.__table__.columns.keys()
+    unknown_columns = [column for column in columns if column not in table_columns]
+    if unknown_columns:
+        logger.warning(f"Ignoring columns not present in '{FieldBronzeTableModel.__tablename__}': {unknown_columns}")
+    projection = ", ".join(f'b."{column}"' for column in columns if column in table_columns)
+
+    query = f"""
+        SELECT {projection}
+        FROM {FieldBronzeTableModel.__tablename__} b
+        WHERE b.file_id = $file_id
+    """
+    parameters = {"file_id": file_id}
+    if excluded_severities:
+        query += """
+        AND NOT EXISTS (
+            SELECT 1 FROM validation_error_summary s
+            WHERE s.zone = 'BRONZE'
+              AND s.file_id = b.file_id
+              AND s.row_index = b.row_index
+              AND list_contains($excluded_severities, s.error_severity)
+        )
+        """
+        parameters["excluded_severities"] = list(excluded_severities)
+    query += " ORDER BY b.id"
+
+    with get_read_session() as session:
+        try:
+            return fetch_arrow_dataframe(session, query, parameters)
+        except Exception as e:
+            logger.error(f"Error fetching silver input records for file_id {file_id}: {e}")
+            return pd.DataFrame()
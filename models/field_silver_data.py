@@ -1,29 +1,27 @@
 import logging
 
-from sqlalchemy import func, case
-from sqlalchemy.orm import aliased
+from sqlalchemy import func
 
 from config.logger_config import logger
 from config.project_config import PROJECT_CONFIG
-from models.error_messages import ErrorMessagesModel
-from models.validation_errors import ValidationErrorsModel
-from utils.db_util import get_session
+from utils.db_util import get_read_session, fetch_arrow_dataframe
+from utils.db_writer import db_writer
 from datetime import datetime
 import pandas as pd
-from utils.generate_sqlalchemy_model import generate_model_for_table
+from utils.generate_sqlalchemy_model import get_model
+from utils.pipeline_metrics import pipeline_metrics
 
-FieldSilverTableModel = None
-# Generate the SQLAlchemy model class dynamically for the 'field_bronze_table' table
-try:
-    if FieldSilverTableModel is None:
-        FieldSilverTableModel = generate_model_for_table(PROJECT_CONFIG["SQL_TABLES"]["FIELD"]["SILVER_TABLE"])
-        logger.info(f"Generated model class for table: {FieldSilverTableModel.__tablename__}")
-except Exception as e:
-    logger.error(f"Error generating model class for table 'field_silver_data': {e}")
-    # Ensure FieldSilverTableModel is defined as None if generation fails
+FIELD_SILVER_TABLE = PROJECT_CONFIG["SQL_TABLES"]["FIELD"]["SILVER_TABLE"]
+
+def __getattr__(name):
+    # FieldSilverTableModel is generated from the cached schema catalog on first access
+    if name == "FieldSilverTableModel":
+        return get_model(FIELD_SILVER_TABLE)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-def log_field_silver_table(df):
+def log_field_silver_table(df, unit_of_work=None):
+    FieldSilverTableModel = get_model(FIELD_SILVER_TABLE)
     if not FieldSilverTableModel:
         logger.error("FieldSilverTableModel is not defined. Cannot log data.")
         return
@@ -32,112 +30,163 @@ def log_field_silver_table(df):
         logger.warning("DataFrame is empty. Nothing to log.")
         return
 
-    with get_session() as session:
-        try:
-            # Determine the starting ID for new rows
-            max_id = session.query(FieldSilverTableModel.id).order_by(FieldSilverTableModel.id.desc()).first()
-            max_id = max_id[0] if max_id else 0
+    try:
+        if unit_of_work is not None:
+            # Deferred to the transaction of the caller's unit of work
+            unit_of_work.add(insert_field_silver_rows, df)
+            logger.info("Results for Silver Zone queued in the unit of work.")
+            return
+        # Rows are written by the database writer thread
+        db_writer.run(insert_field_silver_rows, df)
+        logger.info("Results for Silver Zone logged successfully.")
+    except Exception as e:
+        logger.error(f"Error logging validation results: {e}")
+
 
-            # Ensure primary key starts from 1
-            df["id"] = range(max_id + 1, max_id + 1 + len(df))
-            df["validation_timestamp"] = datetime.now()
+def insert_field_silver_rows(session, df):
+    """
+    Inserts processed silver rows into the 'field_silver_data' table without committing.
 
-            # Convert NaN values to None explicitly
-            df = df.astype(object).where(pd.notna(df), None)
+    Parameters:
+    - session: SQLAlchemy session owned by the caller.
+    - df (pd.DataFrame): Processed silver records.
+    """
+    FieldSilverTableModel = get_model(FIELD_SILVER_TABLE)
+    # Determine the starting ID for new rows
+    max_id = session.query(FieldSilverTableModel.id).order_by(FieldSilverTableModel.id.desc()).first()
+    max_id = max_id[0] if max_id else 0
 
-            # Convert DataFrame to list of dictionaries
-            data_to_insert = df.to_dict(orient="records")
+    # Ensure primary key starts from 1
+    df["id"] = range(max_id + 1, max_id + 1 + len(df))
+    df["validation_timestamp"] = datetime.now()
 
-            if data_to_insert:
-                # Efficient bulk insert
-                session.bulk_insert_mappings(FieldSilverTableModel, data_to_insert)
-                session.commit()
-                logger.info("Results for Silver Zone logged successfully.")
-            else:
-                logger.warning("No valid data to insert.")
+    # Convert NaN values to None explicitly
+    df = df.astype(object).where(pd.notna(df), None)
 
-        except Exception as e:
-            logger.error(f"Error logging validation results: {e}")
-            session.rollback()
+    # Convert DataFrame to list of dictionaries
+    data_to_insert = df.to_dict(orient="records")
 
+    if data_to_insert:
+        # Efficient bulk insert
+        with pipeline_metrics.stage("silver_write", file_id=data_to_insert[0]["file_id"], zone="SILVER", rows=len(data_to_insert)):
+            session.bulk_insert_mappings(FieldSilverTableModel, data_to_insert)
+    else:
+        logger.warning("No valid data to insert.")
 
-def fetch_silver_results_by_file_id(file_id):
+
+def build_silver_results_query(session, file_id, excluded_severities=None):
+    """
+    Builds the SQLAlchemy query returning the silver results of a file with their error summary.
+
+    Parameters:
+    - session: SQLAlchemy session to bind the query to.
+    - file_id (int): ID of the file to fetch data for.
+    - excluded_severities (list, optional): Error severities ('ERROR', 'WARNING') whose rows are filtered out in the query.
+
+    Returns:
+    - sqlalchemy.orm.Query: The un-executed results query.
+    """
+    FieldSilverTableModel = get_model(FIELD_SILVER_TABLE)
+    Summary = get_model('validation_error_summary')
+    query = (
+        session.query(
+            FieldSilverTableModel.id,
+            FieldSilverTableModel.row_index,
+            FieldSilverTableModel.file_id,
+            FieldSilverTableModel.FieldName,
+            FieldSilverTableModel.FieldType,
+            FieldSilverTableModel.Source,
+            FieldSilverTableModel.DiscoveryDate,
+            FieldSilverTableModel.ParentFieldName,
+            FieldSilverTableModel.ParentFieldOSDUId,
+            FieldSilverTableModel.AsIngestedCoordinates,
+            FieldSilverTableModel.Wgs84Coordinates,
+            FieldSilverTableModel.CRS,
+            FieldSilverTableModel.validation_timestamp,
+            Summary.error_message,
+            func.coalesce(Summary.error_severity, '').label("error_severity")
+        )
+        .outerjoin(
+            Summary,
+            (Summary.zone == "SILVER") &
+            (Summary.file_id == FieldSilverTableModel.file_id) &
+            (Summary.row_index == FieldSilverTableModel.row_index)
+        )
+        .filter(FieldSilverTableModel.file_id == file_id)
+        .order_by(FieldSilverTableModel.id)
+    )
+
+    if excluded_severities:
+        query = query.filter(func.coalesce(Summary.error_severity, '').notin_(excluded_severities))
+    return query
+
+
+def fetch_silver_results_by_file_id(file_id, excluded_severities=None):
     """
     Fetches records from the 'field_bronze_table' table for a specific file ID and groups them by 'FieldName'.
 
     Parameters:
     - file_id (int): ID of the file to fetch data for.
+    - excluded_severities (list, optional): Error severities ('ERROR', 'WARNING') whose rows are filtered out in the query.
 
     Returns:
     - pd.DataFrame: A DataFrame containing the grouped records, or an empty DataFrame if no records are found.
     """
+    FieldSilverTableModel = get_model(FIELD_SILVER_TABLE)
     if FieldSilverTableModel is None:
         logger.error("FieldSilverTableModel is not defined. Cannot fetch data.")
         return pd.DataFrame()
 
-    with get_session() as session:
+    with get_read_session() as session:
         try:
             # Query the table for the specified file_id
-            # Build SQLAlchemy query to fetch results
-            ValidationErrorsAlias = aliased(ValidationErrorsModel)
-            ErrorMessagesAlias = aliased(ErrorMessagesModel)
-            query = (
-                session.query(
-                    FieldSilverTableModel.id,
-                    FieldSilverTableModel.row_index,
-                    FieldSilverTableModel.file_id,
-                    FieldSilverTableModel.FieldName,
-                    FieldSilverTableModel.FieldType,
-                    FieldSilverTableModel.Source,
-                    FieldSilverTableModel.DiscoveryDate,
-                    FieldSilverTableModel.ParentFieldName,
-                    FieldSilverTableModel.ParentFieldOSDUId,
-                    FieldSilverTableModel.AsIngestedCoordinates,
-                    FieldSilverTableModel.Wgs84Coordinates,
-                    FieldSilverTableModel.CRS,
-                    FieldSilverTableModel.validation_timestamp,
-                    func.group_concat(ErrorMessagesAlias.error_message, ', ').label("error_message"),
-                    # Determine error_severity: show "ERROR" if any error exists, otherwise "WARNING"
-                    case(
-                        (func.sum(case((ErrorMessagesAlias.error_severity == 'ERROR', 1), else_=0)) > 0, 'ERROR'),
-                        (func.sum(case((ErrorMessagesAlias.error_severity == 'WARNING', 1), else_=0)) > 0, 'WARNING'),
-                        else_=''  # Return empty string when there are no warnings or errors
-                    ).label("error_severity")
-                )
-                .outerjoin(
-                    ValidationErrorsAlias,
-                    (ValidationErrorsAlias.zone == "SILVER") &
-                    (FieldSilverTableModel.row_index == ValidationErrorsAlias.row_index) &
-                    (FieldSilverTableModel.file_id == ValidationErrorsAlias.file_id)
-
-                )
-                .outerjoin(
-                    ErrorMessagesAlias,
-                    ValidationErrorsAlias.error_code == ErrorMessagesAlias.error_code
-                )
-                .filter(FieldSilverTableModel.file_id == file_id)
-                .group_by(
-                    FieldSilverTableModel.id,
-                    FieldSilverTableModel.row_index,
-                    FieldSilverTableModel.file_id,
-                    FieldSilverTableModel.FieldName,
-                    FieldSilverTableModel.FieldType,
-                    FieldSilverTableModel.Source,
-                    FieldSilverTableModel.DiscoveryDate,
-                    FieldSilverTableModel.ParentFieldName,
-                    FieldSilverTableModel.ParentFieldOSDUId,
-                    FieldSilverTableModel.AsIngestedCoordinates,
-                    FieldSilverTableModel.Wgs84Coordinates,
-                    FieldSilverTableModel.CRS,
-                    FieldSilverTableModel.validation_timestamp,
-                )
-                .order_by(FieldSilverTableModel.id)
-
-            )
-
-            query = query.filter(FieldSilverTableModel.file_id == file_id)
+            query = build_silver_results_query(session, file_id, excluded_severities)
             return pd.DataFrame(query.all(), columns=[col["name"] for col in query.column_descriptions])
 
         except Exception as e:
             logger.error(f"Error fetching records for file_id {file_id}: {e}")
-            return pd.DataFrame()
\ No newline at end of file
+            return pd.DataFrame()
+
+def fetch_silver_rows_by_group_hash(group_hashes, exclude_file_id=None):
+    """
+    Fetches the latest stored silver record for each of the given group hashes.
+
+    Only records of fully processed files are considered; the file being processed is excluded.
+
+    Parameters:
+    - group_hashes (list): Hashes of the FieldName groups to look up.
+    - exclude_file_id (int, optional): File whose own records are ignored.
+
+    Returns:
+    - pd.DataFrame: An Arrow-backed DataFrame without id and validation timestamp, or an empty DataFrame.
+    """
+    FieldSilverTableModel = get_model(FIELD_SILVER_TABLE)
+    if FieldSilverTableModel is None or not group_hashes:
+        return pd.DataFrame()
+
+    columns = [
+        column for column in FieldSilverTableModel.__table__.columns.keys()
+        if column not in ("id", "validation_timestamp")
+    ]
+    if "group_hash" not in columns:
+        logger.warning(f"'{FieldSilverTableModel.__tablename__}' has no group_hash column; silver results are not reused.")
+        return pd.DataFrame()
+
+    projection = ", ".join(f's."{column}"' for column in columns)
+    query = f"""
+        SELECT {projection}
+        FROM {FieldSilverTableModel.__tablename__} s
+        JOIN files f ON f.id = s.file_id AND f.file_status = 'SILVER_PROCESSED'
+        WHERE s.group_hash IN (SELECT unnest($group_hashes))
+          AND s.file_id <> $exclude_file_id
+        QUALIFY row_number() OVER (PARTITION BY s.group_hash ORDER BY s.id DESC) = 1
+        ORDER BY s.file_id, s.row_index
+    """
+    parameters = {"group_hashes": list(group_hashes), "exclude_file_id": exclude_file_id if exclude_file_id is not None else -1}
+
+    with get_read_session() as session:
+        try:
+            return fetch_arrow_dataframe(session, query, parameters)
+        except Exception as e:
+            logger.error(f"Error fetching silver rows by group hash: {e}")
+            return pd.DataFrame()
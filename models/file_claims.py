@@ -0,0 +1,199 @@
+import os
+import socket
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from config.logger_config import logger
+from config.project_config import PROJECT_CONFIG
+from file_processor.file_processor_registry import FileProcessorRegistry
+from models.file_scheduler import select_next_file
+from models.files import update_file_status
+from models.validation_error_summary import refresh_error_summary
+from utils.db_util import text
+from utils.db_writer import db_writer
+
+# Identifies this process in files.claimed_by. The random part keeps a restarted container, whose
+# process gets the same hostname and PID, from taking over the claims of the process that died.
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:12]}"
+
+DEFAULT_LEASE_SECONDS = 900
+
+# Zone, processor table and status to re-queue a file with, for each step that can be interrupted
+IN_FLIGHT_STATUSES = {
+    'BRONZE_PROCESSING': ('BRONZE', 'BRONZE_TABLE', 'PICKED'),
+    'SILVER_PROCESSING': ('SILVER', 'SILVER_TABLE', 'BRONZE_PROCESSED'),
+}
+
+
+# Earliest time the next recovery sweep runs, see recovery_due
+_next_recovery_at = None
+
+
+def _lease_seconds():
+    return PROJECT_CONFIG.get("FILE_LEASE_SECONDS", DEFAULT_LEASE_SECONDS)
+
+
+def recovery_due(now=None):
+    """
+    Whether the expired claims should be swept again: on the first call, then every third of
+    FILE_LEASE_SECONDS, so a file whose worker died is re-queued soon after its lease expires.
+
+    :param now: Current time, defaults to datetime.now().
+    :return: True if a sweep is due; the next one is then scheduled.
+    """
+    global _next_recovery_at
+    now = now or datetime.now()
+    if _next_recovery_at is not None and now < _next_recovery_at:
+        return False
+    _next_recovery_at = now + timedelta(seconds=max(_lease_seconds() / 3, 1))
+    return True
+
+
+def claim_next_file(session, worker_id=WORKER_ID, now=None):
+    """
+    Write job claiming the file chosen by the scheduler for FILE_LEASE_SECONDS. The lease is
+    renewed while the step runs (see claim_heartbeat) and cleared when the file reaches its next
+    resting status. The caller commits the session.
+
+    :param session: SQLAlchemy session
+    :param worker_id: Identifier stored in files.claimed_by.
+    :param now: Current time, defaults to datetime.now().
+    :return: ID of the claimed file, or None if no file is available.
+    """
+    now = now or datetime.now()
+    file_id = select_next_file(session, now)
+    if file_id is None:
+        return None
+
+    session.execute(
+        text("UPDATE files SET claimed_by = :worker_id, lease_expires_at = :lease_expires_at WHERE id = :id"),
+        {"worker_id": worker_id, "lease_expires_at": now + timedelta(seconds=_lease_seconds()), "id": file_id}
+    )
+    logger.info(f"Claimed file ID {file_id} for worker {worker_id} for {_lease_seconds()} seconds.")
+    return file_id
+
+
+def renew_claim(session, file_id, worker_id=WORKER_ID, now=None):
+    """
+    Write job extending the lease of a file by FILE_LEASE_SECONDS, if the worker still holds its
+    claim. The caller commits the session.
+
+    :param session: SQLAlchemy session
+    :param file_id: ID of the claimed file.
+    :param worker_id: Identifier stored in files.claimed_by.
+    :param now: Current time, defaults to datetime.now().
+    """
+    now = now or datetime.now()
+    session.execute(
+        text("UPDATE files SET lease_expires_at = :lease_expires_at WHERE id = :id AND claimed_by = :worker_id"),
+        {"worker_id": worker_id, "lease_expires_at": now + timedelta(seconds=_lease_seconds()), "id": file_id}
+    )
+
+
+@contextmanager
+def claim_heartbeat(file_id, worker_id=WORKER_ID):
+    """
+    Renew the lease of a claimed file every third of FILE_LEASE_SECONDS while the block runs, so a
+    step running longer than the lease is not recovered as interrupted while it is still working.
+
+    :param file_id: ID of the claimed file.
+    :param worker_id: Identifier stored in files.claimed_by.
+    """
+    stopped = threading.Event()
+
+    def renew():
+        while not stopped.wait(max(_lease_seconds() / 3, 1)):
+            try:
+                db_writer.run(renew_claim, file_id, worker_id)
+            except Exception as e:
+                logger.error(f"Error renewing the lease of file ID {file_id}: {e}")
+
+    heartbeat = threading.Thread(target=renew, name=f"claim-heartbeat-{file_id}", daemon=True)
+    heartbeat.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        heartbeat.join()
+
+
+def fail_claimed_file(session, file_id, remarks, worker_id=WORKER_ID):
+    """
+    Write job marking a file ERROR and releasing its claim after its step failed, if the worker
+    still holds the claim (a step that reached its next status has already released it).
+    The caller commits the session.
+
+    :param session: SQLAlchemy session
+    :param file_id: ID of the claimed file.
+    :param remarks: Remarks stored with the ERROR status.
+    :param worker_id: Identifier stored in files.claimed_by.
+    :return: True if the file was marked ERROR.
+    """
+    claimed = session.execute(
+        text("SELECT 1 FROM files WHERE id = :id AND claimed_by = :worker_id"),
+        {"id": file_id, "worker_id": worker_id}
+    ).fetchone()
+    if claimed is None:
+        return False
+    update_file_status(session, 'ERROR', file_id, remarks)  # Also clears the claim
+    return True
+
+
+def fetch_claimed_file(session, id):
+    """
+    Fetches the `files` row of a claimed file.
+
+    :param session: SQLAlchemy session
+    :param id: ID of the claimed file
+    :return: Row with id, filename, filepath, datatype, checksum and file_status, or None.
+    """
+    return session.execute(
+        text("SELECT id, filename, filepath, datatype, checksum, file_status FROM files WHERE id = :id"),
+        {"id": id}
+    ).fetchone()
+
+
+def recover_expired_claims(session):
+    """
+    Write job re-queuing files whose processing step was interrupted. The caller commits the session.
+
+    Files left in BRONZE_PROCESSING or SILVER_PROCESSING without a valid lease lose the rows,
+    validation errors and summaries that step wrote, and go back to the status they were claimed
+    from. Expired claims on files that were not started yet are cleared.
+
+    :param session: SQLAlchemy session
+    :return: Number of files re-queued.
+    """
+    now = datetime.now()
+    stalled = session.execute(
+        text(
+            "SELECT id, filename, datatype, file_status FROM files "
+            "WHERE file_status IN ('BRONZE_PROCESSING', 'SILVER_PROCESSING') "
+            "AND (lease_expires_at IS NULL OR lease_expires_at < :now) ORDER BY id"
+        ),
+        {"now": now}
+    ).fetchall()
+
+    for file_id, filename, datatype, file_status in stalled:
+        zone, table_key, requeue_status = IN_FLIGHT_STATUSES[file_status]
+        table_name = FileProcessorRegistry.get_tables(datatype)[table_key]
+        session.execute(text(f"DELETE FROM {table_name} WHERE file_id = :file_id"), {"file_id": file_id})
+        for errors_table in ("validation_errors", "validation_error_groups"):
+            session.execute(
+                text(f"DELETE FROM {errors_table} WHERE file_id = :file_id AND zone = :zone"),
+                {"file_id": file_id, "zone": zone}
+            )
+        refresh_error_summary(session, file_id, zone)
+        update_file_status(session, requeue_status, file_id)  # Also clears the claim
+        logger.warning(f"Recovered file '{filename}' interrupted in {file_status}; re-queued as {requeue_status}.")
+
+    session.execute(
+        text(
+            "UPDATE files SET claimed_by = NULL, lease_expires_at = NULL "
+            "WHERE file_status IN ('PICKED', 'BRONZE_PROCESSED') AND lease_expires_at < :now"
+        ),
+        {"now": now}
+    )
+    return len(stalled)
@@ -0,0 +1,137 @@
+import os
+from datetime import datetime
+
+from sqlalchemy import bindparam, text
+
+from config.logger_config import logger
+from config.project_config import PROJECT_CONFIG
+
+# SCHEDULER settings, overridden by PROJECT_CONFIG["SCHEDULER"]:
+# - FINISH_STARTED_FIRST: files waiting for silver go before files waiting for bronze.
+# - SHORTEST_JOB_FIRST:   within a priority level, smaller files go first.
+# - AGING_SECONDS:        a waiting file gains one priority level per this many seconds (0 disables aging).
+# - DATATYPE_PRIORITIES:  base priority of new files per datatype; higher runs first.
+# - DATATYPE_QUOTAS:      maximum number of files of a datatype claimed at the same time, across workers.
+DEFAULT_SCHEDULER_CONFIG = {
+    "FINISH_STARTED_FIRST": True,
+    "SHORTEST_JOB_FIRST": True,
+    "AGING_SECONDS": 300,
+    "DATATYPE_PRIORITIES": {},
+    "DATATYPE_QUOTAS": {},
+}
+
+
+def get_scheduler_config(overrides=None):
+    """
+    Returns the scheduler settings: the defaults, PROJECT_CONFIG["SCHEDULER"], then `overrides`.
+    """
+    config = dict(DEFAULT_SCHEDULER_CONFIG)
+    config.update(PROJECT_CONFIG.get("SCHEDULER", {}))
+    config.update(overrides or {})
+    return config
+
+
+def _order_by(config):
+    terms = []
+    if config["FINISH_STARTED_FIRST"]:
+        terms.append("CASE WHEN file_status = 'BRONZE_PROCESSED' THEN 0 ELSE 1 END")
+    if config["AGING_SECONDS"]:
+        # Whole levels only, so files of the same effective priority are still ordered by size
+        terms.append(
+            f"coalesce(priority, 0) + floor(date_diff('second', coalesce(created_at, :now), :now) / {float(config['AGING_SECONDS'])}) DESC"
+        )
+    else:
+        terms.append("coalesce(priority, 0) DESC")
+    if config["SHORTEST_JOB_FIRST"]:
+        terms.append("coalesce(file_size, 0) ASC")
+    terms.append("id ASC")
+    return ", ".join(terms)
+
+
+def saturated_datatypes(session, config, now):
+    """
+    Returns the datatypes whose number of currently claimed files has reached their quota.
+    """
+    quotas = config["DATATYPE_QUOTAS"]
+    if not quotas:
+        return []
+    rows = session.execute(
+        text(
+            "SELECT datatype, count(*) FROM files WHERE claimed_by IS NOT NULL AND lease_expires_at >= :now "
+            "GROUP BY datatype"
+        ),
+        {"now": now}
+    ).fetchall()
+    return [datatype for datatype, claimed in rows if datatype in quotas and claimed >= quotas[datatype]]
+
+
+def select_next_file(session, now=None, config=None):
+    """
+    Selects the next file to process according to the scheduler settings.
+
+    Candidates are unleased files waiting for bronze or silver processing whose datatype is below
+    its quota. They are ordered by stage, effective priority (base priority plus aging), size and
+    ID. Nothing is written here.
+
+    :param session: SQLAlchemy session
+    :param now: Current time, defaults to datetime.now().
+    :param config: Settings overriding the configured SCHEDULER settings.
+    :return: ID of the next file, or None if no file is available.
+    """
+    now = now or datetime.now()
+    config = get_scheduler_config(config)
+
+    saturated = saturated_datatypes(session, config, now)
+    query = (
+        "SELECT id FROM files WHERE file_status IN ('PICKED', 'BRONZE_PROCESSED') "
+        "AND (lease_expires_at IS NULL OR lease_expires_at < :now) "
+    )
+    params = {"now": now}
+    if saturated:
+        query += "AND datatype NOT IN :saturated "
+        params["saturated"] = saturated
+    query += f"ORDER BY {_order_by(config)} LIMIT 1"
+
+    statement = text(query)
+    if saturated:
+        statement = statement.bindparams(bindparam("saturated", expanding=True))
+    return session.execute(statement, params).scalar()
+
+
+def set_scheduling_attributes(session, id, filepath, datatype):
+    """
+    Stores the registration time, size and base priority of a newly registered file.
+    The caller commits the session.
+
+    :param session: SQLAlchemy session
+    :param id: ID of the file
+    :param filepath: Path of the file, used for its size.
+    :param datatype: Datatype of the file, used for its base priority.
+    """
+    try:
+        file_size = os.path.getsize(filepath)
+    except OSError as e:
+        logger.warning(f"Could not read the size of file {filepath}: {e}")
+        file_size = None
+    priority = get_scheduler_config()["DATATYPE_PRIORITIES"].get(datatype, 0)
+    session.execute(
+        text("UPDATE files SET created_at = :created_at, file_size = :file_size, priority = :priority WHERE id = :id"),
+        {"created_at": datetime.now(), "file_size": file_size, "priority": priority, "id": id}
+    )
+
+
+def update_file_priority(session, priority, id):
+    """
+    Changes the base priority of a file; higher priorities are processed first.
+    The caller commits the session; errors are logged and re-raised.
+
+    :param session: SQLAlchemy session
+    :param priority: New base priority
+    :param id: ID of the file to update
+    """
+    try:
+        session.execute(text("UPDATE files SET priority = :priority WHERE id = :id"), {"priority": priority, "id": id})
+        logger.info(f"Updated file with ID {id} to priority {priority}")
+    except Exception as e:
+        logger.error(f"Error updating file priority: {e}")
+        raise
@@ -1,24 +1,28 @@
+import json
 import os
 import logging
 
+from sqlalchemy import text
+
 from config.logger_config import logger
+from models.file_scheduler import set_scheduling_attributes
 from utils.checksum_util import calculate_checksum
-from utils.generate_sqlalchemy_model import generate_model_for_table
+from utils.generate_sqlalchemy_model import get_model
 
-FileModelClass = None
-# Generate the SQLAlchemy model class dynamically for the 'files' table
-try:
-    if FileModelClass is None:
-        FileModelClass = generate_model_for_table('files')
-        logger.info(f"Generated model class for table: {FileModelClass.__tablename__}")
-except Exception as e:
-    logger.error(f"Error generating model class for table 'files': {e}")
-    # Ensure FileModelClass is defined as None if generation fails
+def __getattr__(name):
+    # FileModelClass is generated from the cached schema catalog on first access
+    if name == "FileModelClass":
+        return get_model('files')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def insert_data(session, filepath, datatype, remarks):
+def insert_data(session, filepath, datatype, remarks, checksum=None):
     """
     Inserts a new record into the `files` table using the FileModelClass.
+    The caller commits the session; errors are logged and re-raised.
+
+    :param checksum: Precomputed checksum of the file, calculated here if not provided.
     """
+    FileModelClass = get_model('files')
     if FileModelClass is None:
         logger.error("FileModelClass is not defined. Cannot insert data.")
         return None
@@ -29,7 +33,8 @@ def insert_data(session, filepath, datatype, remarks):
     filename = os.path.basename(filepath)
 
     # Calculate checksum for the file
-    checksum = calculate_checksum(filepath)
+    if checksum is None:
+        checksum = calculate_checksum(filepath)
 
     # Fetch the last ID and increment it
     try:
@@ -51,20 +56,21 @@ def insert_data(session, filepath, datatype, remarks):
     )
 
     try:
-        # Add and commit the new record
+        # Add and flush the new record; the caller owns the commit
         session.add(new_file)
-        session.commit()
+        session.flush()
+        set_scheduling_attributes(session, new_file.id, filepath, datatype)
         logger.info(f"Inserted: {filename} with checksum {checksum}")
         return new_file.id
     except Exception as e:
         logger.error(f"Error inserting data into the `files` table: {e}")
-        session.rollback()
-        return None
+        raise
 
 def fetch_files_to_process(session):
     """
     Fetches files with status 1 or 2 from the `files` table for processing.
     """
+    FileModelClass = get_model('files')
     if FileModelClass is None:
         logger.error("FileModelClass is not defined. Cannot fetch files.")
         return None
@@ -82,15 +88,21 @@ def fetch_files_to_process(session):
         logger.error(f"Error fetching files from table: {e}")
         return None
 
+# Statuses held while a worker's claim on the file is still active
+IN_PROGRESS_STATUSES = ('BRONZE_PROCESSING', 'SILVER_PROCESSING')
+
 def update_file_status(session, status, id, remarks=None):
     """
-    Updates the status of a file in the `files` table using the FileModelClass.
+    Updates the status of a file in the `files` table using the FileModelClass, releasing the
+    file's claim unless the status is one of IN_PROGRESS_STATUSES.
+    The caller commits the session; errors are logged and re-raised.
 
     :param session: SQLAlchemy session
     :param status: New status to set
     :param id: ID of the file to update
     :param remarks: Optional remarks to add
     """
+    FileModelClass = get_model('files')
     if FileModelClass is None:
         logger.error("FileModelClass is not defined. Cannot update file status.")
         return
@@ -107,9 +119,109 @@ def update_file_status(session, status, id, remarks=None):
         if remarks is not None:
             file_record.remarks = remarks
 
-        # Commit the changes
-        session.commit()
+        # Flush the changes; the caller owns the commit
+        session.flush()
+
+        # A file leaves its worker's claim once it reaches a resting status
+        if status not in IN_PROGRESS_STATUSES:
+            session.execute(text("UPDATE files SET claimed_by = NULL, lease_expires_at = NULL WHERE id = :id"), {"id": id})
         logger.info(f"Updated file with ID {id} to file_status {status}")
     except Exception as e:
         logger.error(f"Error updating file file_status: {e}")
-        session.rollback()
+        raise
+
+def update_file_checksum(session, checksum, id):
+    """
+    Stores the checksum of a file whose checksum was deferred until its CSV was parsed.
+    The caller commits the session; errors are logged and re-raised.
+
+    :param session: SQLAlchemy session
+    :param checksum: Checksum of the file
+    :param id: ID of the file to update
+    """
+    try:
+        session.execute(text("UPDATE files SET checksum = :checksum WHERE id = :id"), {"checksum": checksum, "id": id})
+        logger.info(f"Updated file with ID {id} to checksum {checksum}")
+    except Exception as e:
+        logger.error(f"Error updating file checksum: {e}")
+        raise
+
+def update_file_profile(session, zone, report, id):
+    """
+    Attaches the profile of a processing step to a file: `profile_report` holds a JSON object with
+    one report per zone, and `profile_peak_memory_bytes` the highest peak memory of its steps.
+    The caller commits the session; errors are logged and re-raised.
+
+    :param session: SQLAlchemy session
+    :param zone: Zone of the profiled step ('BRONZE' or 'SILVER')
+    :param report: Profile report of the step, see utils.file_profiler
+    :param id: ID of the file to update
+    """
+    try:
+        row = session.execute(
+            text("SELECT profile_report, profile_peak_memory_bytes FROM files WHERE id = :id"), {"id": id}
+        ).fetchone()
+        if row is None:
+            logger.warning(f"No file found with ID {id}")
+            return
+
+        reports = json.loads(row.profile_report) if row.profile_report else {}
+        reports[zone] = report
+        peaks = [peak for peak in (row.profile_peak_memory_bytes, report.get("peak_memory_bytes")) if peak is not None]
+        session.execute(
+            text("UPDATE files SET profile_report = :report, profile_peak_memory_bytes = :peak WHERE id = :id"),
+            {"report": json.dumps(reports), "peak": max(peaks) if peaks else None, "id": id}
+        )
+        logger.info(f"Stored the {zone} profile of file with ID {id}")
+    except Exception as e:
+        logger.error(f"Error storing file profile: {e}")
+        raise
+
+# Export status values tracked per zone in files.bronze_export_status / files.silver_export_status
+EXPORT_STATUSES = ('PENDING', 'EXPORTING', 'EXPORTED', 'FAILED')
+EXPORT_STATUS_COLUMNS = {
+    'BRONZE': 'bronze_export_status',
+    'SILVER': 'silver_export_status',
+}
+
+def update_export_status(session, zone, status, id):
+    """
+    Updates the result export status of a file for the given zone.
+    The caller commits the session; errors are logged and re-raised.
+
+    :param session: SQLAlchemy session
+    :param zone: Zone of the exported results ('BRONZE' or 'SILVER')
+    :param status: New export status, one of EXPORT_STATUSES
+    :param id: ID of the file to update
+    """
+    if zone not in EXPORT_STATUS_COLUMNS or status not in EXPORT_STATUSES:
+        logger.error(f"Invalid export status '{status}' for zone '{zone}'.")
+        return
+
+    try:
+        session.execute(
+            text(f"UPDATE files SET {EXPORT_STATUS_COLUMNS[zone]} = :status WHERE id = :id"),
+            {"status": status, "id": id}
+        )
+        logger.info(f"Updated file with ID {id} to {zone} export status {status}")
+    except Exception as e:
+        logger.error(f"Error updating file export status: {e}")
+        raise
+
+def fetch_files_with_pending_exports(session):
+    """
+    Fetches files whose result export was queued or running when the application stopped.
+
+    :param session: SQLAlchemy session
+    :return: List of (id, filename, datatype, zone) tuples.
+    """
+    pending_exports = []
+    try:
+        for zone, column in EXPORT_STATUS_COLUMNS.items():
+            rows = session.execute(
+                text(f"SELECT id, filename, datatype FROM files WHERE {column} IN ('PENDING', 'EXPORTING') ORDER BY id")
+            ).fetchall()
+            pending_exports.extend((row.id, row.filename, row.datatype, zone) for row in rows)
+    except Exception as e:
+        logger.error(f"Error fetching files with pending exports: {e}")
+    return pending_exports
@@ -0,0 +1,120 @@
+from config.logger_config import logger
+from config.project_config import PROJECT_CONFIG
+from file_processor.file_processor_registry import FileProcessorRegistry
+from models.files import update_file_status
+from models.validation_error_summary import refresh_error_summary
+from utils.db_util import text
+from utils.db_writer import db_writer
+
+# RESULT_REUSE_MODE values:
+# - OFF:         every file is processed from scratch.
+# - IDENTICAL:   a file whose checksum matches an already processed file reuses that file's results.
+# - INCREMENTAL: IDENTICAL, and in silver only FieldName groups whose hash does not match a
+#                stored silver record are sent to the OSDU lookups.
+REUSE_MODES = ('OFF', 'IDENTICAL', 'INCREMENTAL')
+
+# checksum_util returns these placeholders instead of a digest when hashing fails
+INVALID_CHECKSUMS = ('File not found',)
+
+
+def get_reuse_mode():
+    """
+    Returns the configured RESULT_REUSE_MODE, falling back to OFF for unknown values.
+    """
+    mode = str(PROJECT_CONFIG.get("RESULT_REUSE_MODE", "OFF")).upper()
+    if mode not in REUSE_MODES:
+        logger.warning(f"Unknown RESULT_REUSE_MODE '{mode}'; results will not be reused.")
+        return 'OFF'
+    return mode
+
+
+def find_file_with_same_checksum(session, file_record, checksum=None):
+    """
+    Finds the latest fully processed file with the same content as the given file.
+
+    :param session: SQLAlchemy session
+    :param file_record: Row of the `files` table being processed.
+    :param checksum: Checksum to match, defaults to the one stored with the file.
+    :return: ID of the matching file, or None.
+    """
+    checksum = checksum or file_record.checksum
+    if not checksum or checksum in INVALID_CHECKSUMS or checksum.startswith("Error"):
+        return None
+
+    return session.execute(
+        text(
+            "SELECT id FROM files WHERE checksum = :checksum AND datatype = :datatype AND id <> :id "
+            "AND file_status = 'SILVER_PROCESSED' ORDER BY id DESC LIMIT 1"
+        ),
+        {"checksum": checksum, "datatype": file_record.datatype, "id": file_record.id}
+    ).scalar()
+
+
+def _table_columns(session, table_name):
+    rows = session.execute(
+        text("SELECT column_name FROM information_schema.columns WHERE table_name = :table_name ORDER BY ordinal_position"),
+        {"table_name": table_name}
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def copy_file_rows(session, table_name, id_column, source_file_id, target_file_id):
+    """
+    Copies the rows of one file to another file ID, allocating new primary keys in the source order.
+    The caller owns the transaction; nothing is committed here.
+    """
+    columns = [column for column in _table_columns(session, table_name) if column not in (id_column, "file_id")]
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    session.execute(
+        text(
+            f'INSERT INTO {table_name} ("{id_column}", file_id, {column_list}) '
+            f'SELECT (SELECT coalesce(max("{id_column}"), 0) FROM {table_name}) + row_number() OVER (ORDER BY "{id_column}"), '
+            f':target_file_id, {column_list} FROM {table_name} WHERE file_id = :source_file_id'
+        ),
+        {"source_file_id": source_file_id, "target_file_id": target_file_id}
+    )
+
+
+def copy_file_results(session, source_file_id, target_file_id, datatype):
+    """
+    Write job re-keying the bronze rows, silver rows and validation errors of an identical file to
+    a new file ID, then marking the new file SILVER_PROCESSED. Nothing is committed here.
+
+    :param session: SQLAlchemy session owned by the caller.
+    :param source_file_id: ID of the processed file with the same checksum.
+    :param target_file_id: ID of the file reusing the results.
+    :param datatype: Datatype of the files; its processor declares the bronze and silver tables.
+    """
+    tables = FileProcessorRegistry.get_tables(datatype)
+    for table_name in (tables["BRONZE_TABLE"], tables["SILVER_TABLE"]):
+        copy_file_rows(session, table_name, "id", source_file_id, target_file_id)
+        logger.info(f"Reused rows of '{table_name}' from file ID {source_file_id} for file ID {target_file_id}.")
+
+    copy_file_rows(session, "validation_errors", "error_id", source_file_id, target_file_id)
+    copy_file_rows(session, "validation_error_groups", "group_id", source_file_id, target_file_id)
+    for zone in ("BRONZE", "SILVER"):
+        refresh_error_summary(session, target_file_id, zone)
+
+    update_file_status(session, 'SILVER_PROCESSED', target_file_id, f"Reused results of file ID {source_file_id}")
+
+
+def reuse_identical_results(session, file_record, checksum=None):
+    """
+    Reuses the results of an already processed file with the same checksum, if there is one.
+    The results are copied in a single write transaction by the database writer.
+
+    :param session: Read session used for the lookup.
+    :param file_record: Row of the `files` table being processed.
+    :param checksum: Checksum of the file, if it was computed after the file was registered.
+    :return: ID of the reused file, or None if the file has to be processed.
+    """
+    if get_reuse_mode() == 'OFF':
+        return None
+
+    source_file_id = find_file_with_same_checksum(session, file_record, checksum)
+    if source_file_id is None:
+        return None
+
+    logger.info(f"File '{file_record.filename}' has the same checksum as file ID {source_file_id}; reusing its results.")
+    db_writer.run(copy_file_results, source_file_id, file_record.id, file_record.datatype)
+    return source_file_id
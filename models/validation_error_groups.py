@@ -0,0 +1,123 @@
+from datetime import datetime
+
+from config.logger_config import logger
+from config.project_config import PROJECT_CONFIG
+from utils.db_util import text
+
+# ERROR_OUTPUT settings, overridden by PROJECT_CONFIG["ERROR_OUTPUT"]:
+# - ENABLED:              bound the validation_errors rows written per rule and per group.
+# - ZONES:                zones whose errors are bounded. Silver errors are re-read per row when
+#                         results are reused, so they are kept in full by default.
+# - MAX_ERRORS_PER_GROUP: rows kept per error code and field name (for group rules, the group key);
+#                         0 keeps all.
+# - MAX_ERRORS_PER_RULE:  rows kept per error code over all groups; 0 keeps all.
+# - SAMPLE_SIZE:          row indices of the omitted errors listed in sample_row_indices.
+# The omitted errors of a group are stored as one validation_error_groups row with their count and
+# row indices, so the per-row error summary (and the rows excluded from silver) stays complete.
+DEFAULT_ERROR_OUTPUT_CONFIG = {
+    "ENABLED": True,
+    "ZONES": ["BRONZE"],
+    "MAX_ERRORS_PER_GROUP": 1000,
+    "MAX_ERRORS_PER_RULE": 100000,
+    "SAMPLE_SIZE": 10,
+}
+
+INSERT_GROUP_SQL = """
+    INSERT INTO validation_error_groups (group_id, file_id, zone, error_type, error_code, field_name, error_count,
+                                         logged_count, sample_row_indices, omitted_row_indices, created_at)
+    VALUES (:group_id, :file_id, :zone, :error_type, :error_code, :field_name, :error_count,
+            :logged_count, :sample_row_indices, :omitted_row_indices, :created_at)
+"""
+
+
+def get_error_output_config():
+    """
+    Returns the error output settings: the defaults updated with PROJECT_CONFIG["ERROR_OUTPUT"].
+    """
+    config = dict(DEFAULT_ERROR_OUTPUT_CONFIG)
+    config.update(PROJECT_CONFIG.get("ERROR_OUTPUT", {}))
+    return config
+
+
+def bounds_errors(zone: str, config=None):
+    """
+    Whether the errors of a zone are bounded.
+    """
+    config = config or get_error_output_config()
+    return bool(config["ENABLED"]) and zone in config["ZONES"]
+
+
+def bound_errors(errors: list, zone: str, config=None):
+    """
+    Keep the first errors of every rule and group and summarize the others by group.
+
+    An error is kept while fewer than MAX_ERRORS_PER_GROUP errors of its (error_type, error_code,
+    field_name) group were seen and fewer than MAX_ERRORS_PER_RULE errors of its (error_type,
+    error_code) rule were kept. Errors without a row index are always kept.
+
+    :param errors: Error dictionaries ordered by row, as inserted by insert_validation_errors.
+    :param zone: Zone the errors belong to.
+    :param config: Error output settings; read from the project config when omitted.
+    :return: Tuple of (kept errors, error group dictionaries in order of their first error), with no
+             groups when the zone's errors are not bounded.
+    """
+    config = config or get_error_output_config()
+    if not bounds_errors(zone, config):
+        return errors, []
+
+    max_per_group = config["MAX_ERRORS_PER_GROUP"] or float("inf")
+    max_per_rule = config["MAX_ERRORS_PER_RULE"] or float("inf")
+    kept, groups, rule_counts = [], {}, {}
+    for error in errors:
+        row_index = error.get("row_index")
+        if row_index is None:
+            kept.append(error)
+            continue
+        rule_key = (error.get("error_type"), error.get("error_code"))
+        group = groups.setdefault(rule_key + (error.get("field_name"),), {"error_count": 0, "omitted": []})
+        group["error_count"] += 1
+        if group["error_count"] <= max_per_group:
+            rule_counts[rule_key] = rule_counts.get(rule_key, 0) + 1
+            if rule_counts[rule_key] <= max_per_rule:
+                kept.append(error)
+                continue
+        group["omitted"].append(int(row_index))
+
+    error_groups = [
+        {
+            "error_type": error_type,
+            "error_code": error_code,
+            "field_name": field_name,
+            "error_count": group["error_count"],
+            "logged_count": group["error_count"] - len(group["omitted"]),
+            "sample_row_indices": ", ".join(str(index) for index in group["omitted"][:config["SAMPLE_SIZE"]]),
+            "omitted_row_indices": group["omitted"],
+        }
+        for (error_type, error_code, field_name), group in groups.items()
+        if group["omitted"]
+    ]
+    return kept, error_groups
+
+
+def insert_error_groups(session, error_groups: list, file_id: int, zone: str):
+    """
+    Insert the error groups of a file without committing.
+
+    :param session: SQLAlchemy session owned by the caller.
+    :param error_groups: Error group dictionaries from bound_errors.
+    :param file_id: ID of the file the errors belong to.
+    :param zone: Zone the errors belong to.
+    """
+    if not error_groups:
+        return
+    max_id = session.execute(text("SELECT coalesce(max(group_id), 0) FROM validation_error_groups")).scalar()
+    created_at = datetime.now()
+    session.execute(
+        text(INSERT_GROUP_SQL),
+        [
+            dict(group, group_id=max_id + position, file_id=file_id, zone=zone, created_at=created_at)
+            for position, group in enumerate(error_groups, start=1)
+        ]
+    )
+    omitted = sum(group["error_count"] - group["logged_count"] for group in error_groups)
+    logger.info(f"{omitted} validation errors of file_id {file_id} summarized in {len(error_groups)} error groups.")
@@ -0,0 +1,56 @@
+from config.logger_config import logger
+from utils.db_util import text
+from utils.generate_sqlalchemy_model import get_model
+
+def __getattr__(name):
+    # ValidationErrorSummaryModel is generated from the cached schema catalog on first access
+    if name == "ValidationErrorSummaryModel":
+        return get_model('validation_error_summary')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# One row per (file_id, zone, row_index) with the concatenated messages and the worst severity,
+# including the errors only stored as the omitted rows of validation_error_groups
+REFRESH_SUMMARY_SQL = """
+    INSERT INTO validation_error_summary (file_id, zone, row_index, error_message, error_severity, error_count)
+    SELECT
+        ve.file_id,
+        ve.zone,
+        ve.row_index,
+        string_agg(em.error_message, ', ' ORDER BY ve.error_id NULLS LAST, ve.group_id) AS error_message,
+        CASE
+            WHEN bool_or(em.error_severity = 'ERROR') THEN 'ERROR'
+            WHEN bool_or(em.error_severity = 'WARNING') THEN 'WARNING'
+            ELSE ''
+        END AS error_severity,
+        count(*) AS error_count
+    FROM (
+        SELECT file_id, zone, row_index, error_code, error_id, NULL AS group_id
+        FROM validation_errors
+        WHERE file_id = :file_id AND zone = :zone AND row_index IS NOT NULL
+        UNION ALL
+        SELECT file_id, zone, unnest(omitted_row_indices) AS row_index, error_code, NULL AS error_id, group_id
+        FROM validation_error_groups
+        WHERE file_id = :file_id AND zone = :zone
+    ) ve
+    LEFT JOIN error_messages em ON ve.error_code = em.error_code
+    GROUP BY ve.file_id, ve.zone, ve.row_index
+"""
+
+
+def refresh_error_summary(session, file_id: int, zone: str):
+    """
+    Rebuild the 'validation_error_summary' rows of a file and zone from 'validation_errors' and
+    'validation_error_groups'.
+
+    The caller owns the transaction; nothing is committed here.
+
+    :param session: SQLAlchemy session
+    :param file_id: ID of the file whose errors were logged.
+    :param zone: Zone the errors belong to (BRONZE, SILVER, ...).
+    """
+    session.execute(
+        text("DELETE FROM validation_error_summary WHERE file_id = :file_id AND zone = :zone"),
+        {"file_id": file_id, "zone": zone}
+    )
+    session.execute(text(REFRESH_SUMMARY_SQL), {"file_id": file_id, "zone": zone})
+    logger.info(f"Refreshed validation error summary for file_id {file_id} in zone {zone}.")
@@ -1,57 +1,131 @@
 from config.logger_config import logger
-from utils.db_util import get_session, text
+from utils.db_util import text, get_read_session
+from utils.db_writer import db_writer
 from sqlalchemy import func
 from datetime import datetime
-from utils.generate_sqlalchemy_model import generate_model_for_table
+from models.validation_error_groups import bound_errors, insert_error_groups
+from models.validation_error_summary import refresh_error_summary
+from utils.generate_sqlalchemy_model import get_model
+from utils.pipeline_metrics import pipeline_metrics
+
+def __getattr__(name):
+    # ValidationErrorsModel is generated from the cached schema catalog on first access
+    if name == "ValidationErrorsModel":
+        return get_model('validation_errors')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _row_sort_key(error: dict):
+    """
+    Sort key ordering errors by numeric row_index, with errors that have no row last.
+    """
+    row_index = error.get("row_index")
+    try:
+        return 0, int(row_index)
+    except (TypeError, ValueError):
+        return 1, 0
 
-ValidationErrorsModel = None
-# Generate the SQLAlchemy model class dynamically for the 'validation_errors' table
-try:
-    if ValidationErrorsModel is None:
-        ValidationErrorsModel = generate_model_for_table('validation_errors')
-        logger.info(f"Generated model class for table: {ValidationErrorsModel.__tablename__}")
-except Exception as e:
-    logger.error(f"Error generating model class for table 'validation_errors': {e}")
-    # Ensure ValidationErrorsModel is defined as None if generation fails
 
-def log_errors_to_db(errors: list, file_id: int, zone = "COMMON"):
+def log_errors_to_db(errors: list, file_id: int, zone = "COMMON", unit_of_work=None):
     """
     Log validation errors to the database dynamically using the ValidationErrorsModel.
+    The per-row 'validation_error_summary' of the file and zone is refreshed in the same transaction.
+    The errors are written by the database writer thread, bounded per rule and group (see
+    models.validation_error_groups).
 
     :param errors: List of dictionaries containing validation error details.
     :param file_id: ID of the file associated with the errors.
+    :param zone: Zone the errors belong to.
+    :param unit_of_work: Optional UnitOfWork; when given, the write is deferred to its transaction.
     """
+    ValidationErrorsModel = get_model('validation_errors')
     if ValidationErrorsModel is None:
         logger.error("ValidationErrorsModel is not defined. Cannot log errors.")
         return
 
-    with get_session() as session:
-        # Handle empty errors list
-        if not errors:
-            logger.info("No errors to log.")
+    # Handle empty errors list
+    if not errors:
+        logger.info("No errors to log.")
+        return
+
+    logger.info("Logging errors to the database...")
+    try:
+        if unit_of_work is not None:
+            unit_of_work.add(insert_validation_errors, errors, file_id, zone)
+            logger.info(f"{len(errors)} validation errors queued in the unit of work.")
             return
+        db_writer.run(insert_validation_errors, errors, file_id, zone)
+        logger.info(f"{len(errors)} validation errors logged successfully.")
+    except Exception as e:
+        logger.error(f"Error logging validation errors: {e}")
 
-        logger.info("Logging errors to the database...")
 
-        # Fetch the maximum existing error_id and calculate new IDs
-        max_id = session.query(func.max(ValidationErrorsModel.error_id)).scalar() or 0
-        new_error_id_start = max_id + 1
+def insert_validation_errors(session, errors: list, file_id: int, zone = "COMMON"):
+    """
+    Insert validation errors and refresh the file's error summary without committing. Errors beyond
+    the ERROR_OUTPUT limits are stored as error groups instead of one row each.
 
-        # Add required fields to each error
-        for idx, error in enumerate(errors):
-            error["error_id"] = new_error_id_start + idx
-            error["zone"] = zone
-            error["file_id"] = file_id
-            error["created_at"] = datetime.now()
+    :param session: SQLAlchemy session owned by the caller.
+    :param errors: List of dictionaries containing validation error details.
+    :param file_id: ID of the file associated with the errors.
+    :param zone: Zone the errors belong to.
+    """
+    ValidationErrorsModel = get_model('validation_errors')
+    # Fetch the maximum existing error_id and calculate new IDs
+    max_id = session.query(func.max(ValidationErrorsModel.error_id)).scalar() or 0
+    new_error_id_start = max_id + 1
+
+    # Insert errors clustered by row so each file's errors land in contiguous, row-ordered blocks
+    errors = sorted(errors, key=_row_sort_key)
+    errors, error_groups = bound_errors(errors, zone)
+
+    # Add required fields to each error
+    for idx, error in enumerate(errors):
+        error["error_id"] = new_error_id_start + idx
+        error["zone"] = zone
+        error["file_id"] = file_id
+        error["created_at"] = datetime.now()
+
+    # Create instances of the ValidationErrorsModel
+    error_records = [ValidationErrorsModel(**error) for error in errors]
+
+    # Add the records to the session
+    with pipeline_metrics.stage("error_write", file_id=file_id, zone=zone, errors=len(error_records)):
+        session.bulk_save_objects(error_records)
+        insert_error_groups(session, error_groups, file_id, zone)
+        refresh_error_summary(session, file_id, zone)
 
-        # Create instances of the ValidationErrorsModel
-        error_records = [ValidationErrorsModel(**error) for error in errors]
 
+def fetch_validation_errors(file_id: int, zone: str, row_indexes: list):
+    """
+    Fetch the stored validation errors of a file and zone for the given row indexes.
+
+    :param file_id: ID of the file the errors belong to.
+    :param zone: Zone the errors belong to.
+    :param row_indexes: Row indexes to fetch errors for.
+    :return: List of error dictionaries in the shape accepted by log_errors_to_db.
+    """
+    ValidationErrorsModel = get_model('validation_errors')
+    if ValidationErrorsModel is None or not row_indexes:
+        return []
+
+    with get_read_session() as session:
         try:
-            # Add the records to the session and commit
-            session.bulk_save_objects(error_records)
-            session.commit()
-            logger.info(f"{len(errors)} validation errors logged successfully.")
+            rows = (
+                session.query(
+                    ValidationErrorsModel.row_index,
+                    ValidationErrorsModel.field_name,
+                    ValidationErrorsModel.error_type,
+                    ValidationErrorsModel.error_code,
+                )
+                .filter(
+                    ValidationErrorsModel.file_id == file_id,
+                    ValidationErrorsModel.zone == zone,
+                    ValidationErrorsModel.row_index.in_([int(i) for i in row_indexes]),
+                )
+                .order_by(ValidationErrorsModel.error_id)
+                .all()
+            )
+            return [dict(row._mapping) for row in rows]
         except Exception as e:
-            logger.error(f"Error logging validation errors: {e}")
-            session.rollback()
+            logger.error(f"Error fetching validation errors for file_id {file_id}: {e}")
+            return []
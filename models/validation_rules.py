@@ -0,0 +1,40 @@
+from config.logger_config import logger
+from utils.db_util import text, get_read_session
+from utils.generate_sqlalchemy_model import get_model
+
+def __getattr__(name):
+    # ValidationRulesModel is generated from the cached schema catalog on first access
+    if name == "ValidationRulesModel":
+        return get_model('validation_rules')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+FETCH_RULES_SQL = """
+    SELECT rule_code, rule_kind, rule_columns, group_by, error_type, error_field
+    FROM validation_rules
+    WHERE table_name = :table_name AND zone = :zone AND enabled
+    ORDER BY rule_order, rule_code
+"""
+
+
+def fetch_validation_rules(table_name: str, zone: str = "BRONZE"):
+    """
+    Fetch the enabled rules of the validation rule catalog for a table, in evaluation order.
+
+    :param table_name: Table whose data the rules validate, e.g. 'field_bronze_data'.
+    :param zone: Zone the rules belong to.
+    :return: List of rule dictionaries with `rule_columns` as a list, empty if none could be read.
+    """
+    with get_read_session() as session:
+        try:
+            rows = session.execute(text(FETCH_RULES_SQL), {"table_name": table_name, "zone": zone}).fetchall()
+        except Exception as e:
+            logger.error(f"Error fetching validation rules for table '{table_name}': {e}")
+            return []
+
+    rules = []
+    for row in rows:
+        rule = dict(row._mapping)
+        rule["rule_columns"] = [column.strip() for column in rule["rule_columns"].split(",")]
+        rules.append(rule)
+    logger.info(f"Fetched {len(rules)} validation rules for table '{table_name}'.")
+    return rules
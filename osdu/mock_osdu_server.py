@@ -0,0 +1,180 @@
+"""
+Local stand-in for the OSDU search and CRS converter APIs.
+
+Serves POST /api/search/v2/query and POST /api/crs/converter/v2/convert from an in-memory
+OSDURecordStore seeded with CRS and Field records, with configurable latency, error injection
+and rate limiting. Point OSDUClient at it by setting "base_url" in config/osdu_config.json to
+the printed address (e.g. http://localhost:8080); the headers are accepted as they are.
+GET /mock/stats returns the number of responses per endpoint and status.
+
+Usage (from the repository root):
+    python -m osdu.mock_osdu_server --port 8080 --seed osdu/mock_osdu_seed.json --latency-ms 50 --error-rate 0.01
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config.logger_config import logger
+from osdu.osdu_record_store import OSDURecordStore
+
+SEARCH_PATH = "/api/search/v2/query"
+CONVERT_PATH = "/api/crs/converter/v2/convert"
+STATS_PATH = "/mock/stats"
+
+
+class MockOSDUService:
+    """
+    Answers mock OSDU requests from a record store, applying the configured faults.
+
+    :param store: OSDURecordStore holding the seeded records.
+    :param latency_ms: Delay added to every request.
+    :param jitter_ms: Maximum random delay added on top of `latency_ms`.
+    :param error_rate: Fraction of requests answered with `error_status` instead of a result.
+    :param error_status: HTTP status of injected errors.
+    :param rate_limit: Requests per second allowed (token bucket with a burst of one second), 0 for no limit.
+    :param seed: Random seed for jitter and error injection.
+    """
+
+    def __init__(self, store, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, error_status=503, rate_limit=0.0, seed=None):
+        self.store = store
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit = rate_limit
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = rate_limit
+        self._refilled_at = time.monotonic()
+        self.stats = defaultdict(int)  # "<path> <status>" -> responses
+
+    def _take_token(self):
+        if not self.rate_limit:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled_at) * self.rate_limit)
+            self._refilled_at = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def handle(self, path, payload):
+        """
+        Answer a request.
+
+        :return: Tuple of (HTTP status, response body as a dict).
+        """
+        if not self._take_token():
+            return 429, {"code": 429, "reason": "Too Many Requests", "message": "Mock rate limit exceeded"}
+
+        with self._lock:
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            inject_error = self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay / 1000)
+        if inject_error:
+            return self.error_status, {"code": self.error_status, "reason": "Injected error", "message": "Mock error injection"}
+
+        try:
+            if path == SEARCH_PATH:
+                return 200, self.store.search(payload)
+            return 200, self.store.convert(payload["fromCRS"], payload["toCRS"], payload["points"])
+        except (KeyError, TypeError, ValueError) as e:
+            return 400, {"code": 400, "reason": "Bad Request", "message": str(e)}
+
+    def record(self, path, status):
+        with self._lock:
+            self.stats[f"{path} {status}"] += 1
+
+
+class _MockOSDUHandler(BaseHTTPRequestHandler):
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        service = self.server.service
+        path = self.path.split("?")[0]
+        if path not in (SEARCH_PATH, CONVERT_PATH):
+            self._send_json(404, {"code": 404, "reason": "Not Found"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except json.JSONDecodeError as e:
+            status, body = 400, {"code": 400, "reason": "Bad Request", "message": str(e)}
+        else:
+            status, body = service.handle(path, payload)
+        service.record(path, status)
+        self._send_json(status, body)
+
+    def do_GET(self):
+        if self.path.split("?")[0] != STATS_PATH:
+            self._send_json(404, {"code": 404, "reason": "Not Found"})
+            return
+        with self.server.service._lock:
+            stats = dict(self.server.service.stats)
+        self._send_json(200, stats)
+
+    def log_message(self, format, *args):
+        logger.debug(f"Mock OSDU request: {format % args}", extra={"sample_key": "mock_osdu_request"})
+
+
+def load_store(seed_path=None):
+    """
+    Returns an OSDURecordStore seeded from a JSON seed file, or an empty one.
+    """
+    store = OSDURecordStore()
+    if seed_path:
+        with open(seed_path, "r") as file:
+            store.load_seed(json.load(file))
+    return store
+
+
+def start_mock_osdu_server(service, port=8080, host="127.0.0.1"):
+    """
+    Serve a MockOSDUService from a background thread. Port 0 picks a free port.
+
+    :return: The running HTTP server; its base URL is http://<host>:<server.server_port>.
+    """
+    server = ThreadingHTTPServer((host, port), _MockOSDUHandler)
+    server.daemon_threads = True
+    server.service = service
+    threading.Thread(target=server.serve_forever, name="mock-osdu-server", daemon=True).start()
+    logger.info(f"Mock OSDU server listening at http://{host}:{server.server_port}")
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local mock of the OSDU search and CRS converter APIs.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on.")
+    parser.add_argument("--seed", default="osdu/mock_osdu_seed.json", help="JSON file with the CRS and Field records.")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every request.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Maximum random delay added to the latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with an error.")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of injected errors.")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests per second allowed, 0 for no limit.")
+    parser.add_argument("--random-seed", type=int, default=None, help="Random seed for jitter and error injection.")
+    args = parser.parse_args()
+
+    mock_service = MockOSDUService(
+        load_store(args.seed), args.latency_ms, args.jitter_ms, args.error_rate, args.error_status,
+        args.rate_limit, args.random_seed
+    )
+    mock_server = start_mock_osdu_server(mock_service, args.port, args.host)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        mock_server.shutdown()
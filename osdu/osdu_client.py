@@ -1,9 +1,11 @@
 import json
+import logging
 import os
 import requests
 
 from config.logger_config import logger
 from config.project_config import PROJECT_CONFIG
+from utils.pipeline_metrics import pipeline_metrics
 
 class OSDUClient:
     def __init__(self):
@@ -58,6 +60,7 @@ class OSDUClient:
 
 
 
+    @pipeline_metrics.timed("osdu_search")
     def search(self, payload):
         """
         Sends a POST request to the OSDU search API.
@@ -77,9 +80,11 @@ class OSDUClient:
             # Construct the query URL (make it configurable if needed)
             query_url = f"{self.base_url}/api/search/v2/query"
 
-            # Log only a partial payload to avoid exposing sensitive data
-            logger.info(
-                f"Sending search request to {query_url} with limited payload preview: {json.dumps(payload)[:200]}...")
+            # Sampled, as this runs for every field; the payload preview is only built at DEBUG level
+            logger.info(f"Sending search request to {query_url}", extra={"sample_key": "osdu_search"})
+            if logger.isEnabledFor(logging.DEBUG):
+                # Log only a partial payload to avoid exposing sensitive data
+                logger.debug(f"Search payload preview: {json.dumps(payload)[:200]}...", extra={"sample_key": "osdu_search_payload"})
 
             # Send the POST request
             response = requests.post(query_url, headers=self.headers, json=payload)
@@ -105,6 +110,7 @@ class OSDUClient:
             logger.error(f"An unexpected error occurred: {e}")
             raise
 
+    @pipeline_metrics.timed("crs_convert")
     def crs_converter(self, from_crs, to_crs, points):
         """
         Converts CRS coordinates using the API.
@@ -135,8 +141,7 @@ class OSDUClient:
 
             # Check for HTTP errors
             if response.status_code != 200:
-                print(f"Error: Received status code {response.status_code}")
-                print(f"Response: {response.text}")
+                logger.error(f"Error: Received status code {response.status_code}, Response: {response.text}")
                 response.raise_for_status()
 
             # Parse the response as JSON
@@ -144,16 +149,16 @@ class OSDUClient:
 
         except requests.exceptions.RequestException as e:
             # Handle network-related errors (e.g., connection issues, timeouts)
-            print(f"Request failed: {e}")
+            logger.error(f"CRS conversion request failed: {e}")
             raise
 
         except ValueError as e:
             # Handle JSON decoding errors
-            print(f"Failed to parse JSON response: {e}")
-            print(f"Raw response: {response.text if response else 'No response'}")
+            logger.error(f"Failed to parse JSON response: {e}")
+            logger.error(f"Raw response: {response.text if response else 'No response'}")
             raise
 
         except Exception as e:
             # Handle any other unexpected errors
-            print(f"An unexpected error occurred: {e}")
+            logger.error(f"An unexpected error occurred: {e}")
             raise
@@ -0,0 +1,83 @@
+import json
+import re
+
+# Matches the single-term queries built by the silver zone, e.g. data.ID:"EPSG:4326" or data.FieldName:"Field_1"
+QUERY_PATTERN = re.compile(r'^data\.(\w+):"(.*)"$')
+
+# Rough metres per degree, used to turn projected coordinates into plausible WGS84 coordinates
+METRES_PER_DEGREE = 111320.0
+
+
+class OSDURecordStore:
+    """
+    In-memory OSDU reference and master data answering the search and CRS conversion requests
+    made by the silver zone; shared by the in-process stub client and the mock OSDU server.
+
+    Searches support the single-term `data.<Attribute>:"<value>"` queries with `limit` and `offset`;
+    CRS conversions are deterministic stand-ins (metres scaled to degrees for projected CRS,
+    unchanged coordinates otherwise), not real transformations.
+    """
+
+    def __init__(self, crs_kind="osdu:wks:reference-data--CoordinateReferenceSystem:1.1.0",
+                 field_kind="osdu:wks:master-data--Field:1.0.0"):
+        self.crs_kind = crs_kind
+        self.field_kind = field_kind
+        self.records = []
+
+    def add_crs(self, crs_id, projected=False, name=None):
+        """
+        Add a CoordinateReferenceSystem record found by `data.ID:"<crs_id>"`.
+        """
+        reference = json.dumps({"type": "EBC" if projected else "LBC", "name": name or crs_id, "projected": projected})
+        self.records.append({
+            "kind": self.crs_kind,
+            "id": f"osdu:reference-data--CoordinateReferenceSystem:{crs_id}",
+            "data": {"ID": crs_id, "Name": name or crs_id, "PersistableReference": reference},
+        })
+
+    def add_field(self, field_name):
+        """
+        Add a Field record found by `data.FieldName:"<field_name>"`.
+        """
+        self.records.append({
+            "kind": self.field_kind,
+            "id": f"osdu:master-data--Field:{field_name}",
+            "data": {"FieldName": field_name},
+        })
+
+    def load_seed(self, seed):
+        """
+        Add the records of a seed document, as in osdu/mock_osdu_seed.json:
+        {"crs": [{"id": ..., "projected": ..., "name": ...}], "fields": [<field name>, ...], "records": [<raw record>, ...]}
+        """
+        for crs in seed.get("crs", []):
+            self.add_crs(crs["id"], crs.get("projected", False), crs.get("name"))
+        for field_name in seed.get("fields", []):
+            self.add_field(field_name)
+        self.records.extend(seed.get("records", []))
+
+    def search(self, payload):
+        """
+        Answer a search payload as the search API does, with `results` and `totalCount`.
+        """
+        kind_prefix = payload.get("kind", "*").split("*")[0]
+        match = QUERY_PATTERN.match(payload.get("query", ""))
+        results = [
+            record for record in self.records
+            if record["kind"].startswith(kind_prefix)
+            and (match is None or str(record["data"].get(match.group(1))) == match.group(2))
+        ]
+        offset = payload.get("offset", 0)
+        limit = payload.get("limit", 10)
+        return {"results": results[offset:offset + limit], "totalCount": len(results)}
+
+    def convert(self, from_crs, to_crs, points):
+        """
+        Answer a CRS conversion request as the CRS converter API does, with `points`.
+        """
+        projected = json.loads(from_crs).get("projected", False)
+        scale = METRES_PER_DEGREE if projected else 1.0
+        return {
+            "points": [{"x": point["x"] / scale, "y": point["y"] / scale, "z": point.get("z", 0)} for point in points],
+            "operationsApplied": [f"stub conversion to {json.loads(to_crs).get('name', to_crs)}"],
+        }
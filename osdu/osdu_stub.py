@@ -0,0 +1,28 @@
+import time
+
+from utils.pipeline_metrics import pipeline_metrics
+
+
+class OSDUStubClient:
+    """
+    Drop-in replacement for OSDUClient answering from an OSDURecordStore without network access,
+    with an optional fixed latency per request. Used by the benchmarks.
+    """
+
+    def __init__(self, store, latency_seconds=0.0):
+        self.store = store
+        self.latency_seconds = latency_seconds
+
+    def _wait(self):
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+    @pipeline_metrics.timed("osdu_search")
+    def search(self, payload):
+        self._wait()
+        return self.store.search(payload)
+
+    @pipeline_metrics.timed("crs_convert")
+    def crs_converter(self, from_crs, to_crs, points):
+        self._wait()
+        return self.store.convert(from_crs, to_crs, points)
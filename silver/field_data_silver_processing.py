@@ -1,48 +1,68 @@
+import hashlib
 import json
-import os
 import pandas as pd
 
 from config.logger_config import logger
 from config.project_config import PROJECT_CONFIG
-from models.field_bronze_data import fetch_bronze_results_by_file_id
-from models.field_silver_data import log_field_silver_table, fetch_silver_results_by_file_id
-from models.validation_errors import log_errors_to_db
+from models.field_bronze_data import fetch_bronze_data_for_silver
+from models.field_silver_data import log_field_silver_table, build_silver_results_query, fetch_silver_rows_by_group_hash
+from models.result_reuse import get_reuse_mode
+from models.validation_errors import log_errors_to_db, fetch_validation_errors
 from osdu.osdu_client import OSDUClient
+from utils.export_queue import ExportJob, submit_export
 
-client = OSDUClient()
+# The OSDU client is created on first use, so importing this module does not load the OSDU configuration
+client = None
 
 
-def log_and_save_results(df, file_id, file_name, validation_errors):
+def get_client():
     """
-    Log validation results, store them in the silver database, and save them as a CSV file.
+    Returns the shared OSDU client, creating it on first use.
+    """
+    global client
+    if client is None:
+        client = OSDUClient()
+    return client
+
+
+# Bronze columns read by process_single_field regardless of the configured column list
+SILVER_INPUT_COLUMNS = ["FieldName", "ParentFieldName", "X", "Y", "CRS"]
+
+
+def log_and_save_results(df, file_id, file_name, validation_errors, unit_of_work=None):
+    """
+    Log validation results and store them in the silver database.
 
     Parameters:
     - df (DataFrame): The processed data to be logged.
     - file_id (int): The unique file identifier.
     - file_name (str): The name of the input file.
     - validation_errors (list): List of validation errors encountered.
+    - unit_of_work (UnitOfWork, optional): Defers the writes to the transaction of the processing step.
 
     Returns:
     - None
     """
     try:
         # Log validation results in the silver table
-        log_field_silver_table(df)
-        log_errors_to_db(validation_errors, file_id, "SILVER")
+        log_field_silver_table(df, unit_of_work)
+        log_errors_to_db(validation_errors, file_id, "SILVER", unit_of_work)
+    except Exception as e:
+        logger.error(f"Error logging and saving results: {e}")
 
-        # Fetch results from the silver table
-        result_df = fetch_silver_results_by_file_id(file_id)
 
-        # Ensure output directory exists
-        output_dir = PROJECT_CONFIG.get("OUTPUT_DIRECTORY", "output")
-        os.makedirs(output_dir, exist_ok=True)
+def export_silver_results(file_id, file_name):
+    """
+    Queue the export of the silver results of a file.
 
-        # Save the processed data to a CSV file
-        result_file = f"{output_dir}/{file_name}_silver_data_results.csv"
-        result_df.to_csv(result_file, index=False)
-        logger.info(f"Results saved to '{result_file}'.")
-    except Exception as e:
-        logger.error(f"Error logging and saving results: {e}")
+    Parameters:
+    - file_id (int): The unique file identifier.
+    - file_name (str): The name of the input file.
+
+    Returns:
+    - None
+    """
+    submit_export(ExportJob(file_id, file_name, "SILVER", build_silver_results_query, "silver_data_results"))
 
 
 def get_geojson(coord_list):
@@ -57,23 +77,28 @@ def get_geojson(coord_list):
         ]
     })
 
-def fetch_and_filter_bronze_data(file_id):
+def fetch_and_filter_bronze_data(file_id, column_list):
     """
     Fetch field data from the bronze table and filter out rows based on severity.
 
+    Filtering and column projection happen inside the database query.
+
     Parameters:
     - file_id (int): The unique file identifier.
+    - column_list (list): Data columns copied into the silver records.
 
     Returns:
-    - DataFrame: The filtered data.
+    - DataFrame: The filtered, Arrow-backed data.
     """
-    df = fetch_bronze_results_by_file_id(file_id)
-
     # Apply filtering based on configuration
     if PROJECT_CONFIG["IGNORE_BRONZE_WARNING"]:
-        df = df[df['error_severity'].fillna('') != 'ERROR']
+        excluded_severities = ['ERROR']
     else:
-        df = df[~df['error_severity'].fillna('').isin(['ERROR', 'WARNING'])]
+        excluded_severities = ['ERROR', 'WARNING']
+
+    # Columns used to build the silver records, followed by those copied as-is
+    columns = list(dict.fromkeys(SILVER_INPUT_COLUMNS + list(column_list or [])))
+    df = fetch_bronze_data_for_silver(file_id, columns, excluded_severities)
 
     # Log if no data is available after filtering
     if df.empty:
@@ -82,6 +107,84 @@ def fetch_and_filter_bronze_data(file_id):
     return df
 
 
+def _normalize_column(column):
+    """
+    Render a column as stripped text, with numbers in a canonical float form and nulls as ''.
+    """
+    if pd.api.types.is_numeric_dtype(column.dtype):
+        values = column.astype("float64")
+        return values.map(repr).where(values.notna(), "")
+    values = column.astype(object)
+    return values.where(values.notna(), "").astype(str).str.strip()
+
+
+def compute_field_group_hashes(df):
+    """
+    Hash the normalized attributes and coordinates of every FieldName group.
+
+    Parameters:
+    - df (DataFrame): Silver input rows, as returned by fetch_and_filter_bronze_data.
+
+    Returns:
+    - dict: FieldName mapped to the SHA-256 hex digest of its rows, in row order.
+    """
+    columns = sorted(df.columns)
+    normalized = [_normalize_column(df[column]) for column in columns]
+    row_text = normalized[0].str.cat(normalized[1:], sep="\x1f")
+    group_text = row_text.groupby(df["FieldName"].astype(object), sort=False).agg("\x1e".join)
+    header = "\x1f".join(columns)
+    return {
+        field_name: hashlib.sha256(f"{header}\x1d{text}".encode("utf-8")).hexdigest()
+        for field_name, text in group_text.items()
+    }
+
+
+def find_reusable_field_groups(file_id, group_hashes):
+    """
+    Look up stored silver records whose group hash matches a FieldName group of this file.
+
+    Parameters:
+    - file_id (int): The unique file identifier.
+    - group_hashes (dict): FieldName mapped to its group hash.
+
+    Returns:
+    - DataFrame: Matching silver records, or an empty DataFrame when results are not reused.
+    """
+    if get_reuse_mode() != 'INCREMENTAL' or not group_hashes:
+        return pd.DataFrame()
+
+    reusable_df = fetch_silver_rows_by_group_hash(list(group_hashes.values()), file_id)
+    logger.info(f"{len(reusable_df)} of {len(group_hashes)} field groups match stored silver results.")
+    return reusable_df
+
+
+def reuse_silver_rows(reusable_df, row_index_map, file_id, validation_errors):
+    """
+    Re-key stored silver records and their silver validation errors to this file.
+
+    Parameters:
+    - reusable_df (DataFrame): Stored silver records, as returned by find_reusable_field_groups.
+    - row_index_map (dict): FieldName mapped to its row_index in this file.
+    - file_id (int): The unique file identifier.
+    - validation_errors (list): List the reused validation errors are appended to.
+
+    Returns:
+    - DataFrame: The reused silver records.
+    """
+    reused_df = reusable_df.astype(object)
+    reused_df = reused_df[reused_df["FieldName"].isin(list(row_index_map))].reset_index(drop=True)
+
+    for source_file_id, rows in reused_df.groupby("file_id"):
+        new_row_indexes = {int(row_index): row_index_map[field_name] for row_index, field_name in zip(rows["row_index"], rows["FieldName"])}
+        for error in fetch_validation_errors(int(source_file_id), "SILVER", list(new_row_indexes)):
+            error["row_index"] = str(new_row_indexes[int(error["row_index"])])
+            validation_errors.append(error)
+
+    reused_df["row_index"] = reused_df["FieldName"].map(lambda field_name: str(row_index_map[field_name]))
+    reused_df["file_id"] = file_id
+    return reused_df
+
+
 def get_crs_reference(crs_value: str, row_index: int, validation_errors: list):
     """
     Retrieve the CRS persistable reference from the OSDU client.
@@ -113,7 +216,7 @@ def get_crs_reference(crs_value: str, row_index: int, validation_errors: list):
     }
 
     try:
-        result = client.search(payload)
+        result = get_client().search(payload)
         if not result.get('results'):
             # No results found
             validation_errors.append({
@@ -136,13 +239,13 @@ def get_crs_reference(crs_value: str, row_index: int, validation_errors: list):
         }
 
     except Exception as e:
-        # Catch and record any unexpected exceptions from the client search
+        # Catch and record any unexpected exceptions from the client search; validation_errors has no message column
+        logger.error(f"CRS lookup of '{crs_value}' failed: {e}", extra={"sample_key": "crs_lookup_failed"})
         validation_errors.append({
             "row_index": str(row_index),
             "field_name": "CRS",
             "error_type": "row_validation",
-            "error_code": "crs_not_found",
-            "error_message": str(e)
+            "error_code": "crs_not_found"
         })
         return None
 
@@ -164,7 +267,7 @@ def convert_coordinates(persistable_reference, coordinates, index, validation_er
         return None
 
     try:
-        return client.crs_converter(persistable_reference, PROJECT_CONFIG["TO_CRS"], coordinates)['points']
+        return get_client().crs_converter(persistable_reference, PROJECT_CONFIG["TO_CRS"], coordinates)['points']
     except Exception as e:
         validation_errors.append({
             "row_index": str(index),
@@ -214,9 +317,9 @@ def get_parent_field_id(parent_field_name, index, validation_errors):
         return None
 
     try:
-        result = client.search(get_search_field_query(parent_field_name))
+        result = get_client().search(get_search_field_query(parent_field_name))
         if len(result['results']) > 1:
-            logger.warning(f"Multiple parent fields found for {parent_field_name}. Using the first match.")
+            logger.warning(f"Multiple parent fields found for {parent_field_name}. Using the first match.", extra={"sample_key": "multiple_parent_fields"})
         return result['results'][0]['id']
     except Exception as e:
         validation_errors.append({
@@ -241,13 +344,13 @@ def check_field_name_exists(field_name, index, validation_errors):
     - None
     """
     try:
-        result = client.search(get_search_field_query(field_name))  # Fetch only 1 result for efficiency
+        result = get_client().search(get_search_field_query(field_name))  # Fetch only 1 result for efficiency
 
         # Ensure results exist and contain at least one entry
         if result.get('results') and len(result['results']) > 0:
             field_id = result['results'][0].get('id')  # Use `.get()` to avoid KeyError
             if field_id:
-                logger.error(f"Field '{field_name}' already exists in OSDU with ID '{field_id}'.")
+                logger.error(f"Field '{field_name}' already exists in OSDU with ID '{field_id}'.", extra={"sample_key": "field_already_exists"})
 
                 # Append to validation errors
                 validation_errors.append({
@@ -257,11 +360,11 @@ def check_field_name_exists(field_name, index, validation_errors):
                     "error_code": "field_already_exists"
                 })
     except IndexError:
-        logger.warning(f"No results found while checking field '{field_name}' in OSDU.")
+        logger.warning(f"No results found while checking field '{field_name}' in OSDU.", extra={"sample_key": "field_check_no_results"})
     except KeyError as e:
-        logger.error(f"Unexpected response structure while checking field '{field_name}': {e}")
+        logger.error(f"Unexpected response structure while checking field '{field_name}': {e}", extra={"sample_key": "field_check_failed"})
     except Exception as e:
-        logger.error(f"Error checking field existence for '{field_name}': {e}")
+        logger.error(f"Error checking field existence for '{field_name}': {e}", extra={"sample_key": "field_check_failed"})
 
 
 def process_single_field(field_name, group, index, file_id, column_list, validation_errors):
@@ -304,8 +407,7 @@ def process_single_field(field_name, group, index, file_id, column_list, validat
     wgs84_polygon = None
     if wgs84_coordinates:
         wgs84_polygon = get_geojson(wgs84_coordinates)
-
-        print(json.dumps(get_geojson(wgs84_coordinates), indent=2))
+        logger.debug(f"WGS84 polygon of field '{field_name}': {wgs84_polygon}", extra={"sample_key": "wgs84_polygon"})
     data_entry = {
         "row_index": str(index),
         "file_id": file_id,
@@ -323,7 +425,7 @@ def process_single_field(field_name, group, index, file_id, column_list, validat
     return data_entry
 
 
-def process_field_data_for_silver_zone(file_id, file_name, column_list):
+def process_field_data_for_silver_zone(file_id, file_name, column_list, unit_of_work=None):
     """
     Processes field data from bronze and transforms it for the silver zone.
 
@@ -331,20 +433,38 @@ def process_field_data_for_silver_zone(file_id, file_name, column_list):
     - file_id (int): File ID for processing.
     - file_name (str): Name of the input file.
     - column_list (list): List of columns to be included.
+    - unit_of_work (UnitOfWork, optional): Unit of work the silver writes are deferred to.
 
     Returns:
     - list: Processed field data.
     """
     validation_errors = []
-    df = fetch_and_filter_bronze_data(file_id)
+    df = fetch_and_filter_bronze_data(file_id, column_list)
 
     if df.empty:
         return []
 
-    processed_data = [
-        process_single_field(field_name, group, index, file_id, column_list, validation_errors)
-        for index, (field_name, group) in enumerate(df.groupby('FieldName', as_index=False), start=0)
-    ]
-
-    log_and_save_results(pd.DataFrame(processed_data), file_id, file_name, validation_errors)
+    # FieldName groups whose contents match stored silver results skip the OSDU lookups
+    group_hashes = compute_field_group_hashes(df)
+    reusable_df = find_reusable_field_groups(file_id, group_hashes)
+    reusable_groups = set(reusable_df["FieldName"]) if not reusable_df.empty else set()
+
+    processed_data = []
+    reused_row_indexes = {}
+    for index, (field_name, group) in enumerate(df.groupby('FieldName', as_index=False), start=0):
+        if field_name in reusable_groups:
+            reused_row_indexes[field_name] = index
+            continue
+        data_entry = process_single_field(field_name, group, index, file_id, column_list, validation_errors)
+        data_entry["group_hash"] = group_hashes.get(field_name)
+        processed_data.append(data_entry)
+
+    silver_df = pd.DataFrame(processed_data)
+    if reused_row_indexes:
+        logger.info(f"Reusing stored silver results of {len(reused_row_indexes)} unchanged field groups.")
+        reused_df = reuse_silver_rows(reusable_df, reused_row_indexes, file_id, validation_errors)
+        silver_df = pd.concat([silver_df, reused_df], ignore_index=True)
+        silver_df = silver_df.sort_values("row_index", key=lambda column: column.astype(int)).reset_index(drop=True)
+
+    log_and_save_results(silver_df, file_id, file_name, validation_errors, unit_of_work)
     return processed_data
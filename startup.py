@@ -4,16 +4,18 @@ import os
 from config.logger_config import logger
 from sqlalchemy import text
 
-from models.sql_script_store import SQLScriptStore
 from utils.db_util import get_session, engine
+from utils.schema_migrations import apply_schema_migrations
 
 # Path to the JSON schema file
 JSON_FILE_PATH = "config/schema.json"
 
 def initialize_database_from_json(json_file_path=JSON_FILE_PATH):
     """
-    Executes all SQL statements from a JSON schema file to initialize the database.
-    Stores table definitions into the sql_script_store table, including column lists.
+    Applies the SQL statements of a JSON schema file that have not been applied to the database yet.
+    Each entry is a versioned migration; applied versions and their hashes are recorded in the
+    schema_migrations table, so a warm restart only reads that table.
+    Table definitions are stored in the sql_script_store table, including column lists.
 
     :param json_file_path: Path to the JSON file containing schema definitions.
     """
@@ -32,47 +34,19 @@ def initialize_database_from_json(json_file_path=JSON_FILE_PATH):
             raise ValueError(f"Invalid JSON entry: {entry}. Required keys: {required_keys}")
 
     with get_session() as session:
-        for entry in schema_data:
-            query = entry["query"]
-            try:
-                # Execute the table creation query
-                logger.info(f"Executing statement for table: {entry['table_name']} in zone: {entry['zone']}")
-                session.execute(text(query))
-                session.commit()
-
-                if "data_columns" in entry:
-                    data_columns_str = entry['data_columns']
-                else:
-                    data_columns_str = None
+        applied_versions = apply_schema_migrations(session, schema_data)
 
-                # Insert the table definition into the sql_script_store table
-                sql_script_entry = SQLScriptStore(
-                    zone=entry["zone"],
-                    query=query,
-                    query_type=entry["query_type"],
-                    table_name=entry["table_name"],
-                    data_columns=data_columns_str
-                )
-                session.add(sql_script_entry)
-                logger.info(f"Stored table definition for {entry['table_name']} with columns: {data_columns_str}.")
+        if applied_versions:
+            # Display tables in the database
+            try:
+                tables = session.execute(text("SHOW TABLES")).fetchall()
+                logger.info("Tables in the database:")
+                for table in tables:
+                    logger.info(f"- {table[0]}")
             except Exception as e:
-                logger.error(f"Error executing statement for table {entry['table_name']}:{query}Error: {e}")
-        session.commit()
-
-        # Display tables in the database
-        try:
-            tables = session.execute(text("SHOW TABLES")).fetchall()
-            logger.info("Tables in the database:")
-            for table in tables:
-                logger.info(f"- {table[0]}")
-        except Exception as e:
-            logger.error("Could not retrieve tables from the database:", e)
+                logger.error(f"Could not retrieve tables from the database: {e}")
 
     logger.info("Database schema initialization complete.")
-    with get_session() as connection:
-        result = connection.execute(text("PRAGMA table_info('sql_script_store')"))
-        for row in result.fetchall():
-            logger.debug(row)
 
 if __name__ == "__main__":
     """
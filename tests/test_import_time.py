@@ -0,0 +1,25 @@
+"""
+Startup budget of the application entry module, see benchmarks/import_time_benchmark.py.
+
+The budget can be raised on slow machines with the IMPORT_TIME_BUDGET_MS environment variable.
+"""
+import os
+import statistics
+import unittest
+
+from benchmarks.import_time_benchmark import DEFAULT_BUDGET_MS, loaded_deferred_modules, measure
+
+
+class ImportTimeTest(unittest.TestCase):
+
+    def test_deferred_libraries_are_not_loaded(self):
+        self.assertEqual(loaded_deferred_modules("app"), [])
+
+    def test_import_time_within_budget(self):
+        budget_ms = float(os.environ.get("IMPORT_TIME_BUDGET_MS", DEFAULT_BUDGET_MS))
+        totals, _ = measure("app", runs=3)
+        self.assertLessEqual(statistics.median(totals), budget_ms)
+
+
+if __name__ == "__main__":
+    unittest.main()
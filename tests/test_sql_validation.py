@@ -0,0 +1,151 @@
+"""
+The SQL validation mode (bronze.field_sql_validator) must report the same errors as the pandas
+validation (bronze.field_data_validator): every file is validated both ways, under two file IDs,
+and the validation errors, error groups and per-row error summaries of the two IDs are compared.
+
+The files are the sample data and synthetic files with injected rule and schema errors
+(benchmarks.field_dataset_generator), validated against a scratch database in a temporary directory.
+"""
+import csv
+import glob
+import os
+import tempfile
+import unittest
+from collections import Counter
+from types import SimpleNamespace
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_PATH = os.path.join(REPO_ROOT, "config", "schema.json")
+SAMPLE_FILES = sorted(glob.glob(os.path.join(REPO_ROOT, "sample-data", "*.csv")))
+
+
+def _inject_schema_errors(rows):
+    # Failures reported by Pandera rather than the rule catalog: a missing FieldName (not_nullable)
+    # and coordinates that cannot be cast (coerce_dtype / dtype), next to the injected rule errors
+    rows[1]["FieldName"] = ""
+    rows[7]["X"] = "abc"
+    rows[12]["Y"] = "12,5"
+    rows[16]["DiscoveryDate"] = "not a date"
+    return rows
+
+
+def _day_first_dates(rows):
+    # Dates written as dd/mm/YYYY, so the date format is inferred from the first date
+    for row in rows:
+        year, month, day = row["DiscoveryDate"].split("-")
+        row["DiscoveryDate"] = f"{day}/{month}/{year}"
+    return rows
+
+
+# Synthetic files: (file name, generator arguments, function editing the generated rows)
+GENERATED_FILES = [
+    ("generated_errors.csv", {"fields": 200, "vertices": 8, "error_rate": 0.5, "seed": 7}, None),
+    ("generated_bounded.csv", {"fields": 40, "vertices": 60, "error_rate": 1.0, "seed": 11}, None),
+    ("generated_schema_errors.csv", {"fields": 50, "vertices": 4, "error_rate": 0.5, "seed": 3}, _inject_schema_errors),
+    ("generated_day_first.csv", {"fields": 50, "vertices": 4, "error_rate": 0.5, "seed": 5}, _day_first_dates),
+]
+
+# Small bounds, so the generated files also exercise the bounding of the error rows
+ERROR_OUTPUT = {"MAX_ERRORS_PER_GROUP": 5, "MAX_ERRORS_PER_RULE": 50}
+
+ERRORS_SQL = """
+    SELECT row_index, field_name, error_type, error_code FROM validation_errors
+    WHERE file_id = :file_id AND zone = 'BRONZE'
+"""
+GROUPS_SQL = """
+    SELECT error_type, error_code, field_name, error_count, logged_count FROM validation_error_groups
+    WHERE file_id = :file_id AND zone = 'BRONZE'
+"""
+SUMMARY_SQL = """
+    SELECT row_index, error_message, error_severity, error_count FROM validation_error_summary
+    WHERE file_id = :file_id AND zone = 'BRONZE'
+"""
+
+
+class SqlValidationEquivalenceTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # The database, logs and exports use paths relative to the working directory
+        cls._cwd = os.getcwd()
+        cls._scratch = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        os.chdir(cls._scratch.name)
+        os.environ.setdefault("DISABLE_PANDERA_IMPORT_WARNING", "True")
+
+        from config.project_config import PROJECT_CONFIG
+        from startup import initialize_database_from_json
+
+        PROJECT_CONFIG["ERROR_OUTPUT"] = dict(PROJECT_CONFIG.get("ERROR_OUTPUT", {}), **ERROR_OUTPUT)
+        initialize_database_from_json(SCHEMA_PATH)
+
+        from benchmarks.field_dataset_generator import COLUMNS, generate_field_rows
+
+        cls.generated_files = []
+        for file_name, arguments, edit in GENERATED_FILES:
+            rows, _ = generate_field_rows(**arguments)
+            path = os.path.join(cls._scratch.name, file_name)
+            with open(path, "w", newline="") as file:
+                writer = csv.DictWriter(file, COLUMNS)
+                writer.writeheader()
+                writer.writerows(edit(rows) if edit else rows)
+            cls.generated_files.append(path)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.chdir(cls._cwd)
+        cls._scratch.cleanup()
+
+    def validate_both_ways(self, path):
+        """
+        Validate a file with the pandas and the SQL validation.
+
+        :return: Tuple of the file IDs of the pandas and the SQL validation.
+        """
+        import pandas as pd
+        from file_processor.file_processor_registry import FileProcessorRegistry
+        from models.files import insert_data
+        from utils.db_writer import db_writer
+
+        file_ids = []
+        for mode in ("pandas", "sql"):
+            file_id = db_writer.run(insert_data, path, "FIELD", "", f"{mode}-{path}")
+            result = SimpleNamespace(id=file_id, filename=os.path.basename(path), filepath=path)
+            processor = FileProcessorRegistry.get_processor(file_id, result.filename, "FIELD")
+            if mode == "pandas":
+                # Read as process_claimed_file reads it
+                df = processor.compact_dataframe(pd.read_csv(path, **processor.csv_read_options()))
+                processor.validate(df, result)
+            else:
+                processor.validate_in_database(result)
+            file_ids.append(file_id)
+        return tuple(file_ids)
+
+    def fetch_rows(self, query, file_id):
+        from utils.db_util import get_read_session, text
+
+        with get_read_session() as session:
+            return Counter(tuple(row) for row in session.execute(text(query), {"file_id": file_id}).fetchall())
+
+    def assert_same_results(self, path):
+        pandas_id, sql_id = self.validate_both_ways(path)
+        pandas_errors = self.fetch_rows(ERRORS_SQL, pandas_id)
+        self.assertEqual(pandas_errors, self.fetch_rows(ERRORS_SQL, sql_id), "validation_errors differ")
+        self.assertEqual(self.fetch_rows(GROUPS_SQL, pandas_id), self.fetch_rows(GROUPS_SQL, sql_id), "validation_error_groups differ")
+        self.assertEqual(self.fetch_rows(SUMMARY_SQL, pandas_id), self.fetch_rows(SUMMARY_SQL, sql_id), "validation_error_summary differs")
+        return pandas_errors
+
+    def test_sample_files(self):
+        self.assertTrue(SAMPLE_FILES)
+        for path in SAMPLE_FILES:
+            with self.subTest(file=os.path.basename(path)):
+                self.assert_same_results(path)
+
+    def test_generated_files_with_errors(self):
+        for path in self.generated_files:
+            with self.subTest(file=os.path.basename(path)):
+                errors = self.assert_same_results(path)
+                self.assertTrue(errors, "the generated file should have validation errors")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,20 +1,60 @@
 import hashlib
+import mmap
+import os
 
 from config.logger_config import logger
+from config.project_config import PROJECT_CONFIG
 
-def calculate_checksum(filepath):
+try:
+    import xxhash
+except ImportError:  # xxh3 is optional; SHA-256 is always available
+    xxhash = None
+
+# Files are hashed through 1 MiB buffers unless CHECKSUM_CHUNK_SIZE says otherwise
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Stored in files.checksum when the checksum is computed while the CSV is parsed (CHECKSUM_ON_READ)
+DEFERRED_CHECKSUM = ""
+
+
+def _new_hasher(algorithm=None):
+    """
+    Create a hash object for the given algorithm ('sha256' or 'xxh3').
+
+    :param algorithm: Algorithm name, defaults to CHECKSUM_ALGORITHM from the project configuration.
+    :return: Tuple of (hash object, prefix of the hex digest).
+    """
+    algorithm = (algorithm or PROJECT_CONFIG.get("CHECKSUM_ALGORITHM", "sha256")).lower()
+    if algorithm == "xxh3":
+        if xxhash is not None:
+            # Prefixed so xxh3 digests are never compared with SHA-256 digests
+            return xxhash.xxh3_128(), "xxh3:"
+        logger.warning("xxhash is not installed; falling back to SHA-256 checksums.")
+    elif algorithm != "sha256":
+        logger.warning(f"Unknown checksum algorithm '{algorithm}'; falling back to SHA-256 checksums.")
+    return hashlib.sha256(), ""
+
+
+def calculate_checksum(filepath, algorithm=None):
     """
-    Calculate the SHA-256 checksum of a file.
+    Calculate the checksum of a file.
+
+    Non-empty files are memory-mapped and hashed in one call, otherwise the file is read through
+    large reusable buffers.
 
     :param filepath: Path to the file.
-    :return: SHA-256 checksum as a hexadecimal string, or an error message.
+    :param algorithm: 'sha256' (default) or 'xxh3', see CHECKSUM_ALGORITHM.
+    :return: Checksum as a hexadecimal string, or an error message.
     """
     try:
-        hash_sha256 = hashlib.sha256()
+        hasher, prefix = _new_hasher(algorithm)
         with open(filepath, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        checksum = hash_sha256.hexdigest()
+            if os.fstat(f.fileno()).st_size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    hasher.update(mapped)
+            else:
+                _update_from_file(hasher, f)
+        checksum = prefix + hasher.hexdigest()
         logger.info(f"Checksum calculated successfully for file: {filepath}")
         return checksum
     except FileNotFoundError:
@@ -23,3 +63,67 @@ def calculate_checksum(filepath):
     except Exception as e:
         logger.error(f"Error calculating checksum for file {filepath}: {e}")
         return f"Error: {e}"
+
+
+def _update_from_file(hasher, f):
+    chunk_size = PROJECT_CONFIG.get("CHECKSUM_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        size = f.readinto(buffer)
+        if not size:
+            break
+        hasher.update(view[:size])
+
+
+class HashingReader:
+    """
+    Binary file wrapper hashing every byte that is read through it.
+    """
+
+    def __init__(self, f, algorithm=None):
+        self._file = f
+        self._hasher, self._prefix = _new_hasher(algorithm)
+
+    def read(self, size=-1):
+        data = self._file.read(size)
+        self._hasher.update(data)
+        return data
+
+    def readinto(self, buffer):
+        size = self._file.readinto(buffer)
+        if size:
+            self._hasher.update(memoryview(buffer)[:size])
+        return size
+
+    def __iter__(self):
+        return iter(lambda: self.read(DEFAULT_CHUNK_SIZE), b"")
+
+    def readable(self):
+        return True
+
+    def hexdigest(self):
+        """
+        Hash whatever has not been read yet and return the checksum of the whole file.
+        """
+        _update_from_file(self._hasher, self._file)
+        return self._prefix + self._hasher.hexdigest()
+
+
+def read_csv_with_checksum(filepath, algorithm=None, **kwargs):
+    """
+    Parse a CSV file and compute its checksum in the same pass, so the file is read only once.
+
+    :param filepath: Path to the CSV file.
+    :param algorithm: 'sha256' (default) or 'xxh3', see CHECKSUM_ALGORITHM.
+    :param kwargs: Extra keyword arguments for pd.read_csv.
+    :return: Tuple of (DataFrame, checksum).
+    """
+    import pandas as pd  # Loaded on first use to keep application startup light
+
+    with open(filepath, "rb") as f:
+        reader = HashingReader(f, algorithm)
+        df = pd.read_csv(reader, **kwargs)
+        checksum = reader.hexdigest()
+    logger.info(f"Checksum calculated while reading file: {filepath}")
+    return df, checksum
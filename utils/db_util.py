@@ -2,7 +2,7 @@ import os
 
 from sqlalchemy import create_engine, text, Column, String, Text, CheckConstraint, PrimaryKeyConstraint
 
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, scoped_session
 from contextlib import contextmanager
 from config.logger_config import logger
 from models.sql_script_store import SQLScriptStore
@@ -24,6 +24,47 @@ engine = create_engine(DATABASE_URL)
 # Create a configured "Session" class
 SessionLocal = sessionmaker(autobegin=True, autoflush=False, bind=engine)
 
+# Thread-local sessions for reads: each thread keeps its own connection (cursor) to the database
+ReadSession = scoped_session(SessionLocal)
+
+# Number of write transactions committed by the database writer, see mark_writes_committed
+_committed_writes = 0
+
+
+def mark_writes_committed():
+    """
+    Record that the database writer committed a transaction, so read transactions started before
+    it are not reused by nested get_read_session blocks.
+    """
+    global _committed_writes
+    _committed_writes += 1
+
+
+@contextmanager
+def get_read_session():
+    """
+    Provides the calling thread's read session.
+
+    The session and its connection are reused across calls on the same thread. Nested uses share
+    the outermost read transaction, which is ended when the outermost block exits so the next read
+    sees the latest committed data. A nested use after a commit of the database writer starts a new
+    read transaction instead, so it sees the writes the thread waited for (e.g. a unit of work
+    committed before an inline export). Writes should go through utils.db_writer.db_writer instead.
+    """
+    session = ReadSession()
+    depth = session.info.get("read_depth", 0)
+    if depth and session.info.get("read_writes") != _committed_writes:
+        session.rollback()
+    session.info["read_writes"] = _committed_writes
+    session.info["read_depth"] = depth + 1
+    try:
+        yield session
+    finally:
+        session.info["read_depth"] = depth
+        if depth == 0:
+            session.rollback()
+
+
 @contextmanager
 def get_session():
     """
@@ -40,6 +81,28 @@ def get_session():
         session.close()
 
 
+def fetch_arrow_dataframe(session, query, parameters=None):
+    """
+    Run a query on the session's underlying DuckDB connection and return an Arrow-backed DataFrame.
+
+    The result is handed over as Arrow record batches instead of being materialized row by row
+    through SQLAlchemy, so columns stay in columnar buffers (pd.ArrowDtype) end to end.
+
+    :param session: SQLAlchemy session bound to the DuckDB engine.
+    :param query: SQL text using DuckDB parameter syntax ($name).
+    :param parameters: Optional dictionary of named parameters.
+    :return: pd.DataFrame with Arrow-backed columns.
+    """
+    import pandas as pd  # Loaded on first use to keep application startup light
+
+    duckdb_connection = session.connection().connection.driver_connection
+    arrow_result = duckdb_connection.execute(query, parameters or {}).arrow()
+    # Newer DuckDB versions return a RecordBatchReader, older ones a Table
+    if hasattr(arrow_result, "read_all"):
+        arrow_result = arrow_result.read_all()
+    return arrow_result.to_pandas(types_mapper=pd.ArrowDtype)
+
+
 def get_columns_from_store(table_name):
     """
     Fetch the list of columns for a specific table from the sql_script_store table.
@@ -47,7 +110,7 @@ def get_columns_from_store(table_name):
     :param table_name: Name of the table to fetch the column list for.
     :return: List of column names or None if not found.
     """
-    with get_session() as session:
+    with get_read_session() as session:
         try:
             result = session.query(SQLScriptStore.data_columns).filter(SQLScriptStore.table_name == table_name).first()
             if result and result.data_columns:
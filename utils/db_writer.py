@@ -0,0 +1,189 @@
+import atexit
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from config.logger_config import logger
+from config.project_config import PROJECT_CONFIG
+from utils.db_util import SessionLocal, get_read_session, mark_writes_committed
+
+
+class DatabaseWriter:
+    """
+    Serializes database writes through one dedicated writer thread.
+
+    DuckDB allows a single writer per database, and concurrent write transactions from different
+    threads can conflict. Every write is therefore submitted as a job, a callable receiving the
+    writer's session, and executed on the writer thread. Jobs that are queued together are run in
+    one transaction and committed once. If the batch fails, it is rolled back and its jobs are
+    replayed one transaction each, so a failing job only affects its own caller.
+
+    Jobs must not commit or roll back the session themselves; they should raise on failure.
+    """
+
+    def __init__(self, session_factory=SessionLocal, max_batch_size=64):
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self._queue = queue.Queue()
+        self._worker = None
+        self._current_session = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Start the writer thread if it is not already running.
+        """
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._worker.start()
+                logger.info("Database writer thread started.")
+
+    def submit(self, job, *args, **kwargs):
+        """
+        Queue a write job without waiting for it.
+
+        :param job: Callable invoked as job(session, *args, **kwargs) on the writer thread.
+        :return: concurrent.futures.Future resolved with the job's return value once committed.
+        """
+        future = Future()
+        if threading.current_thread() is self._worker:
+            # Nested submission from inside a job: run it in the current transaction
+            future.set_result(job(self._current_session, *args, **kwargs))
+            return future
+
+        self.start()
+        self._queue.put((job, args, kwargs, future))
+        return future
+
+    def run(self, job, *args, **kwargs):
+        """
+        Queue a write job and block until it has been committed.
+
+        :return: The job's return value. Exceptions raised by the job are re-raised here.
+        """
+        return self.submit(job, *args, **kwargs).result()
+
+    def drain(self, timeout=30):
+        """
+        Block until the jobs queued so far have been committed, or the timeout expires.
+        Registered to run at exit, so queued writes are not cut off by interpreter shutdown.
+        """
+        if self._worker is None or not self._worker.is_alive() or threading.current_thread() is self._worker:
+            return
+        try:
+            self.submit(_noop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Database writer did not finish its queued jobs: {e}")
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._execute_batch(batch)
+            except Exception as e:
+                logger.warning(f"Batch of {len(batch)} write jobs failed ({e}); replaying jobs individually.")
+                for item in batch:
+                    self._execute_batch([item])
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _execute_batch(self, batch):
+        """
+        Run the jobs of a batch in one transaction and resolve their futures after the commit.
+        Single-job batches resolve the future with the exception instead of raising.
+        """
+        session = self.session_factory()
+        self._current_session = session
+        results = []
+        try:
+            for job, args, kwargs, future in batch:
+                results.append(job(session, *args, **kwargs))
+            session.commit()
+            mark_writes_committed()
+        except Exception as e:
+            session.rollback()
+            if len(batch) == 1:
+                batch[0][3].set_exception(e)
+                return
+            raise
+        finally:
+            self._current_session = None
+            session.close()
+
+        for (job, args, kwargs, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+def _noop(session):
+    return None
+
+
+db_writer = DatabaseWriter(max_batch_size=PROJECT_CONFIG.get("DB_WRITER_MAX_BATCH_SIZE", 64))
+atexit.register(db_writer.drain)
+
+
+class UnitOfWork:
+    """
+    Collects the writes of one processing step and commits them atomically.
+
+    Write jobs added during the step are deferred and executed as a single job on the database
+    writer thread, so they share one transaction: either all of them are committed or none.
+    Reads made during the step use the calling thread's read session (see get_read_session).
+    """
+
+    def __init__(self, writer=None):
+        self.writer = writer or db_writer
+        self._jobs = []
+
+    def add(self, job, *args, **kwargs):
+        """
+        Defer a write job, invoked as job(session, *args, **kwargs) when the unit of work commits.
+        """
+        self._jobs.append((job, args, kwargs))
+
+    def commit(self):
+        """
+        Run every deferred job in one writer transaction and block until it is committed.
+        """
+        jobs, self._jobs = self._jobs, []
+        if jobs:
+            self.writer.run(_run_jobs, jobs)
+
+    def discard(self):
+        """
+        Drop the deferred jobs without writing them.
+        """
+        self._jobs = []
+
+
+def _run_jobs(session, jobs):
+    for job, args, kwargs in jobs:
+        job(session, *args, **kwargs)
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Provides a UnitOfWork that commits on normal exit and discards its writes on error.
+    The whole block also shares the calling thread's read session.
+    """
+    uow = UnitOfWork()
+    with get_read_session():
+        try:
+            yield uow
+        except Exception:
+            uow.discard()
+            raise
+    uow.commit()
@@ -0,0 +1,120 @@
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from config.logger_config import logger
+from config.project_config import PROJECT_CONFIG
+from models.files import update_export_status
+from utils.db_util import get_read_session
+from utils.db_writer import db_writer
+from utils.pipeline_metrics import pipeline_metrics
+from utils.result_exporter import export_results
+
+# query_builder(session, file_id) returns the SQLAlchemy results query to export
+ExportJob = namedtuple("ExportJob", ["file_id", "file_name", "zone", "query_builder", "result_suffix"])
+
+
+class ResultExportQueue:
+    """
+    Bounded queue of result exports drained by a background writer thread.
+
+    Producers block in submit() while the queue is full, so report I/O applies backpressure
+    instead of piling up unbounded work. Failed exports are retried with a linear backoff and the
+    outcome is recorded in the file's per-zone export status.
+    """
+
+    def __init__(self, max_size=16, max_retries=3, retry_delay=5):
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._queue = queue.Queue(maxsize=max_size)
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Start the writer thread if it is not already running.
+        """
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="result-export-writer", daemon=True)
+                self._worker.start()
+                logger.info("Result export writer thread started.")
+
+    def submit(self, job):
+        """
+        Queue an export job, blocking while the queue is full.
+
+        :param job: ExportJob describing the results to export.
+        """
+        db_writer.run(update_export_status, job.zone, 'PENDING', job.file_id)
+
+        self.start()
+        if self._queue.full():
+            logger.warning(f"Export queue is full; waiting to queue {job.zone} results of file ID {job.file_id}.")
+        self._queue.put(job)
+        logger.info(f"Queued {job.zone} results export for file ID {job.file_id}.")
+
+    def join(self):
+        """
+        Block until every queued export has been processed.
+        """
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                export_job(job, self.max_retries, self.retry_delay)
+            except Exception as e:
+                logger.error(f"Unexpected error in result export writer: {e}")
+            finally:
+                self._queue.task_done()
+
+
+def export_job(job, max_retries=1, retry_delay=0):
+    """
+    Export the results of a job, retrying on failure and recording the export status.
+
+    :param job: ExportJob describing the results to export.
+    :param max_retries: Number of attempts before the export is marked FAILED.
+    :param retry_delay: Base delay in seconds between attempts, multiplied by the attempt number.
+    :return: True if the export succeeded, False otherwise.
+    """
+    for attempt in range(1, max_retries + 1):
+        try:
+            db_writer.run(update_export_status, job.zone, 'EXPORTING', job.file_id)
+            with get_read_session() as session, pipeline_metrics.stage("export", file_id=job.file_id, zone=job.zone):
+                export_results(session, job.query_builder(session, job.file_id), job.zone, job.file_name, job.result_suffix)
+            db_writer.run(update_export_status, job.zone, 'EXPORTED', job.file_id)
+            return True
+        except Exception as e:
+            logger.error(f"Attempt {attempt}/{max_retries} to export {job.zone} results of file ID {job.file_id} failed: {e}")
+        finally:
+            pipeline_metrics.flush(job.file_id)
+
+        if attempt < max_retries:
+            time.sleep(retry_delay * attempt)
+
+    db_writer.run(update_export_status, job.zone, 'FAILED', job.file_id)
+    return False
+
+
+export_queue = ResultExportQueue(
+    max_size=PROJECT_CONFIG.get("EXPORT_QUEUE_SIZE", 16),
+    max_retries=PROJECT_CONFIG.get("EXPORT_MAX_RETRIES", 3),
+    retry_delay=PROJECT_CONFIG.get("EXPORT_RETRY_DELAY_SECONDS", 5),
+)
+
+
+def submit_export(job):
+    """
+    Export results in the background when EXPORT_ASYNC is enabled, otherwise inline.
+
+    :param job: ExportJob describing the results to export.
+    """
+    if PROJECT_CONFIG.get("EXPORT_ASYNC", True):
+        export_queue.submit(job)
+    else:
+        db_writer.run(update_export_status, job.zone, 'PENDING', job.file_id)
+        export_job(job, export_queue.max_retries, export_queue.retry_delay)
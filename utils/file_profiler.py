@@ -0,0 +1,287 @@
+"""
+Opt-in profiling of file processing steps, toggled at runtime.
+
+A processing step is profiled when PROFILING["ENABLED"] is set and the file name matches
+PROFILING["FILE_PATTERN"], or when the control file (PROFILING["CONTROL_FILE"]) asks for it.
+The control file is re-read whenever it changes, so profiling can be switched on for the next
+N files or for files matching a pattern without restarting:
+
+    {"files": 5, "pattern": "*.csv", "profiler": "cprofile", "memory": true}
+
+Once a file is selected, all its steps (bronze and silver) are profiled. Each profiled step
+stores a report with the duration, top functions, peak traced memory and top allocations in
+files.profile_report, and the raw profile under PROFILING["OUTPUT_DIRECTORY"].
+
+Usage (from the repository root):
+    python -m utils.file_profiler enable --files 5 --pattern "*.csv"
+    python -m utils.file_profiler disable
+"""
+import argparse
+import cProfile
+import fnmatch
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+from config.logger_config import logger
+from config.project_config import PROJECT_CONFIG
+
+# PROFILING settings, overridden by PROJECT_CONFIG["PROFILING"]:
+# - ENABLED:          profile every file whose name matches FILE_PATTERN.
+# - FILE_PATTERN:     glob matched against the file name.
+# - CONTROL_FILE:     JSON file switching profiling on at runtime, see the module docstring.
+# - PROFILER:         "cprofile" (deterministic) or "pyinstrument" (sampling, requires the pyinstrument package).
+# - MEMORY:           trace allocations with tracemalloc to report the peak memory of the step.
+# - TOP_FUNCTIONS:    number of functions (by cumulative time) kept in the report.
+# - TOP_ALLOCATIONS:  number of allocation sites kept in the report.
+# - OUTPUT_DIRECTORY: directory of the raw profiles (.prof for cProfile, .html for pyinstrument).
+DEFAULT_PROFILING_CONFIG = {
+    "ENABLED": False,
+    "FILE_PATTERN": "*",
+    "CONTROL_FILE": "output/profiles/profiling_control.json",
+    "PROFILER": "cprofile",
+    "MEMORY": True,
+    "TOP_FUNCTIONS": 25,
+    "TOP_ALLOCATIONS": 10,
+    "OUTPUT_DIRECTORY": "output/profiles",
+}
+
+
+def get_profiling_config():
+    """
+    Returns the profiling settings: the defaults updated with PROJECT_CONFIG["PROFILING"].
+    """
+    config = dict(DEFAULT_PROFILING_CONFIG)
+    config.update(PROJECT_CONFIG.get("PROFILING", {}))
+    return config
+
+
+class _CProfileRunner:
+    name = "cprofile"
+    extension = "prof"
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+
+    def summary(self, top):
+        stream = io.StringIO()
+        pstats.Stats(self._profile, stream=stream).sort_stats("cumulative").print_stats(top)
+        return stream.getvalue()
+
+    def save(self, path):
+        self._profile.dump_stats(path)
+
+
+class _PyinstrumentRunner:
+    name = "pyinstrument"
+    extension = "html"
+
+    def __init__(self):
+        from pyinstrument import Profiler
+        self._profiler = Profiler()
+
+    def start(self):
+        self._profiler.start()
+
+    def stop(self):
+        self._profiler.stop()
+
+    def summary(self, top):
+        return self._profiler.output_text(unicode=False, color=False)
+
+    def save(self, path):
+        with open(path, "w") as file:
+            file.write(self._profiler.output_html())
+
+
+def _create_runner(profiler):
+    if profiler == "pyinstrument":
+        try:
+            return _PyinstrumentRunner()
+        except ImportError:
+            logger.warning("pyinstrument is not installed; falling back to cProfile.")
+    elif profiler != "cprofile":
+        logger.warning(f"Unknown profiler '{profiler}'; falling back to cProfile.")
+    return _CProfileRunner()
+
+
+class FileProfiler:
+    """
+    Decides which files are profiled and profiles their processing steps.
+
+    Only the processing thread is profiled; database writes run on the writer thread and appear
+    as waits. Memory is traced process-wide, so the peak includes the writer thread's allocations.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._control_mtime = None
+        self._control = None
+        self._remaining = None
+        self._selected = set()  # IDs of files whose remaining steps are profiled
+
+    def _refresh_control(self, path):
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            self._control_mtime, self._control = None, None
+            return
+        if mtime == self._control_mtime:
+            return
+        self._control_mtime = mtime
+        try:
+            with open(path, "r") as file:
+                self._control = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Could not read the profiling control file {path}: {e}")
+            self._control = None
+            return
+        self._remaining = self._control.get("files")
+        logger.info(f"Profiling control updated: {self._control}")
+
+    def settings_for(self, file_id, filename):
+        """
+        Returns the profiler settings to use for a step of the file, or None if it is not profiled.
+        A file selected by a file count is counted once and stays selected for its later steps.
+        """
+        config = get_profiling_config()
+        with self._lock:
+            self._refresh_control(config["CONTROL_FILE"])
+            control = self._control or {}
+            settings = {
+                "profiler": control.get("profiler", config["PROFILER"]),
+                "memory": control.get("memory", config["MEMORY"]),
+            }
+            if file_id in self._selected:
+                return settings
+            if config["ENABLED"] and fnmatch.fnmatch(filename, config["FILE_PATTERN"]):
+                return settings
+            if not self._control or not fnmatch.fnmatch(filename, control.get("pattern") or "*"):
+                return None
+            if self._remaining is not None:
+                if self._remaining <= 0:
+                    return None
+                self._remaining -= 1
+            self._selected.add(file_id)
+            return settings
+
+    @contextmanager
+    def profile_file(self, file_id, filename, zone):
+        """
+        Profile the enclosed processing step if the file is selected, then store its report.
+        """
+        settings = self.settings_for(file_id, filename)
+        if settings is None:
+            yield
+            return
+
+        config = get_profiling_config()
+        runner = _create_runner(settings["profiler"])
+        trace_memory = settings["memory"] and not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start()
+        logger.info(f"Profiling the {zone} step of file '{filename}' with {runner.name}.")
+        start = time.perf_counter()
+        runner.start()
+        try:
+            yield
+        finally:
+            runner.stop()
+            duration = time.perf_counter() - start
+            report = {
+                "profiler": runner.name,
+                "profiled_at": datetime.now().isoformat(timespec="seconds"),
+                "duration_seconds": round(duration, 3),
+                "peak_memory_bytes": None,
+            }
+            if trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                report["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                report["top_allocations"] = [
+                    str(statistic) for statistic in snapshot.statistics("lineno")[:config["TOP_ALLOCATIONS"]]
+                ]
+            report["top_functions"] = runner.summary(config["TOP_FUNCTIONS"])
+            report["profile_path"] = self._save(runner, config["OUTPUT_DIRECTORY"], file_id, zone)
+            if zone == "SILVER":
+                with self._lock:
+                    self._selected.discard(file_id)
+            self._store(file_id, zone, report)
+
+    @staticmethod
+    def _save(runner, directory, file_id, zone):
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"file_{file_id}_{zone.lower()}_{datetime.now():%Y%m%d_%H%M%S}.{runner.extension}")
+            runner.save(path)
+            return path
+        except OSError as e:
+            logger.error(f"Could not save the profile of file {file_id}: {e}")
+            return None
+
+    @staticmethod
+    def _store(file_id, zone, report):
+        from models.files import update_file_profile
+        from utils.db_writer import db_writer
+
+        logger.info(
+            f"Profiled the {zone} step of file {file_id}: {report['duration_seconds']} s, "
+            f"peak memory {report['peak_memory_bytes']} bytes, profile {report['profile_path']}"
+        )
+        db_writer.submit(update_file_profile, zone, report, file_id).add_done_callback(_log_store_error)
+
+
+def _log_store_error(future):
+    if future.exception() is not None:
+        logger.error(f"Error saving file profile: {future.exception()}")
+
+
+file_profiler = FileProfiler()
+
+
+def write_control_file(control, path=None):
+    """
+    Write (or with control=None remove) the profiling control file read by running workers.
+    """
+    path = path or get_profiling_config()["CONTROL_FILE"]
+    if control is None:
+        if os.path.exists(path):
+            os.remove(path)
+        return path
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        file.write(json.dumps(control, indent=4) + "\n")
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Switch profiling of processed files on or off at runtime.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    enable_parser = subparsers.add_parser("enable", help="Profile the next files processed by running workers.")
+    enable_parser.add_argument("--files", type=int, default=None, help="Number of files to profile; all matching files if omitted.")
+    enable_parser.add_argument("--pattern", default="*", help="Glob matched against the file name.")
+    enable_parser.add_argument("--profiler", choices=["cprofile", "pyinstrument"], default=None, help="Profiler to use.")
+    enable_parser.add_argument("--no-memory", action="store_true", help="Do not trace memory allocations.")
+    subparsers.add_parser("disable", help="Stop profiling new files.")
+    args = parser.parse_args()
+
+    if args.command == "enable":
+        control = {"files": args.files, "pattern": args.pattern, "memory": not args.no_memory}
+        if args.profiler:
+            control["profiler"] = args.profiler
+        print(f"Profiling enabled through {write_control_file(control)}: {control}")
+    else:
+        print(f"Profiling disabled, removed {write_control_file(None)}")
@@ -1,7 +1,7 @@
 from sqlalchemy import text
 
 from config.logger_config import logger
-from utils.db_util import get_session
+from utils.db_util import get_read_session
 
 # Pandera type mappings
 TYPE_MAPPING = {
@@ -27,7 +27,7 @@ def fetch_data_columns(table_name):
     :param table_name: Name of the table to fetch data_columns for.
     :return: List of column names or None if not found.
     """
-    with get_session() as connection:
+    with get_read_session() as connection:
         try:
             result = connection.execute(
                 text('SELECT "data_columns" FROM sql_script_store WHERE table_name = :table_name'),
@@ -49,7 +49,7 @@ def fetch_table_info(table_name):
     :param table_name: The name of the table to inspect.
     :return: List of column info as tuples.
     """
-    with get_session() as connection:
+    with get_read_session() as connection:
         try:
             result = connection.execute(text(f"PRAGMA table_info('{table_name}')")).fetchall()
             return result
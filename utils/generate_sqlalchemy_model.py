@@ -1,9 +1,10 @@
 from sqlalchemy import Column, Integer, Text, Float, TIMESTAMP, text
 from sqlalchemy.ext.declarative import declarative_base
 import re
+import threading
 
 from config.logger_config import logger
-from utils.db_util import get_session
+from utils.db_util import get_read_session
 
 # Initialize SQLAlchemy base class
 Base = declarative_base()
@@ -17,29 +18,51 @@ SQL_TYPE_MAP = {
     "STRING": Text,  # Default to Text for variable-length text columns
 }
 
+# CREATE statements of every table in `sql_script_store`, loaded with one query on first use
+_schema_catalog = None
+# Generated model classes by table name
+_models = {}
+_models_lock = threading.Lock()
+
+
+def load_schema_catalog():
+    """
+    Load the CREATE statements of all tables from the `sql_script_store` table into the catalog cache.
+
+    :return: Dictionary mapping table names to their CREATE TABLE statements.
+    """
+    global _schema_catalog
+    with get_read_session() as session:
+        rows = session.execute(
+            text("SELECT table_name, query FROM sql_script_store WHERE query_type = 'CREATE'")
+        ).fetchall()
+    _schema_catalog = {row[0]: row[1] for row in rows}
+    logger.info(f"Loaded schema catalog with {len(_schema_catalog)} statements.")
+    return _schema_catalog
+
+
 def get_create_schema_from_db(table_name):
     """
-    Query the `sql_script_store` table to retrieve the CREATE TABLE schema for the given table.
+    Retrieve the CREATE TABLE schema for the given table from the cached `sql_script_store` catalog.
+    The catalog is reloaded once when the table is not in it yet.
 
     :param table_name: The name of the table to get the schema for.
     :return: The CREATE TABLE SQL statement.
     """
-    with get_session() as session:
-        try:
-            result = session.execute(
-                text("SELECT query FROM sql_script_store WHERE table_name = :table_name"),
-                {"table_name": table_name}
-            ).fetchone()
-
-            if not result:
-                logger.error(f"No schema found for table: {table_name}")
-                raise ValueError(f"No schema found for table: {table_name}")
-
-            logger.info(f"Schema retrieved for table '{table_name}': {result[0]}")
-            return result[0]
-        except Exception as e:
-            logger.error(f"Error retrieving schema for table '{table_name}': {e}")
-            raise
+    try:
+        catalog = _schema_catalog
+        if catalog is None or table_name not in catalog:
+            catalog = load_schema_catalog()
+
+        if table_name not in catalog:
+            logger.error(f"No schema found for table: {table_name}")
+            raise ValueError(f"No schema found for table: {table_name}")
+
+        logger.info(f"Schema retrieved for table '{table_name}': {catalog[table_name]}")
+        return catalog[table_name]
+    except Exception as e:
+        logger.error(f"Error retrieving schema for table '{table_name}': {e}")
+        raise
 
 def parse_create_table_sql(sql):
     """
@@ -68,7 +91,14 @@ def parse_create_table_sql(sql):
         column_defs = re.split(r",(?![^\(]*\))", column_defs_raw.strip())
 
         columns = []
+        table_primary_key = []
         for column_def in column_defs:
+            # Table-level constraint, e.g. PRIMARY KEY (file_id, zone, row_index)
+            table_pk_match = re.match(r"\s*PRIMARY\s+KEY\s*\((.+)\)", column_def, re.IGNORECASE)
+            if table_pk_match:
+                table_primary_key = [name.strip() for name in table_pk_match.group(1).split(",")]
+                continue
+
             parts = column_def.strip().split()
             if len(parts) < 2:
                 logger.warning(f"Skipping malformed column definition: {column_def}")
@@ -86,6 +116,10 @@ def parse_create_table_sql(sql):
                 "primary_key": primary_key,
             })
 
+        for column in columns:
+            if column["name"] in table_primary_key:
+                column["primary_key"] = True
+
         logger.info(f"Parsed table '{table_name}' with columns: {columns}")
         return table_name, columns
     except Exception as e:
@@ -147,3 +181,29 @@ def generate_model_for_table(table_name):
         logger.error(f"Error generating model for table '{table_name}': {e}")
         raise
 
+
+def get_model(table_name):
+    """
+    Return the SQLAlchemy model class of a table, generating it on first access.
+
+    Models are cached per table, so the schema catalog is only queried until every model used by
+    the process has been generated. Failures are logged and not cached, so a later call can succeed
+    once the database has been initialized.
+
+    :param table_name: The name of the table.
+    :return: The model class, or None if it could not be generated.
+    """
+    model_class = _models.get(table_name)
+    if model_class is not None:
+        return model_class
+
+    with _models_lock:
+        model_class = _models.get(table_name)
+        if model_class is None:
+            try:
+                model_class = generate_model_for_table(table_name)
+                _models[table_name] = model_class
+                logger.info(f"Generated model class for table: {model_class.__tablename__}")
+            except Exception as e:
+                logger.error(f"Error generating model class for table '{table_name}': {e}")
+        return model_class
@@ -0,0 +1,213 @@
+import functools
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config.logger_config import logger
+from utils.db_util import text
+from utils.db_writer import db_writer
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300)
+
+INSERT_METRICS_SQL = (
+    "INSERT INTO pipeline_metrics (file_id, zone, stage, duration_ms, call_count, row_count, error_count, recorded_at) "
+    "VALUES (:file_id, :zone, :stage, :duration_ms, :call_count, :row_count, :error_count, :recorded_at)"
+)
+
+
+class StageTiming:
+    """
+    Counts reported by a timed stage; set `rows` and `errors` inside the `stage` block.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.errors = 0
+
+
+class PipelineMetrics:
+    """
+    Records per-file, per-stage timings, row counts and error counts.
+
+    Stages are attributed to the file tracked on the current thread (see track_file) unless a
+    file ID is passed, as done by write jobs on the database writer thread. A file's stage totals
+    are written to `pipeline_metrics` when its processing step or export ends, and process-wide
+    totals are kept in memory for the Prometheus endpoint.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pending = defaultdict(lambda: [0.0, 0, 0, 0])  # (file_id, zone, stage) -> [seconds, calls, rows, errors]
+        self._histograms = defaultdict(lambda: [0] * (len(DURATION_BUCKETS) + 1))  # (stage, zone) -> bucket counts
+        self._totals = defaultdict(lambda: [0.0, 0, 0, 0])  # (stage, zone) -> [seconds, calls, rows, errors]
+        self._files = defaultdict(int)  # zone -> files processed
+
+    def _current(self):
+        return getattr(self._local, "file", (None, None))
+
+    @contextmanager
+    def track_file(self, file_id, zone):
+        """
+        Attribute the stages run on this thread to a file and zone, then persist them on exit.
+        """
+        previous = self._current()
+        self._local.file = (file_id, zone)
+        try:
+            yield
+        finally:
+            self._local.file = previous
+            with self._lock:
+                self._files[zone] += 1
+            self.flush(file_id)
+
+    @contextmanager
+    def stage(self, stage, file_id=None, zone=None, rows=0, errors=0):
+        """
+        Time a stage. Yields a StageTiming whose `rows` and `errors` can be set inside the block.
+        """
+        timing = StageTiming()
+        timing.rows, timing.errors = rows, errors
+        start = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            current_file_id, current_zone = self._current()
+            self.record(
+                stage, time.perf_counter() - start,
+                file_id if file_id is not None else current_file_id,
+                zone or current_zone, timing.rows, timing.errors
+            )
+
+    def timed(self, stage):
+        """
+        Decorator timing every call of the decorated function as a stage.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, stage, seconds, file_id=None, zone=None, rows=0, errors=0):
+        """
+        Add one call of a stage to the file's pending totals and the process-wide metrics.
+        """
+        zone = zone or "COMMON"
+        bucket = next((i for i, bound in enumerate(DURATION_BUCKETS) if seconds <= bound), len(DURATION_BUCKETS))
+        with self._lock:
+            self._histograms[(stage, zone)][bucket] += 1
+            targets = [self._totals[(stage, zone)]]
+            if file_id is not None:
+                targets.append(self._pending[(file_id, zone, stage)])
+            for values in targets:
+                values[0] += seconds
+                values[1] += 1
+                values[2] += rows or 0
+                values[3] += errors or 0
+
+    def flush(self, file_id):
+        """
+        Queue the pending stage totals of a file for insertion into `pipeline_metrics`.
+        """
+        recorded_at = datetime.now()
+        rows = []
+        with self._lock:
+            for key in [key for key in self._pending if key[0] == file_id]:
+                _, zone, stage = key
+                seconds, calls, row_count, error_count = self._pending.pop(key)
+                rows.append({
+                    "file_id": file_id, "zone": zone, "stage": stage, "duration_ms": seconds * 1000,
+                    "call_count": calls, "row_count": row_count, "error_count": error_count,
+                    "recorded_at": recorded_at,
+                })
+        if rows:
+            db_writer.submit(insert_pipeline_metrics, rows).add_done_callback(_log_flush_error)
+
+    def render_prometheus(self):
+        """
+        Returns the process-wide metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            histograms = {key: list(counts) for key, counts in self._histograms.items()}
+            totals = {key: list(values) for key, values in self._totals.items()}
+            files = dict(self._files)
+
+        lines = [
+            "# HELP mivaa_stage_duration_seconds Duration of pipeline stage calls.",
+            "# TYPE mivaa_stage_duration_seconds histogram",
+        ]
+        for (stage, zone), counts in sorted(histograms.items()):
+            labels = f'stage="{stage}",zone="{zone}"'
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f'mivaa_stage_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"mivaa_stage_duration_seconds_sum{{{labels}}} {totals[(stage, zone)][0]}")
+            lines.append(f"mivaa_stage_duration_seconds_count{{{labels}}} {cumulative}")
+
+        for name, index, description in (
+            ("mivaa_stage_rows_total", 2, "Rows handled by pipeline stages."),
+            ("mivaa_stage_errors_total", 3, "Validation errors reported by pipeline stages."),
+        ):
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} counter"]
+            for (stage, zone), values in sorted(totals.items()):
+                lines.append(f'{name}{{stage="{stage}",zone="{zone}"}} {values[index]}')
+
+        lines += ["# HELP mivaa_files_processed_total Files that went through a processing step.", "# TYPE mivaa_files_processed_total counter"]
+        for zone, count in sorted(files.items()):
+            lines.append(f'mivaa_files_processed_total{{zone="{zone}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def insert_pipeline_metrics(session, rows):
+    """
+    Write job inserting per-file stage totals into `pipeline_metrics`. The caller commits the session.
+    """
+    session.execute(text(INSERT_METRICS_SQL), rows)
+
+
+def _log_flush_error(future):
+    if future.exception() is not None:
+        logger.error(f"Error saving pipeline metrics: {future.exception()}")
+
+
+pipeline_metrics = PipelineMetrics()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = pipeline_metrics.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"Metrics request: {format % args}")
+
+
+def start_metrics_server(port=5000, host="0.0.0.0"):
+    """
+    Serve the pipeline metrics at http://<host>:<port>/metrics from a background thread.
+
+    :return: The running HTTP server, or None if it could not be started.
+    """
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.error(f"Could not start the metrics endpoint on port {port}: {e}")
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info(f"Serving pipeline metrics at http://{host}:{port}/metrics")
+    return server
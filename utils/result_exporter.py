@@ -0,0 +1,116 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+from config.logger_config import logger
+from config.project_config import PROJECT_CONFIG
+
+DEFAULT_EXPORT_FORMAT = "CSV"
+
+
+def _compile_query(session, query):
+    """
+    Render an SQLAlchemy query as a literal SQL string that DuckDB can embed in COPY statements.
+    """
+    statement = query.statement.compile(dialect=session.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    return str(statement)
+
+
+def _quote_path(path):
+    """
+    Quote a filesystem path as a SQL string literal.
+    """
+    return "'" + path.replace("'", "''") + "'"
+
+
+def _duckdb_connection(session):
+    """
+    Return the raw DuckDB connection behind a SQLAlchemy session.
+    """
+    return session.connection().connection.driver_connection
+
+
+def write_csv(session, query, zone, output_dir, base_name):
+    """
+    Write results to CSV through pandas (the historical output format).
+    """
+    result_file = f"{output_dir}/{base_name}.csv"
+    result_df = pd.DataFrame(query.all(), columns=[col["name"] for col in query.column_descriptions])
+    result_df.to_csv(result_file, index=False)
+    return result_file
+
+
+def write_duckdb_csv(session, query, zone, output_dir, base_name):
+    """
+    Write results to CSV with DuckDB's COPY ... TO, without materializing rows in Python.
+    """
+    result_file = f"{output_dir}/{base_name}.csv"
+    _duckdb_connection(session).execute(
+        f"COPY ({_compile_query(session, query)}) TO {_quote_path(result_file)} (FORMAT CSV, HEADER)"
+    )
+    return result_file
+
+
+def write_parquet(session, query, zone, output_dir, base_name):
+    """
+    Write results as a hive-partitioned Parquet dataset (zone=<zone>/file_id=<id>/) with DuckDB's COPY ... TO.
+    """
+    result_dir = f"{output_dir}/parquet"
+    _duckdb_connection(session).execute(
+        f"COPY (SELECT '{zone}' AS zone, results.* FROM ({_compile_query(session, query)}) AS results) "
+        f"TO {_quote_path(result_dir)} (FORMAT PARQUET, PARTITION_BY (zone, file_id), OVERWRITE_OR_IGNORE)"
+    )
+    return result_dir
+
+
+def write_arrow_ipc(session, query, zone, output_dir, base_name):
+    """
+    Stream results as Arrow record batches into an Arrow IPC file.
+    """
+    result_file = f"{output_dir}/{base_name}.arrow"
+    reader = _duckdb_connection(session).execute(_compile_query(session, query)).arrow()
+    # Older DuckDB versions return a Table instead of a RecordBatchReader
+    if isinstance(reader, pa.Table):
+        reader = reader.to_reader()
+
+    with pa.OSFile(result_file, "wb") as sink, pa.ipc.new_file(sink, reader.schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+    return result_file
+
+
+EXPORT_WRITERS = {
+    "CSV": write_csv,
+    "DUCKDB_CSV": write_duckdb_csv,
+    "PARQUET": write_parquet,
+    "ARROW": write_arrow_ipc,
+}
+
+
+def export_results(session, query, zone, file_name, result_suffix, export_format=None):
+    """
+    Export a results query to the output directory in the configured format.
+
+    Parameters:
+    - session: SQLAlchemy session the query is bound to.
+    - query (sqlalchemy.orm.Query): Results query, e.g. from build_bronze_results_query.
+    - zone (str): Zone of the results (BRONZE, SILVER), used for Parquet partitioning.
+    - file_name (str): Name of the input file.
+    - result_suffix (str): Suffix of the output name, e.g. 'validation_results'.
+    - export_format (str, optional): One of EXPORT_WRITERS; defaults to PROJECT_CONFIG["EXPORT_FORMAT"].
+
+    Returns:
+    - str: Path of the written file or dataset directory.
+    """
+    export_format = (export_format or PROJECT_CONFIG.get("EXPORT_FORMAT", DEFAULT_EXPORT_FORMAT)).upper()
+    writer = EXPORT_WRITERS.get(export_format)
+    if writer is None:
+        raise ValueError(f"Unknown export format: {export_format}. Supported formats: {list(EXPORT_WRITERS)}")
+
+    output_dir = PROJECT_CONFIG.get("OUTPUT_DIRECTORY", "output")
+    os.makedirs(output_dir, exist_ok=True)
+
+    result_path = writer(session, query, zone, output_dir, f"{file_name}_{result_suffix}")
+    logger.info(f"Results saved to '{result_path}' as {export_format}.")
+    return result_path
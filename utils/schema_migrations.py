@@ -0,0 +1,121 @@
+import hashlib
+import json
+
+from sqlalchemy import text
+
+from config.logger_config import logger
+
+# Applied schema versions; created before anything else so it can track every other statement
+MIGRATIONS_TABLE_SQL = (
+    "CREATE TABLE IF NOT EXISTS schema_migrations (version INTEGER PRIMARY KEY, table_name TEXT NOT NULL, "
+    "query_type TEXT NOT NULL, statement_hash TEXT NOT NULL, applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+)
+
+STORE_UPSERT_SQL = (
+    "INSERT OR REPLACE INTO sql_script_store (zone, query, query_type, table_name, data_columns) "
+    "VALUES (:zone, :query, :query_type, :table_name, :data_columns)"
+)
+
+RECORD_MIGRATION_SQL = (
+    "INSERT INTO schema_migrations (version, table_name, query_type, statement_hash) "
+    "VALUES (:version, :table_name, :query_type, :statement_hash)"
+)
+
+
+def statement_hash(entry):
+    """
+    Hash the parts of a schema entry that define what it does to the database.
+
+    :param entry: Schema entry from config/schema.json.
+    :return: SHA-256 hex digest.
+    """
+    definition = {key: entry.get(key) for key in ("zone", "query", "query_type", "table_name", "data_columns")}
+    return hashlib.sha256(json.dumps(definition, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def assign_versions(schema_data):
+    """
+    Pair every schema entry with its version, taken from its "version" key or its 1-based position.
+
+    :param schema_data: List of schema entries.
+    :return: List of (version, entry) tuples ordered by version.
+    :raises ValueError: If two entries share a version.
+    """
+    versioned = [(int(entry.get("version", position)), entry) for position, entry in enumerate(schema_data, start=1)]
+    versions = [version for version, _ in versioned]
+    duplicates = sorted({version for version in versions if versions.count(version) > 1})
+    if duplicates:
+        logger.error(f"Duplicate schema versions: {duplicates}")
+        raise ValueError(f"Duplicate schema versions: {duplicates}")
+    return sorted(versioned, key=lambda item: item[0])
+
+
+def get_applied_migrations(session):
+    """
+    Returns the applied schema versions with their statement hashes, creating the tracking table if needed.
+
+    :param session: SQLAlchemy session
+    :return: Dictionary mapping versions to statement hashes.
+    """
+    session.execute(text(MIGRATIONS_TABLE_SQL))
+    rows = session.execute(text("SELECT version, statement_hash FROM schema_migrations")).fetchall()
+    return {row[0]: row[1] for row in rows}
+
+
+def apply_schema_migrations(session, schema_data):
+    """
+    Apply the schema entries that have not been applied yet, in one transaction.
+
+    Each applied entry is recorded in `schema_migrations` with its hash and its definition is
+    stored in `sql_script_store`. Entries that were already applied are skipped; if their statement
+    changed since, a warning is logged, as changes must be added as a new version.
+
+    :param session: SQLAlchemy session
+    :param schema_data: List of schema entries from config/schema.json.
+    :return: List of the versions applied by this call.
+    """
+    versioned = assign_versions(schema_data)
+    applied = get_applied_migrations(session)
+
+    pending = []
+    for version, entry in versioned:
+        if version not in applied:
+            pending.append((version, entry))
+        elif applied[version] != statement_hash(entry):
+            logger.warning(
+                f"Schema version {version} ({entry['table_name']}) changed after it was applied; "
+                f"the change is ignored. Add it as a new version instead."
+            )
+
+    if not pending:
+        session.commit()
+        latest = max(applied) if applied else 0
+        logger.info(f"Database schema is up to date at version {latest}.")
+        return []
+
+    try:
+        for version, entry in pending:
+            logger.info(f"Applying schema version {version}: {entry['query_type']} {entry['table_name']} in zone {entry['zone']}")
+            session.execute(text(entry["query"]))
+            session.execute(text(STORE_UPSERT_SQL), {
+                "zone": entry["zone"],
+                "query": entry["query"],
+                "query_type": entry["query_type"],
+                "table_name": entry["table_name"],
+                "data_columns": entry.get("data_columns"),
+            })
+            session.execute(text(RECORD_MIGRATION_SQL), {
+                "version": version,
+                "table_name": entry["table_name"],
+                "query_type": entry["query_type"],
+                "statement_hash": statement_hash(entry),
+            })
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error applying schema version {version} for table {entry['table_name']}: {e}")
+        raise
+
+    applied_versions = [version for version, _ in pending]
+    logger.info(f"Applied {len(applied_versions)} schema versions, now at version {max(list(applied) + applied_versions)}.")
+    return applied_versions